@@ -0,0 +1,80 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import print_function
+
+from email.message import Message
+
+from opentracing.mocktracer.b3_propagator import B3Propagator, format_b3, \
+    parse_b3
+from opentracing.mocktracer.context import SAMPLED, SpanContext
+
+from .bench_text_extract import HEADERS
+from .utils import best_of, report
+
+TRACE_IDS = [
+    ('64-bit', 0x463ac35c9f6413ad),
+    ('128-bit', 0x80f198ee56343ba864fe8b2a57d3eff7),
+]
+SPAN_ID = 0xe457b5a2e4d86bd1
+
+
+def carriers(trace_id, single_header):
+    context = SpanContext(trace_id=trace_id, span_id=SPAN_ID)
+    b3 = {}
+    B3Propagator(single_header=single_header).inject(context, b3)
+    headers = HEADERS[:20] + sorted(b3.items()) + HEADERS[20:]
+    message = Message()
+    for key, value in headers:
+        message[key] = value
+    return [('dict', dict(headers)), ('HTTPMessage', message)]
+
+
+def bench_header(label, trace_id):
+    header = format_b3(trace_id, SPAN_ID, SAMPLED)
+    assert parse_b3(header) == (trace_id, SPAN_ID, SAMPLED)
+    report('format_b3, ' + label,
+           best_of(lambda: format_b3(trace_id, SPAN_ID, SAMPLED), 20000))
+    report('parse_b3, ' + label,
+           best_of(lambda: parse_b3(header), 20000))
+
+
+def bench_propagator(label, trace_id, single_header):
+    propagator = B3Propagator(single_header=single_header)
+    context = SpanContext(trace_id=trace_id, span_id=SPAN_ID)
+    label = '%s, %s' % ('b3' if single_header else 'X-B3-*', label)
+    report('inject, ' + label,
+           best_of(lambda: propagator.inject(context, {}), 20000))
+    for name, carrier in carriers(trace_id, single_header):
+        assert propagator.extract(carrier).trace_id == trace_id
+        report('extract, %s, %d headers, %s' % (label, len(carrier), name),
+               best_of(lambda: propagator.extract(carrier), 2000))
+
+
+def main():
+    for label, trace_id in TRACE_IDS:
+        bench_header(label, trace_id)
+    for label, trace_id in TRACE_IDS:
+        for single_header in (True, False):
+            bench_propagator(label, trace_id, single_header)
+
+
+if __name__ == '__main__':
+    main()
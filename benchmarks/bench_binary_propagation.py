@@ -0,0 +1,63 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from __future__ import print_function
+
+from opentracing.mocktracer.binary_propagator import BinaryPropagator, \
+    PickleBinaryPropagator
+from opentracing.mocktracer.context import SpanContext
+
+from .utils import best_of, report
+
+CONTEXTS = [
+    ('no baggage', SpanContext(trace_id=(1 << 127) | 1, span_id=2)),
+    ('3 baggage items', SpanContext(
+        trace_id=(1 << 127) | 1, span_id=2,
+        baggage={'user-id': '12345', 'tenant': 'acme',
+                 'request-id': 'c0ffee-c0ffee-c0ffee'})),
+]
+
+
+def main():
+    for name, context in CONTEXTS:
+        for propagator in (PickleBinaryPropagator(), BinaryPropagator()):
+            label = '%s, %s' % (type(propagator).__name__, name)
+            carrier = bytearray()
+            propagator.inject(context, carrier)
+            print('%-48s %10d bytes' % (label, len(carrier)))
+
+            report(label + ', inject',
+                   best_of(lambda: propagator.inject(context, bytearray()),
+                           10000))
+            report(label + ', extract',
+                   best_of(lambda: propagator.extract(carrier), 10000))
+
+        # In place, inside a larger receive buffer.
+        propagator = BinaryPropagator()
+        frame = bytearray(16)
+        propagator.inject(context, frame)
+        view = memoryview(bytes(frame + bytearray(256)))
+        report('BinaryPropagator, %s, extract_from' % name,
+               best_of(lambda: propagator.extract_from(view, 16), 10000))
+
+
+if __name__ == '__main__':
+    main()
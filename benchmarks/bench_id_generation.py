@@ -0,0 +1,64 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from __future__ import print_function
+
+from threading import Lock
+
+from opentracing.mocktracer.id_generator import BlockIdGenerator, \
+        IdGenerator, SequentialIdGenerator
+
+from .utils import report, run_threads
+
+THREADS = (1, 8, 32)
+IDS_PER_THREAD = 20000
+
+
+class LockIdGenerator(IdGenerator):
+    """The previous MockTracer id generation: a counter behind a Lock."""
+
+    def __init__(self):
+        self._next_id = 0
+        self._lock = Lock()
+
+    def generate_span_id(self):
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+
+def main():
+    generators = [
+        ('lock', LockIdGenerator),
+        ('itertools.count', SequentialIdGenerator),
+        ('per-thread blocks', BlockIdGenerator),
+    ]
+    for threads in THREADS:
+        for name, generator_class in generators:
+            generator = generator_class()
+            elapsed = run_threads(generator.generate_span_id,
+                                  threads, IDS_PER_THREAD)
+            report('%s, %d threads (per id)' % (name, threads),
+                   elapsed / (threads * IDS_PER_THREAD), 'ns')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from __future__ import print_function
+
+import threading
+
+from opentracing.mocktracer import MockTracer
+from opentracing.mocktracer.span import LOCKING_ALWAYS, LOCKING_NONE, \
+    LOCKING_OWNER
+
+from .utils import best_of, report
+
+TAGS = 50
+SPANS = 200
+
+
+def tag_heavy_spans(tracer):
+    """Starts, tags and finishes SPANS spans with TAGS tags each."""
+    def func():
+        for _ in range(SPANS):
+            span = tracer.start_span('operation')
+            for i in range(TAGS):
+                span.set_tag('tag', i)
+            span.finish()
+        tracer.reset()
+    return func
+
+
+def shared_span(tracer):
+    """Tags a span owned by another thread, which forces it to lock."""
+    holder = []
+    thread = threading.Thread(
+        target=lambda: holder.append(tracer.start_span('operation')))
+    thread.start()
+    thread.join()
+    span = holder[0]
+
+    def func():
+        for i in range(TAGS):
+            span.set_tag('tag', i)
+    return func
+
+
+def main():
+    for locking in (LOCKING_ALWAYS, LOCKING_NONE, LOCKING_OWNER):
+        tracer = MockTracer(span_locking=locking)
+        report('%d tags per span, %s' % (TAGS, locking),
+               best_of(tag_heavy_spans(tracer), 10) / (SPANS * TAGS), 'ns')
+
+    for locking in (LOCKING_ALWAYS, LOCKING_OWNER):
+        tracer = MockTracer(span_locking=locking)
+        report('%d tags, non-owner thread, %s' % (TAGS, locking),
+               best_of(shared_span(tracer), 1000) / TAGS, 'ns')
+
+
+if __name__ == '__main__':
+    main()
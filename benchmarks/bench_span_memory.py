@@ -0,0 +1,141 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from __future__ import print_function
+
+from threading import Lock
+import time
+
+from opentracing import Span
+from opentracing.mocktracer import MockTracer
+from opentracing.mocktracer.context import SpanContext
+from opentracing.mocktracer.span import LOCKING_NONE, MockSpan
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+SPANS = 20000
+LOGS = 20
+
+
+class LegacySpanContext(object):
+    """The previous SpanContext layout, with a per-instance __dict__."""
+
+    def __init__(self, trace_id=None, span_id=None, baggage=None):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self._baggage = baggage or {}
+
+
+class LegacyLogData(object):
+    def __init__(self, key_values, timestamp=None):
+        self.key_values = key_values
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+
+class LegacyMockSpan(Span):
+    """The previous MockSpan layout: a Lock, a tags dict and a logs list
+    allocated up front."""
+
+    def __init__(self, tracer, operation_name=None, context=None,
+                 parent_id=None, tags=None, start_time=None):
+        super(LegacyMockSpan, self).__init__(tracer, context)
+        self._tracer = tracer
+        self._lock = Lock()
+        self.operation_name = operation_name
+        self.start_time = start_time
+        self.parent_id = parent_id
+        self.tags = tags if tags is not None else {}
+        self.finish_time = -1
+        self.finished = False
+        self.logs = []
+
+    def log_kv(self, key_values, timestamp=None):
+        with self._lock:
+            self.logs.append(LegacyLogData(key_values, timestamp))
+        return self
+
+
+def bytes_per_span(span_class, context_class, logs=0, **kwargs):
+    tracer = MockTracer()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    spans = []
+    for i in range(SPANS):
+        span = span_class(tracer, 'operation',
+                          context=context_class(trace_id=i, span_id=i),
+                          start_time=0.0, **kwargs)
+        for _ in range(logs):
+            span.log_kv({'event': 'x'}, 0.0)
+        spans.append(span)
+
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / float(SPANS)
+
+
+def bytes_per_finished_span(query=False):
+    """Bytes per single-span trace finished by a default MockTracer, with
+    or without the query index and trace trees."""
+    tracer = MockTracer()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    for _ in range(SPANS):
+        tracer.start_span('operation').finish()
+    if query:
+        tracer.traces()
+
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / float(SPANS)
+
+
+def main():
+    if tracemalloc is None:
+        print('tracemalloc is not available, skipping')
+        return
+
+    for logs in (0, 1, LOGS):
+        suffix = ', logs: %d' % logs if logs else ''
+        print('%-48s %10.0f bytes' % (
+            'before (eager lock, tags and logs)' + suffix,
+            bytes_per_span(LegacyMockSpan, LegacySpanContext, logs)))
+        print('%-48s %10.0f bytes' % (
+            'after (lazy tags and logs, slotted)' + suffix,
+            bytes_per_span(MockSpan, SpanContext, logs)))
+        print('%-48s %10.0f bytes' % (
+            'after, LOCKING_NONE' + suffix,
+            bytes_per_span(MockSpan, SpanContext, logs,
+                           locking=LOCKING_NONE)))
+
+    print('%-48s %10.0f bytes' % (
+        'finished by MockTracer', bytes_per_finished_span()))
+    print('%-48s %10.0f bytes' % (
+        'finished by MockTracer, indexed by traces()',
+        bytes_per_finished_span(query=True)))
+
+
+if __name__ == '__main__':
+    main()
@@ -28,6 +28,7 @@ from .propagation import Format  # noqa
 from .propagation import InvalidCarrierException  # noqa
 from .propagation import SpanContextCorruptedException  # noqa
 from .propagation import UnsupportedFormatException  # noqa
+from .lazy import LazyValue  # noqa
 
 # Global variable that should be initialized to an instance of real tracer.
 # Note: it should be accessed via 'opentracing.tracer', not via
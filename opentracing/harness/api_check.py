@@ -23,7 +23,7 @@ import time
 import pytest
 
 import opentracing
-from opentracing import Format
+from opentracing import Format, LazyValue
 
 
 class APICompatibilityCheckMixin(object):
@@ -221,6 +221,16 @@ class APICompatibilityCheckMixin(object):
             set_tag(u'unicode_key_\u200b', 'ascii val')
         span.finish()
 
+    def test_span_set_tags(self):
+        span = self.tracer().start_span(operation_name='Bender')
+        span_ref = span.set_tags({
+            'an_int': 9,
+            'a_bool': True,
+            'a_string': 'aoeuidhtns'})
+        assert span_ref is span
+        span.set_tags({}).set_tag('loves', 'bending')
+        span.finish()
+
     def test_span_logs(self):
         span = self.tracer().start_span(operation_name='Fry')
 
@@ -246,6 +256,21 @@ class APICompatibilityCheckMixin(object):
                 event='unfrozen',
                 payload={'year': 2999})
 
+    def test_span_lazy_values(self):
+        span = self.tracer().start_span(operation_name='Zoidberg')
+        span.set_tag('lazy', LazyValue(str, 42))
+        span.log_kv({'lazy': LazyValue(repr, [1, 2])})
+        span.finish()
+
+    def test_span_log_kv_many(self):
+        span = self.tracer().start_span(operation_name='Leela')
+        span_ref = span.log_kv_many([
+            ({'frozen.year': 1999}, None),
+            ({'defrosted.year': 2999}, time.time())])
+        assert span_ref is span
+        span.log_kv_many([]).log_kv({'event': 'rescued'})
+        span.finish()
+
     def test_span_baggage(self):
         with self.tracer().start_span(operation_name='Fry') as span:
             assert span.context.baggage == {}
@@ -0,0 +1,92 @@
+# Copyright The OpenTracing Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import absolute_import
+
+from . import logs, tags
+
+try:
+    _string_types = (str, unicode)  # Python 2
+except NameError:
+    _string_types = (str,)
+
+
+def _well_known_strings():
+    """The tag and log keys and values defined by the OpenTracing
+    semantic conventions."""
+    for module in (tags, logs):
+        for name in dir(module):
+            value = getattr(module, name)
+            if name.isupper() and isinstance(value, _string_types):
+                yield value
+
+
+class Interner(object):
+    """Interner canonicalizes strings such as operation names and tag keys
+    to shared objects, so that **Spans** holding equal strings do not each
+    hold a copy. A helper for **Tracer** implementations.
+
+    The table is bounded: once it holds `max_size` strings, new strings are
+    returned as they are and counted in :attr:`rejected`, so that
+    high-cardinality names cannot grow it without limit. The bound is
+    approximate when several threads intern new strings at once.
+
+    :param max_size: the maximum number of strings in the table.
+    :param well_known: if True (the default), the table starts with the
+        keys and values from :mod:`opentracing.tags` and
+        :mod:`opentracing.logs`, which count towards `max_size`.
+
+    :ivar rejected: the number of strings not interned because the table
+        was full.
+    """
+
+    def __init__(self, max_size=4096, well_known=True):
+        if max_size < 0:
+            raise ValueError('max_size must not be negative')
+        self.max_size = max_size
+        self.rejected = 0
+        self._well_known = well_known
+        self._table = {}
+        self.clear()
+
+    def intern(self, value):
+        """Return the shared string equal to `value`, adding `value` to the
+        table if there is room. Values other than strings are returned
+        unchanged."""
+        if not isinstance(value, _string_types):
+            return value
+        canonical = self._table.get(value)
+        if canonical is not None:
+            return canonical
+        if len(self._table) >= self.max_size:
+            self.rejected += 1
+            return value
+        return self._table.setdefault(value, value)
+
+    def clear(self):
+        """Empty the table, keeping only the well-known strings."""
+        table = {}
+        if self._well_known:
+            for value in _well_known_strings():
+                if len(table) < self.max_size:
+                    table[value] = value
+        self._table = table
+        self.rejected = 0
+
+    def __len__(self):
+        return len(self._table)
+
+    def __contains__(self, value):
+        return value in self._table
@@ -0,0 +1,72 @@
+# Copyright The OpenTracing Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import absolute_import
+
+
+class LazyValue(object):
+    """A tag or log value computed only when a :class:`~opentracing.Span`
+    is actually recorded.
+
+    Pass it wherever a value is accepted by :meth:`Span.set_tag()
+    <opentracing.Span.set_tag>` or :meth:`Span.log_kv()
+    <opentracing.Span.log_kv>`, so that expensive values cost nothing with
+    the no-op :class:`~opentracing.Tracer` or when a **Span** is dropped::
+
+        span.set_tag(tags.DATABASE_STATEMENT,
+                     LazyValue(format_statement, query, params))
+
+    Plain callables are not treated as lazy values, since callables (such
+    as exception classes under :attr:`~opentracing.logs.ERROR_KIND`) are
+    valid values themselves.
+
+    :param func: the callable computing the value.
+    :param args: positional arguments for `func`.
+    :param kwargs: keyword arguments for `func`.
+    """
+
+    __slots__ = ('_func', '_args', '_kwargs', '_value')
+
+    def __init__(self, func, *args, **kwargs):
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+
+    def resolve(self):
+        """Compute the value on the first call and return it. Later calls
+        return the same value without calling `func` again.
+
+        :return: the value returned by `func`.
+        """
+        if self._func is not None:
+            self._value = self._func(*self._args, **self._kwargs)
+            self._func = self._args = self._kwargs = None
+        return self._value
+
+    def __repr__(self):
+        if self._func is None:
+            return 'LazyValue(%r)' % (self._value,)
+        return 'LazyValue(%r)' % (self._func,)
+
+
+def resolve_value(value):
+    """Return `value`, resolved if it is a :class:`LazyValue`.
+
+    A helper for **Tracer** implementations, to be applied to tag and log
+    values when a **Span** is recorded.
+    """
+    if isinstance(value, LazyValue):
+        return value.resolve()
+    return value
@@ -21,4 +21,17 @@
 from __future__ import absolute_import
 
 from .tracer import MockTracer  # noqa
+from .baggage import Baggage, BaggageLimits  # noqa
+from .id_generator import IdGenerator, SequentialIdGenerator, \
+        BlockIdGenerator, RandomIdGenerator  # noqa
 from .propagator import Propagator  # noqa
+from .span_logs import LogLimits  # noqa
+from .stack_capture import StackCapture  # noqa
+from .span_processor import SpanProcessor, CallbackSpanProcessor, \
+        BackgroundSpanProcessor  # noqa
+from .trace import MockTrace  # noqa
+from .span_store import SpanStore, RingBufferSpanStore  # noqa
+from .columnar_store import ColumnarSpanStore  # noqa
+from .record import SpanRecord  # noqa
+from .exporter import FileSpanExporter, read_spans  # noqa
+from .mapped_reader import MappedSpanFile  # noqa
@@ -0,0 +1,176 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+from opentracing import SpanContextCorruptedException
+
+from .context import DEBUG, SAMPLED, SpanContext
+from .propagator import FieldLookup, Propagator
+
+field_name_b3 = 'b3'
+field_name_trace_id = 'x-b3-traceid'
+field_name_span_id = 'x-b3-spanid'
+field_name_sampled = 'x-b3-sampled'
+field_name_flags = 'x-b3-flags'
+
+# The names written by inject(), as documented by openzipkin/b3-propagation.
+header_trace_id = 'X-B3-TraceId'
+header_span_id = 'X-B3-SpanId'
+header_sampled = 'X-B3-Sampled'
+header_flags = 'X-B3-Flags'
+
+_HEX = frozenset('0123456789abcdefABCDEF')
+# Also covers the '0', '1' and 'd' sampling states.
+_HEX_OR_DASH = _HEX | frozenset('-')
+_TRACE_ID_LENGTHS = (16, 32)
+_SPAN_ID_LENGTH = 16
+_MAX_UINT64 = (1 << 64) - 1
+
+# Sampling states of the single header and of X-B3-Sampled, as flags.
+_B3_STATES = {'0': 0, '1': SAMPLED, 'd': SAMPLED | DEBUG}
+# 'true' and 'false' are still sent by older implementations.
+_SAMPLED_VALUES = {'0': 0, '1': SAMPLED, 'false': 0, 'true': SAMPLED}
+
+
+def parse_id(value, lengths):
+    """Parse a hex B3 id of one of the given `lengths`.
+
+    :return: the id, or ``None`` if it is malformed or zero.
+    """
+    if len(value) not in lengths or not _HEX.issuperset(value):
+        return None
+    return int(value, 16) or None
+
+
+def format_trace_id(trace_id):
+    """Format a B3 trace id: 16 hex digits for 64-bit ids, 32 otherwise."""
+    if trace_id > _MAX_UINT64:
+        return '%032x' % trace_id
+    return '%016x' % trace_id
+
+
+def parse_b3(header):
+    """Parse a single `b3` header,
+    ``{TraceId}-{SpanId}[-{SamplingState}[-{ParentSpanId}]]``.
+
+    :return: a ``(trace_id, span_id, flags)`` tuple, or ``None`` if the
+        header is invalid or carries a sampling state only.
+    """
+    # Validate the characters once, rather than field by field.
+    header = header.strip()
+    if not _HEX_OR_DASH.issuperset(header):
+        return None
+    parts = header.split('-')
+    count = len(parts)
+    if not 2 <= count <= 4 or len(parts[0]) not in _TRACE_ID_LENGTHS or \
+            len(parts[1]) != _SPAN_ID_LENGTH:
+        return None
+    if count == 4 and len(parts[3]) != _SPAN_ID_LENGTH:
+        return None
+
+    flags = _B3_STATES.get(parts[2]) if count > 2 else SAMPLED
+    trace_id = int(parts[0], 16)
+    span_id = int(parts[1], 16)
+    if flags is None or not trace_id or not span_id:
+        return None
+    return trace_id, span_id, flags
+
+
+def format_b3(trace_id, span_id, flags):
+    """Format a single `b3` header, without the parent span id."""
+    if flags & DEBUG:
+        state = 'd'
+    else:
+        state = '1' if flags & SAMPLED else '0'
+    return '%s-%016x-%s' % (format_trace_id(trace_id), span_id, state)
+
+
+class B3Propagator(Propagator):
+    """A MockTracer Propagator for the Zipkin B3 headers, for
+    Format.HTTP_HEADERS or Format.TEXT_MAP.
+
+    extract() accepts either the single `b3` header, which takes
+    precedence, or the `X-B3-*` headers, with 64- or 128-bit trace ids.
+    The sampling and debug states are carried in
+    :attr:`~opentracing.mocktracer.context.SpanContext.flags`; a missing
+    sampling state means sampled, as MockTracer records every **Span**.
+    The parent span id is validated but not kept, and baggage is not
+    propagated.
+
+    inject() writes the `X-B3-*` headers, or the `b3` header if
+    `single_header` is set. Headers are matched case-insensitively, see
+    :class:`~opentracing.mocktracer.propagator.FieldLookup` for
+    `case_insensitive_types`.
+    """
+
+    def __init__(self, single_header=False, case_insensitive_types=()):
+        self.single_header = single_header
+        self._lookup = FieldLookup(
+            (field_name_b3, field_name_trace_id, field_name_span_id,
+             field_name_sampled, field_name_flags),
+            case_insensitive_types)
+
+    def inject(self, span_context, carrier):
+        trace_id = span_context.trace_id
+        span_id = span_context.span_id
+        flags = span_context.flags
+        if self.single_header:
+            carrier[field_name_b3] = format_b3(trace_id, span_id, flags)
+            return
+
+        carrier[header_trace_id] = format_trace_id(trace_id)
+        carrier[header_span_id] = '%016x' % span_id
+        # Debug implies sampled, so X-B3-Sampled is left out.
+        if flags & DEBUG:
+            carrier[header_flags] = '1'
+        else:
+            carrier[header_sampled] = '1' if flags & SAMPLED else '0'
+
+    def extract(self, carrier):
+        fields = self._lookup.lookup(carrier)
+        b3 = fields.get(field_name_b3)
+        parsed = parse_b3(b3) if b3 is not None \
+            else self._parse_multi(fields)
+        if parsed is None:
+            raise SpanContextCorruptedException()
+
+        trace_id, span_id, flags = parsed
+        context = SpanContext(trace_id=trace_id, span_id=span_id)
+        context.flags = flags
+        return context
+
+    @staticmethod
+    def _parse_multi(fields):
+        trace_id = parse_id(fields.get(field_name_trace_id, ''),
+                            _TRACE_ID_LENGTHS)
+        span_id = parse_id(fields.get(field_name_span_id, ''),
+                           (_SPAN_ID_LENGTH,))
+        if trace_id is None or span_id is None:
+            return None
+
+        if fields.get(field_name_flags) == '1':
+            return trace_id, span_id, SAMPLED | DEBUG
+        sampled = fields.get(field_name_sampled)
+        flags = _SAMPLED_VALUES.get(sampled.lower()) \
+            if sampled is not None else SAMPLED
+        if flags is None:
+            return None
+        return trace_id, span_id, flags
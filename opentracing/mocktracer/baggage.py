@@ -0,0 +1,259 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from __future__ import absolute_import
+
+from threading import Lock
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+_text_type = type(u'')
+_MISSING = object()
+
+
+def _byte_len(value):
+    """The UTF-8 encoded length of a baggage key or value."""
+    if isinstance(value, bytes):
+        return len(value)
+    if not isinstance(value, _text_type):
+        value = str(value)
+        if isinstance(value, bytes):  # Python 2
+            return len(value)
+    return len(value.encode('utf-8'))
+
+
+class Baggage(Mapping):
+    """Baggage is an immutable mapping of baggage items.
+
+    :meth:`set()` returns a new **Baggage** that overlays one item on top of
+    the current one instead of copying it, so child **SpanContexts** share
+    their parent's **Baggage** at no cost and adding an item is O(1).
+    Overlay chains are flattened into a single dict once they grow deeper
+    than :attr:`MAX_DEPTH`, which bounds lookups to ``MAX_DEPTH`` steps.
+
+    The number of items and their total UTF-8 size are tracked as items
+    are set, see :attr:`byte_size`.
+    """
+
+    __slots__ = ('_parent', '_key', '_value', '_depth', '_size', '_bytes',
+                 '_items')
+
+    MAX_DEPTH = 8
+
+    def __init__(self, items=None):
+        self._parent = None
+        self._key = None
+        self._value = None
+        self._depth = 0
+        self._items = {} if items is None else dict(items)
+        self._size = len(self._items)
+        # Computed on first use: most baggage never has its size checked.
+        self._bytes = None
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        """Return `mapping` if it is already a **Baggage**, or an immutable
+        copy of it otherwise. ``None`` is treated as empty."""
+        if isinstance(mapping, Baggage):
+            return mapping
+        if not mapping:
+            return EMPTY_BAGGAGE
+        return cls(mapping)
+
+    @classmethod
+    def from_dict(cls, items):
+        """Return a **Baggage** taking ownership of the dict `items`, which
+        is not copied: the caller must not modify it afterwards."""
+        if not items:
+            return EMPTY_BAGGAGE
+        baggage = cls.__new__(cls)
+        baggage._parent = baggage._key = baggage._value = None
+        baggage._bytes = None
+        baggage._depth = 0
+        baggage._items = items
+        baggage._size = len(items)
+        return baggage
+
+    def set(self, key, value):
+        """Return a new **Baggage** with `key` set to `value`."""
+        if self._depth >= self.MAX_DEPTH:
+            items = self._materialize()
+            items = dict(items)
+            items[key] = value
+            return Baggage(items)
+
+        child = Baggage.__new__(Baggage)
+        child._parent = self
+        child._key = key
+        child._value = value
+        child._depth = self._depth + 1
+        child._items = None
+
+        old_value = self.get(key, _MISSING)
+        child._size = self._size if old_value is not _MISSING \
+            else self._size + 1
+        child._bytes = None
+        if self._bytes is not None:
+            child._bytes = self._bytes + _byte_len(key) + _byte_len(value)
+            if old_value is not _MISSING:
+                child._bytes -= _byte_len(key) + _byte_len(old_value)
+        return child
+
+    def _materialize(self):
+        if self._items is None:
+            overlays = []
+            node = self
+            while node._items is None:
+                overlays.append(node)
+                node = node._parent
+
+            items = dict(node._items)
+            for overlay in reversed(overlays):
+                items[overlay._key] = overlay._value
+            # Caching is idempotent, so concurrent readers may race here.
+            self._items = items
+        return self._items
+
+    def __getitem__(self, key):
+        node = self
+        while node._items is None:
+            if node._key == key:
+                return node._value
+            node = node._parent
+        return node._items[key]
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def byte_size(self):
+        """The total UTF-8 size of the keys and values, in bytes."""
+        if self._bytes is None:
+            self._bytes = sum(_byte_len(k) + _byte_len(v)
+                              for k, v in self._materialize().items())
+        return self._bytes
+
+    def copy(self):
+        """**Baggage** is immutable, so the copy is the **Baggage**
+        itself."""
+        return self
+
+    def __reduce__(self):
+        return (Baggage, (dict(self._materialize()),))
+
+    def __repr__(self):
+        return 'Baggage(%r)' % (self._materialize(),)
+
+
+EMPTY_BAGGAGE = Baggage()
+
+DROP_MAX_ITEMS = 'max_items'
+DROP_MAX_KEY_BYTES = 'max_key_bytes'
+DROP_MAX_VALUE_BYTES = 'max_value_bytes'
+DROP_MAX_TOTAL_BYTES = 'max_total_bytes'
+
+
+class BaggageLimits(object):
+    """BaggageLimits bounds the baggage of a
+    :class:`~opentracing.mocktracer.MockTracer` and its propagators.
+
+    Limits are enforced once, when an item is set on a **Span** or
+    extracted from a carrier: an item exceeding a limit is dropped and
+    counted in :attr:`dropped_items` under the ``DROP_*`` reason for the
+    first limit it exceeds. Sizes are UTF-8 byte lengths; the total size
+    is the sum of every key and value, tracked by
+    :attr:`Baggage.byte_size`. ``None`` disables a limit.
+
+    :param max_items: the maximum number of items.
+    :param max_key_bytes: the maximum size of a key.
+    :param max_value_bytes: the maximum size of a value.
+    :param max_total_bytes: the maximum total size of the baggage.
+    """
+
+    def __init__(self, max_items=None, max_key_bytes=None,
+                 max_value_bytes=None, max_total_bytes=None):
+        self.max_items = max_items
+        self.max_key_bytes = max_key_bytes
+        self.max_value_bytes = max_value_bytes
+        self.max_total_bytes = max_total_bytes
+        self.dropped_items = {
+            DROP_MAX_ITEMS: 0,
+            DROP_MAX_KEY_BYTES: 0,
+            DROP_MAX_VALUE_BYTES: 0,
+            DROP_MAX_TOTAL_BYTES: 0,
+        }
+        self._lock = Lock()
+
+    def _exceeded_limit(self, baggage, key, value):
+        key_bytes = _byte_len(key)
+        if self.max_key_bytes is not None and key_bytes > self.max_key_bytes:
+            return DROP_MAX_KEY_BYTES
+
+        value_bytes = _byte_len(value)
+        if self.max_value_bytes is not None and \
+                value_bytes > self.max_value_bytes:
+            return DROP_MAX_VALUE_BYTES
+
+        old_value = baggage.get(key, _MISSING)
+        if old_value is _MISSING:
+            if self.max_items is not None and len(baggage) >= self.max_items:
+                return DROP_MAX_ITEMS
+            old_bytes = 0
+        else:
+            old_bytes = key_bytes + _byte_len(old_value)
+
+        if self.max_total_bytes is not None and \
+                baggage.byte_size - old_bytes + key_bytes + value_bytes > \
+                self.max_total_bytes:
+            return DROP_MAX_TOTAL_BYTES
+        return None
+
+    def set_item(self, baggage, key, value):
+        """Return `baggage` with `key` set to `value`, or `baggage` itself
+        if the item exceeds a limit.
+
+        :param baggage: a :class:`Baggage`.
+        :rtype: Baggage
+        """
+        reason = self._exceeded_limit(baggage, key, value)
+        if reason is None:
+            return baggage.set(key, value)
+
+        with self._lock:
+            self.dropped_items[reason] += 1
+        return baggage
+
+    def limit(self, mapping):
+        """Return a :class:`Baggage` with the items of `mapping` that fit
+        within the limits, in iteration order.
+
+        :rtype: Baggage
+        """
+        baggage = EMPTY_BAGGAGE
+        for key, value in mapping.items():
+            baggage = self.set_item(baggage, key, value)
+        return baggage
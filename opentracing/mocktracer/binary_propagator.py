@@ -20,15 +20,210 @@
 
 from __future__ import absolute_import
 
+import codecs
 import pickle
+import struct
 
+from .baggage import Baggage
+from .context import SAMPLED, SpanContext
 from .propagator import Propagator
 
 from opentracing import InvalidCarrierException, SpanContextCorruptedException
 
+VERSION = 1
+FLAG_SAMPLED = SAMPLED
+_FLAGS = 0xFF
+
+# version, flags, trace id (high, low 64 bits), span id, baggage item count
+_HEADER = struct.Struct('<BBQQQH')
+# key length, value length
+_ITEM = struct.Struct('<HI')
+_MASK64 = (1 << 64) - 1
+# The largest values of the count and length fields.
+_MAX_ITEMS = 0xFFFF
+_MAX_KEY_BYTES = 0xFFFF
+_MAX_VALUE_BYTES = 0xFFFFFFFF
+_utf_8_decode = codecs.utf_8_decode
+
+try:
+    _text_type = unicode  # Python 2
+except NameError:
+    _text_type = str
+
+
+def _encode_text(value):
+    if not isinstance(value, (bytes, _text_type)):
+        # Baggage is meant to be text, but the pickle format took any value.
+        value = str(value)
+    return value if isinstance(value, bytes) else value.encode('utf-8')
+
+
+def _decode_view(data, encoding):
+    # Like bytes.decode(), for memoryview slices. final=True: a truncated
+    # multibyte sequence is an error, not dropped.
+    return _utf_8_decode(data, 'strict', True)[0]
+
+
+def _byte_view(buffer, writable=False):
+    # A flat memoryview of bytes over `buffer`. Python 2 memoryviews have no
+    # `contiguous` attribute, but cannot be strided either.
+    try:
+        view = memoryview(buffer)
+    except TypeError:
+        raise InvalidCarrierException()
+    if view.itemsize != 1 or not getattr(view, 'contiguous', True) or \
+            (writable and view.readonly):
+        raise InvalidCarrierException()
+    return view
+
 
 class BinaryPropagator(Propagator):
-    """A MockTracer Propagator for Format.BINARY."""
+    """A MockTracer Propagator for Format.BINARY.
+
+    Span contexts are encoded in a versioned, fixed-layout format: a
+    version byte, the trace flags byte (see
+    :attr:`~opentracing.mocktracer.context.SpanContext.flags`), the 128-bit
+    trace id and 64-bit span id, then the number of baggage items and each
+    item as a length-prefixed UTF-8 key and value, all little-endian.
+    Baggage values that are not text are encoded as their `str()`, and
+    baggage that does not fit the length fields raises :exc:`ValueError`.
+
+    :meth:`inject()` appends to a `bytearray` carrier. :meth:`extract()`
+    reads any object supporting the buffer protocol, such as `bytes`,
+    `bytearray` or `memoryview`, without copying it.
+    :meth:`inject_into()` and :meth:`extract_from()` write and read a
+    context in place, at an offset in a larger buffer, and return the
+    number of bytes written or read.
+
+    Extracted baggage is bounded by `baggage_limits`, a
+    :class:`~opentracing.mocktracer.baggage.BaggageLimits`, if given.
+    """
+
+    def __init__(self, baggage_limits=None):
+        self._baggage_limits = baggage_limits
+
+    def inject(self, span_context, carrier):
+        if type(carrier) is not bytearray:
+            raise InvalidCarrierException()
+
+        carrier.extend(self._encode(span_context))
+
+    def inject_into(self, span_context, buffer, offset=0):
+        """Write `span_context` into the writable `buffer`, starting at
+        `offset`.
+
+        :return: the number of bytes written.
+        :raises ValueError: if `buffer` is too small.
+        """
+        view = _byte_view(buffer, writable=True)
+        if offset < 0:
+            raise ValueError('offset must not be negative')
+
+        data = self._encode(span_context)
+        end = offset + len(data)
+        if end > len(view):
+            raise ValueError('The buffer is too small for the span context')
+        view[offset:end] = data
+        return len(data)
+
+    def extract(self, carrier):
+        return self.extract_from(carrier)[0]
+
+    def extract_from(self, buffer, offset=0):
+        """Read a span context from `buffer`, starting at `offset`.
+
+        `buffer` may be any object supporting the buffer protocol. It is not
+        copied, and the bytes following the span context are ignored.
+
+        :return: a ``(span_context, bytes_read)`` tuple.
+        """
+        view = _byte_view(buffer)
+        if offset < 0:
+            raise ValueError('offset must not be negative')
+
+        try:
+            # Slices of bytes and bytearray decode faster than memoryview
+            # slices, so those are read directly.
+            span_context, end = self._decode(
+                buffer if type(buffer) in (bytes, bytearray) else view,
+                offset)
+        except (struct.error, UnicodeDecodeError):
+            raise SpanContextCorruptedException()
+
+        if self._baggage_limits is not None:
+            span_context = span_context.with_baggage(
+                self._baggage_limits.limit(span_context.baggage))
+        return span_context, end - offset
+
+    def _encode(self, span_context):
+        trace_id = span_context.trace_id or 0
+        baggage = span_context.baggage
+        if len(baggage) > _MAX_ITEMS:
+            raise ValueError('Too many baggage items to encode: %d' %
+                             (len(baggage),))
+        parts = [_HEADER.pack(VERSION,
+                              span_context.flags & _FLAGS,
+                              trace_id >> 64,
+                              trace_id & _MASK64,
+                              span_context.span_id or 0,
+                              len(baggage))]
+        for key, value in baggage.items():
+            try:
+                key = key.encode('utf-8')
+                value = value.encode('utf-8')
+            except (AttributeError, UnicodeError):
+                key = _encode_text(key)
+                value = _encode_text(value)
+            if len(key) > _MAX_KEY_BYTES or len(value) > _MAX_VALUE_BYTES:
+                raise ValueError('Baggage item too large to encode: %r' %
+                                 (key[:64],))
+            parts.append(_ITEM.pack(len(key), len(value)))
+            parts.append(key)
+            parts.append(value)
+        return b''.join(parts)
+
+    def _decode(self, buffer, offset):
+        (version, flags, trace_id_high, trace_id_low, span_id,
+         count) = _HEADER.unpack_from(buffer, offset)
+        if version != VERSION:
+            raise SpanContextCorruptedException()
+
+        offset += _HEADER.size
+        length = len(buffer)
+        unpack_item = _ITEM.unpack_from
+        decode = _decode_view if isinstance(buffer, memoryview) \
+            else type(buffer).decode
+        baggage = {}
+        for _ in range(count):
+            key_length, value_length = unpack_item(buffer, offset)
+            offset += _ITEM.size
+            key_end = offset + key_length
+            end = key_end + value_length
+            if end > length:
+                raise SpanContextCorruptedException()
+            baggage[decode(buffer[offset:key_end], 'utf-8')] = \
+                decode(buffer[key_end:end], 'utf-8')
+            offset = end
+
+        trace_id = trace_id_high << 64 | trace_id_low
+        # Restored like an unpickled context, skipping __init__(), and
+        # handing over the freshly built dict rather than copying it.
+        span_context = SpanContext.__new__(SpanContext)
+        span_context.__setstate__((trace_id or None, span_id or None,
+                                   Baggage.from_dict(baggage), flags, None))
+        return span_context, offset
+
+
+class PickleBinaryPropagator(Propagator):
+    """The previous MockTracer Propagator for Format.BINARY, which pickles
+    the whole span context.
+
+    Only use it with trusted carriers: unpickling data received from the
+    network can execute arbitrary code.
+    """
+
+    def __init__(self, baggage_limits=None):
+        self._baggage_limits = baggage_limits
 
     def inject(self, span_context, carrier):
         if type(carrier) is not bytearray:
@@ -46,4 +241,7 @@ class BinaryPropagator(Propagator):
         except (EOFError, pickle.PickleError):
             raise SpanContextCorruptedException()
 
+        if self._baggage_limits is not None:
+            span_context = span_context.with_baggage(
+                self._baggage_limits.limit(span_context.baggage))
         return span_context
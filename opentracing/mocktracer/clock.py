@@ -0,0 +1,58 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+import time
+
+try:
+    from time import perf_counter_ns, time_ns
+except ImportError:  # Python < 3.7
+    _perf_counter = getattr(time, 'perf_counter', time.time)
+
+    def perf_counter_ns():
+        return int(_perf_counter() * 1e9)
+
+    def time_ns():
+        return int(time.time() * 1e9)
+
+
+TIMING_WALL = 'wall'
+TIMING_MONOTONIC = 'monotonic'
+
+
+class MonotonicClock(object):
+    """MonotonicClock returns integer nanosecond timestamps since the epoch,
+    measured with :func:`time.perf_counter_ns()`.
+
+    The wall clock is read once, when the clock is created, and every
+    timestamp is that anchor plus the monotonic time elapsed since. Durations
+    are therefore unaffected by adjustments of the system clock, while
+    timestamps remain comparable with :meth:`time.time()`.
+    """
+
+    __slots__ = ('_offset',)
+
+    def __init__(self):
+        self._offset = time_ns() - perf_counter_ns()
+
+    def now_ns(self):
+        """Return the current time, in nanoseconds since the epoch."""
+        return perf_counter_ns() + self._offset
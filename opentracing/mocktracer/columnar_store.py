@@ -0,0 +1,209 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from __future__ import absolute_import
+
+from array import array
+from itertools import compress
+import math
+from operator import sub
+
+from .record import SpanRecord
+from .span import LogData
+from .span_store import SpanStore
+
+try:
+    array('Q')
+    _UINT64 = 'Q'
+except ValueError:  # Python 2 has no 'Q', 'L' is 64 bits on LP64.
+    _UINT64 = 'L'
+
+_MASK64 = (1 << 64) - 1
+
+
+class ColumnarSpanStore(SpanStore):
+    """A :class:`~opentracing.mocktracer.span_store.SpanStore` that keeps
+    finished **Spans** as columns of typed :mod:`array`\\ s instead of
+    keeping the **Span** objects.
+
+    On finish, ids and timestamps are copied into the columns below, the
+    operation name is stored as an index into :attr:`operation_names`, and
+    non-empty tags, logs and baggage go to per-row side tables. The **Span**
+    itself is not retained, so :meth:`spans()` returns
+    :class:`~opentracing.mocktracer.record.SpanRecord` copies, and
+    :class:`~opentracing.mocktracer.MockTracer` does not index the **Spans**
+    for :meth:`~opentracing.mocktracer.MockTracer.query()` and
+    :meth:`~opentracing.mocktracer.MockTracer.traces()`.
+
+    Columns are public and support the buffer protocol, e.g. for
+    ``numpy.frombuffer()``. As with any span store, reading them while
+    **Spans** are finishing requires external synchronization.
+
+    :ivar trace_ids_high: upper 64 bits of the trace ids.
+    :ivar trace_ids_low: lower 64 bits of the trace ids.
+    :ivar span_ids: the span ids.
+    :ivar parent_ids: the parent span ids, ``0`` for root **Spans**.
+    :ivar start_times: start timestamps, per :meth:`time.time()`.
+    :ivar finish_times: finish timestamps, per :meth:`time.time()`.
+    :ivar operation_name_ids: indexes into :attr:`operation_names`.
+    """
+
+    retains_spans = False
+
+    def __init__(self):
+        super(ColumnarSpanStore, self).__init__()
+        self.operation_names = []
+        self._operation_name_ids = {}
+        self._reset_columns()
+
+    def _reset_columns(self):
+        self.trace_ids_high = array(_UINT64)
+        self.trace_ids_low = array(_UINT64)
+        self.span_ids = array(_UINT64)
+        self.parent_ids = array(_UINT64)
+        self.start_times = array('d')
+        self.finish_times = array('d')
+        self.operation_name_ids = array('I')
+        self._tags = {}
+        self._logs = {}
+        self._baggage = {}
+
+    def __len__(self):
+        return len(self.span_ids)
+
+    def _operation_name_id(self, operation_name):
+        name_id = self._operation_name_ids.get(operation_name)
+        if name_id is None:
+            name_id = len(self.operation_names)
+            self.operation_names.append(operation_name)
+            self._operation_name_ids[operation_name] = name_id
+        return name_id
+
+    def append(self, span):
+        row = len(self.span_ids)
+        context = span.context
+        self.trace_ids_high.append(context.trace_id >> 64)
+        self.trace_ids_low.append(context.trace_id & _MASK64)
+        self.span_ids.append(context.span_id)
+        self.parent_ids.append(span.parent_id or 0)
+        self.start_times.append(span.start_time)
+        self.finish_times.append(span.finish_time)
+        self.operation_name_ids.append(
+            self._operation_name_id(span.operation_name))
+
+        # Read the private tags and logs, as their properties allocate
+        # empty ones for untagged and log-less Spans.
+        if span._tags:
+            self._tags[row] = dict(span._tags)
+        if span._logs:
+            self._logs[row] = [(log.timestamp, log.key_values)
+                               for log in span._logs]
+        if context.baggage:
+            self._baggage[row] = dict(context.baggage)
+
+        self._stored += 1
+        return None
+
+    def _record(self, row):
+        logs = [LogData(key_values, timestamp)
+                for timestamp, key_values in self._logs.get(row, ())]
+        return SpanRecord(
+            trace_id=(self.trace_ids_high[row] << 64) |
+            self.trace_ids_low[row],
+            span_id=self.span_ids[row],
+            parent_id=self.parent_ids[row] or None,
+            operation_name=self.operation_names[
+                self.operation_name_ids[row]],
+            start_time=self.start_times[row],
+            finish_time=self.finish_times[row],
+            tags=self._tags.get(row),
+            logs=logs,
+            baggage=self._baggage.get(row))
+
+    def spans(self):
+        return [self._record(row) for row in range(len(self))]
+
+    def since(self, cursor):
+        first = self._stored - len(self)
+        start = max(cursor, first)
+        return [(first + row + 1, self._record(row))
+                for row in range(start - first, len(self))]
+
+    def drain(self):
+        records = self.spans()
+        self._reset_columns()
+        return records
+
+    def clear(self):
+        # Unlike drain(), no SpanRecord is built for the dropped rows.
+        self._reset_columns()
+        self.dropped_spans = 0
+
+    def durations(self, operation_name=None):
+        """Return the durations of the stored **Spans**, in seconds.
+
+        :param operation_name: if given, only the **Spans** with this
+            operation name are included.
+
+        :rtype: array.array
+        """
+        durations = array('d', map(sub, self.finish_times, self.start_times))
+        if operation_name is None:
+            return durations
+
+        name_id = self._operation_name_ids.get(operation_name)
+        return array('d', compress(
+            durations,
+            [name_id == i for i in self.operation_name_ids]))
+
+    def percentiles(self, percents, operation_name=None):
+        """Return the given percentiles of the **Span** durations, in
+        seconds, interpolating linearly between the closest ranks.
+
+        :param percents: an iterable of percents in ``[0, 100]``.
+        :param operation_name: if given, only the **Spans** with this
+            operation name are included.
+
+        :rtype: list
+        :return: one duration per percent, or ``None`` values if no
+            **Span** matches.
+        """
+        durations = sorted(self.durations(operation_name))
+        return [_percentile(durations, percent) for percent in percents]
+
+    def percentile(self, percent, operation_name=None):
+        """Return a single percentile of the **Span** durations, see
+        :meth:`percentiles()`."""
+        return self.percentiles((percent,), operation_name)[0]
+
+
+def _percentile(sorted_values, percent):
+    if not 0 <= percent <= 100:
+        raise ValueError('percent must be in [0, 100]')
+    if not sorted_values:
+        return None
+
+    rank = (len(sorted_values) - 1) * percent / 100.0
+    lower = int(math.floor(rank))
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = rank - lower
+    return sorted_values[lower] + \
+        (sorted_values[upper] - sorted_values[lower]) * fraction
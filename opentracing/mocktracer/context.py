@@ -22,30 +22,79 @@ from __future__ import absolute_import
 
 import opentracing
 
+from .baggage import Baggage
+
+
+SAMPLED = 0x01
+DEBUG = 0x02
+
 
 class SpanContext(opentracing.SpanContext):
     """SpanContext satisfies the opentracing.SpanContext contract.
 
-    trace_id and span_id are uint64's, so their range is [1, 2^64).
+    span_id is a uint64, so its range is [1, 2^64). trace_id is a uint64 as
+    well, or a uint128 when generated by a
+    :class:`~opentracing.mocktracer.id_generator.RandomIdGenerator` with
+    128-bit trace ids.
+
+    The baggage is an immutable
+    :class:`~opentracing.mocktracer.baggage.Baggage`, shared with child
+    **SpanContexts** rather than copied.
+
+    `flags` holds the trace flags received from or sent to other processes,
+    such as :data:`SAMPLED` or the Zipkin B3 :data:`DEBUG` flag, and
+    `tracestate` the vendor-specific
+    :class:`~opentracing.mocktracer.trace_context_propagator.TraceState` of
+    W3C Trace Context, if any. Both are inherited by child **SpanContexts**.
     """
 
+    __slots__ = ('trace_id', 'span_id', '_baggage', 'flags', 'tracestate')
+
     def __init__(
             self,
             trace_id=None,
             span_id=None,
-            baggage=None):
+            baggage=None,
+            sampled=True,
+            tracestate=None):
         self.trace_id = trace_id
         self.span_id = span_id
-        self._baggage = baggage or opentracing.SpanContext.EMPTY_BAGGAGE
+        self._baggage = Baggage.from_mapping(baggage)
+        self.flags = SAMPLED if sampled else 0
+        self.tracestate = tracestate
 
     @property
     def baggage(self):
         return self._baggage
 
+    @property
+    def sampled(self):
+        """Whether the trace is sampled, per the :data:`SAMPLED` flag."""
+        return bool(self.flags & SAMPLED)
+
+    @sampled.setter
+    def sampled(self, sampled):
+        self.flags = self.flags | SAMPLED if sampled \
+            else self.flags & ~SAMPLED
+
     def with_baggage_item(self, key, value):
-        new_baggage = self._baggage.copy()
-        new_baggage[key] = value
-        return SpanContext(
+        return self.with_baggage(self._baggage.set(key, value))
+
+    def with_baggage(self, baggage):
+        context = SpanContext(
             trace_id=self.trace_id,
             span_id=self.span_id,
-            baggage=new_baggage)
+            baggage=baggage,
+            tracestate=self.tracestate)
+        context.flags = self.flags
+        return context
+
+    def __getstate__(self):
+        return (self.trace_id, self.span_id, self._baggage, self.flags,
+                self.tracestate)
+
+    def __setstate__(self, state):
+        if len(state) == 3:  # Pickled before flags were added.
+            state += (SAMPLED, None)
+        (self.trace_id, self.span_id, self._baggage, self.flags,
+         self.tracestate) = state
@@ -0,0 +1,365 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from __future__ import absolute_import
+
+from array import array
+import json
+import os
+import struct
+from threading import Lock
+
+from .columnar_store import _UINT64
+from .record import SpanRecord
+from .span import LogData
+from .span_processor import SpanProcessor
+from .stack_capture import CapturedStack
+
+FORMAT_JSONL = 'jsonl'
+FORMAT_BINARY = 'binary'
+
+BINARY_MAGIC = b'OTMOCK\x00\x01'
+INDEX_MAGIC = b'OTMOCKIX'
+
+_MASK64 = (1 << 64) - 1
+# Record length, then trace id (high, low), span id, parent id (0 if none),
+# start and finish times and the operation name length.
+_LENGTH = struct.Struct('<I')
+_HEADER = struct.Struct('<QQQQddH')
+
+# A closed binary file ends with an index of its records, introduced by
+# _INDEX_MARKER in place of a record length:
+#
+# - the trace index: a count, then (trace id high, trace id low, record
+#   offset) entries sorted by trace id and offset;
+# - the operation name index: a count, then for each name its length, the
+#   UTF-8 name, an offset count and the record offsets;
+# - the footer: the offsets of both indexes and INDEX_MAGIC.
+_INDEX_MARKER = 0xFFFFFFFF
+_COUNT = struct.Struct('<I')
+_NAME_LENGTH = struct.Struct('<H')
+_TRACE_ENTRY = struct.Struct('<QQQ')
+_FOOTER = struct.Struct('<QQ8s')
+
+
+def _span_fields(span):
+    context = span.context
+    return {
+        'trace_id': context.trace_id,
+        'span_id': context.span_id,
+        'parent_id': span.parent_id,
+        'operation_name': span.operation_name,
+        'start_time': span.start_time,
+        'finish_time': span.finish_time,
+        'tags': span.tags or {},
+        'logs': [[log.timestamp, log.key_values] for log in span.logs],
+        'baggage': dict(context.baggage),
+    }
+
+
+def _slice_bytes(buffer, start, end):
+    data = buffer[start:end]
+    return data.tobytes() if isinstance(data, memoryview) else bytes(data)
+
+
+def _json_default(value):
+    # Captured stacks are only formatted here, on export.
+    return str(value) if isinstance(value, CapturedStack) else repr(value)
+
+
+def _encode_json(value):
+    return json.dumps(value, default=_json_default, separators=(',', ':')) \
+        .encode('utf-8')
+
+
+def encode_jsonl(span):
+    """Encode a finished **Span** as a JSON Lines record. Ids are
+    hex-encoded and values that are not JSON-serializable are stored as
+    their :func:`repr`, or as the formatted stack for a
+    :class:`~opentracing.mocktracer.stack_capture.CapturedStack`."""
+    fields = _span_fields(span)
+    for key in ('trace_id', 'span_id', 'parent_id'):
+        if fields[key] is not None:
+            fields[key] = '%x' % fields[key]
+    return _encode_json(fields) + b'\n'
+
+
+def decode_jsonl(line):
+    fields = json.loads(line.decode('utf-8'))
+    for key in ('trace_id', 'span_id', 'parent_id'):
+        if fields[key] is not None:
+            fields[key] = int(fields[key], 16)
+    fields['logs'] = [LogData(key_values, timestamp)
+                      for timestamp, key_values in fields['logs']]
+    return SpanRecord(**fields)
+
+
+def encode_binary(span):
+    """Encode a finished **Span** as a length-prefixed binary record: a
+    fixed-size header with the ids and timestamps, the UTF-8 operation name,
+    then tags, logs and baggage as JSON when any is present."""
+    fields = _span_fields(span)
+    operation_name = (fields['operation_name'] or '').encode('utf-8')
+    extra = (fields['tags'], fields['logs'], fields['baggage'])
+    extra = _encode_json(extra) if any(extra) else b''
+
+    body = _HEADER.pack(fields['trace_id'] >> 64,
+                        fields['trace_id'] & _MASK64,
+                        fields['span_id'],
+                        fields['parent_id'] or 0,
+                        fields['start_time'],
+                        fields['finish_time'],
+                        len(operation_name)) + operation_name + extra
+    return _LENGTH.pack(len(body)) + body
+
+
+def decode_binary(buffer, offset=0):
+    """Decode the binary record starting at `offset` in `buffer`.
+
+    :return: a ``(record, next_offset)`` tuple.
+    """
+    length, = _LENGTH.unpack_from(buffer, offset)
+    start = offset + _LENGTH.size
+    end = start + length
+    (trace_id_high, trace_id_low, span_id, parent_id, start_time,
+     finish_time, name_length) = _HEADER.unpack_from(buffer, start)
+
+    name_start = start + _HEADER.size
+    name_end = name_start + name_length
+    tags, logs, baggage = {}, [], {}
+    if name_end < end:
+        tags, logs, baggage = json.loads(
+            _slice_bytes(buffer, name_end, end).decode('utf-8'))
+
+    record = SpanRecord(
+        trace_id=(trace_id_high << 64) | trace_id_low,
+        span_id=span_id,
+        parent_id=parent_id or None,
+        operation_name=_slice_bytes(buffer, name_start, name_end)
+        .decode('utf-8'),
+        start_time=start_time,
+        finish_time=finish_time,
+        tags=tags,
+        logs=[LogData(key_values, timestamp)
+              for timestamp, key_values in logs],
+        baggage=baggage)
+    return record, end
+
+
+class _SegmentIndex(object):
+    """The record offsets of one binary file, written when it is
+    closed."""
+
+    def __init__(self):
+        self.trace_ids_high = array(_UINT64)
+        self.trace_ids_low = array(_UINT64)
+        self.offsets = array(_UINT64)
+        self.names = {}
+
+    def add(self, trace_id, operation_name, offset):
+        self.trace_ids_high.append(trace_id >> 64)
+        self.trace_ids_low.append(trace_id & _MASK64)
+        self.offsets.append(offset)
+        self.names.setdefault(operation_name or '', []).append(offset)
+
+    def encode(self, offset):
+        high, low, offsets = \
+            self.trace_ids_high, self.trace_ids_low, self.offsets
+        order = sorted(range(len(offsets)),
+                       key=lambda i: (high[i], low[i], offsets[i]))
+
+        trace_index_offset = offset + _LENGTH.size
+        parts = [_LENGTH.pack(_INDEX_MARKER), _COUNT.pack(len(order))]
+        parts.extend(_TRACE_ENTRY.pack(high[i], low[i], offsets[i])
+                     for i in order)
+
+        name_index_offset = trace_index_offset + _COUNT.size + \
+            len(order) * _TRACE_ENTRY.size
+        parts.append(_COUNT.pack(len(self.names)))
+        for name, name_offsets in self.names.items():
+            name = name.encode('utf-8')
+            parts.append(_NAME_LENGTH.pack(len(name)) + name)
+            parts.append(_COUNT.pack(len(name_offsets)))
+            parts.append(struct.pack('<%dQ' % len(name_offsets),
+                                     *name_offsets))
+
+        parts.append(_FOOTER.pack(trace_index_offset, name_index_offset,
+                                  INDEX_MAGIC))
+        return b''.join(parts)
+
+
+def segment_path(path, index):
+    """Return the path of the `index`-th segment of a span file: `path`
+    itself, then ``path.1``, ``path.2`` and so on."""
+    return path if index == 0 else '%s.%d' % (path, index)
+
+
+class FileSpanExporter(SpanProcessor):
+    """A :class:`~opentracing.mocktracer.span_processor.SpanProcessor`
+    writing finished **Spans** to an append-only file, so long recordings
+    do not need to keep them in memory (combine it with a bounded span
+    store, or drain the MockTracer).
+
+    Records are buffered and written `batch_size` at a time. When
+    `max_bytes` is set, the file is rotated before a batch would grow it
+    past that size: writing continues in ``path.1``, then ``path.2`` and so
+    on. A batch larger than `max_bytes` is written whole to a fresh file.
+    Use :func:`read_spans()` to read the files back.
+
+    JSON Lines files are appended to if they exist, resuming in the last
+    existing segment. Binary files are always new: existing segments are
+    skipped. When a binary file is
+    closed, an index of its records by trace id and operation name is
+    appended, for random access through
+    :class:`~opentracing.mocktracer.mapped_reader.MappedSpanFile`.
+
+    :param path: the file to write to.
+    :param format: :data:`FORMAT_JSONL` (one JSON object per line) or
+        :data:`FORMAT_BINARY` (length-prefixed binary records).
+    :param batch_size: the number of records buffered before writing.
+    :param max_bytes: the size after which the file is rotated, or
+        ``None`` to never rotate.
+    """
+
+    def __init__(self, path, format=FORMAT_JSONL, batch_size=512,
+                 max_bytes=None):
+        if format not in (FORMAT_JSONL, FORMAT_BINARY):
+            raise ValueError('Unknown format: %r' % (format,))
+
+        self.path = path
+        self.format = format
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.segments = []
+        self._encode = encode_jsonl if format == FORMAT_JSONL \
+            else encode_binary
+        self._batch = []
+        self._batch_bytes = 0
+        # (trace id, operation name, offset in the batch) of binary records,
+        # indexed once the segment they are written to is known.
+        self._batch_index = []
+        # The size of a segment holding no record.
+        self._empty_size = len(BINARY_MAGIC) if format == FORMAT_BINARY \
+            else 0
+        self._lock = Lock()
+        self._file = None
+        self._index = None
+        self._segment = 0
+        if format == FORMAT_JSONL:
+            # Resume in the last segment of a previous exporter, so that
+            # segments stay in order.
+            while os.path.exists(segment_path(path, self._segment + 1)):
+                self._segment += 1
+        self._open_segment()
+
+    def _open_segment(self):
+        path = segment_path(self.path, self._segment)
+        if self.format == FORMAT_BINARY:
+            while os.path.exists(path) and os.path.getsize(path) > 0:
+                self._segment += 1
+                path = segment_path(self.path, self._segment)
+
+        self._file = open(path, 'ab')
+        self._size = os.fstat(self._file.fileno()).st_size
+        if self.format == FORMAT_BINARY:
+            self._file.write(BINARY_MAGIC)
+            self._size = len(BINARY_MAGIC)
+            self._index = _SegmentIndex()
+        self.segments.append(path)
+
+    def _rotate(self):
+        self._close_segment()
+        self._segment += 1
+        self._open_segment()
+
+    def _close_segment(self):
+        if self._index is not None:
+            self._file.write(self._index.encode(self._size))
+        self._file.close()
+
+    def on_finish(self, span):
+        data = self._encode(span)
+        with self._lock:
+            if self._index is not None:
+                self._batch_index.append((span.context.trace_id,
+                                          span.operation_name,
+                                          self._batch_bytes))
+            self._batch.append(data)
+            self._batch_bytes += len(data)
+            if len(self._batch) >= self.batch_size:
+                self._write_batch()
+
+    def _write_batch(self):
+        if not self._batch:
+            return
+
+        data = b''.join(self._batch)
+        self._batch = []
+        self._batch_bytes = 0
+        if self.max_bytes is not None and \
+                self._size > self._empty_size and \
+                self._size + len(data) > self.max_bytes:
+            self._rotate()
+
+        if self._index is not None:
+            for trace_id, operation_name, offset in self._batch_index:
+                self._index.add(trace_id, operation_name, self._size + offset)
+            self._batch_index = []
+        self._file.write(data)
+        self._size += len(data)
+
+    def flush(self):
+        """Write the buffered records and flush the file."""
+        with self._lock:
+            self._write_batch()
+            self._file.flush()
+
+    def shutdown(self):
+        """Write the buffered records and close the file."""
+        with self._lock:
+            self._write_batch()
+            self._close_segment()
+
+
+def read_spans(path):
+    """Stream the **Spans** written by a :class:`FileSpanExporter` to one
+    file (see :func:`segment_path()` for rotated files) back as
+    :class:`~opentracing.mocktracer.record.SpanRecord` objects. The format
+    is detected from the file contents.
+
+    :rtype: iterator
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            f.seek(0)
+            for line in f:
+                yield decode_jsonl(line)
+            return
+
+        while True:
+            prefix = f.read(_LENGTH.size)
+            if len(prefix) < _LENGTH.size:
+                return
+            length, = _LENGTH.unpack(prefix)
+            if length == _INDEX_MARKER:
+                return
+            record, _ = decode_binary(prefix + f.read(length))
+            yield record
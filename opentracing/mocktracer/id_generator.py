@@ -0,0 +1,161 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from __future__ import absolute_import
+
+import itertools
+import os
+import random
+from threading import Lock, local
+
+# Bumped in forked children so that per-thread random generators reseed
+# instead of repeating the parent's sequence. Without os.register_at_fork
+# (Python < 3.7), the pid is used to detect forks instead.
+_fork_generation = 0
+
+
+def _after_fork_in_child():
+    global _fork_generation
+    _fork_generation += 1
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+    def _current_generation():
+        return _fork_generation
+else:
+    _current_generation = os.getpid
+
+
+class IdGenerator(object):
+    """IdGenerator hands out trace and span ids for a
+    :class:`~opentracing.mocktracer.MockTracer`.
+
+    Implementations must be safe to call from multiple threads and must
+    never return ``0``, which is reserved as the "unset" id.
+    """
+
+    def generate_span_id(self):
+        """Return a new span id.
+
+        :rtype: int
+        """
+        raise NotImplementedError()
+
+    def generate_trace_id(self):
+        """Return a new trace id. Defaults to :meth:`generate_span_id()`.
+
+        :rtype: int
+        """
+        return self.generate_span_id()
+
+
+class SequentialIdGenerator(IdGenerator):
+    """Consecutive ids starting at `start`, shared by trace and span ids.
+
+    Ids come from a single :func:`itertools.count`, which advances
+    atomically under the GIL, so no lock is taken per id. For the same
+    sequence of calls the generated ids are always the same, which keeps
+    single-threaded tests repeatable.
+    """
+
+    def __init__(self, start=1):
+        self._counter = itertools.count(start)
+
+    def generate_span_id(self):
+        return next(self._counter)
+
+
+class BlockIdGenerator(IdGenerator):
+    """Consecutive ids handed out to each thread in blocks of `block_size`.
+
+    A thread takes the shared lock once per block and generates the rest of
+    the ids from its own block, so ids are unique but not globally ordered.
+    """
+
+    def __init__(self, block_size=1024, start=1):
+        if block_size < 1:
+            raise ValueError('block_size must be a positive integer')
+
+        self.block_size = block_size
+        self._next_block = start
+        self._lock = Lock()
+        self._local = local()
+
+    def _reserve_block(self):
+        with self._lock:
+            block_start = self._next_block
+            self._next_block += self.block_size
+
+        block = itertools.count(block_start)
+        self._local.ids = block
+        self._local.block_end = block_start + self.block_size
+        return block
+
+    def generate_span_id(self):
+        local_state = self._local
+        ids = getattr(local_state, 'ids', None)
+        if ids is None:
+            ids = self._reserve_block()
+
+        next_id = next(ids)
+        if next_id >= local_state.block_end:
+            next_id = next(self._reserve_block())
+        return next_id
+
+
+class RandomIdGenerator(IdGenerator):
+    """Random span ids in ``[1, 2^64)`` and trace ids in
+    ``[1, 2^trace_id_bits)``, with `trace_id_bits` either 64 or 128.
+
+    Each thread draws from its own :class:`random.Random`, seeded once from
+    :func:`os.urandom` and reseeded after a fork, so ids do not repeat
+    across processes and generating one needs neither a lock nor a syscall.
+    """
+
+    def __init__(self, trace_id_bits=64):
+        if trace_id_bits not in (64, 128):
+            raise ValueError('trace_id_bits must be 64 or 128')
+
+        self.trace_id_bits = trace_id_bits
+        self._local = local()
+
+    def _rng(self):
+        local_state = self._local
+        generation = _current_generation()
+        if getattr(local_state, 'generation', None) != generation:
+            local_state.rng = random.Random(os.urandom(16))
+            local_state.generation = generation
+        return local_state.rng
+
+    def _random_id(self, bits):
+        rng = self._rng()
+        value = rng.getrandbits(bits)
+        while value == 0:
+            value = rng.getrandbits(bits)
+        return value
+
+    def generate_span_id(self):
+        return self._random_id(64)
+
+    def generate_trace_id(self):
+        return self._random_id(self.trace_id_bits)
@@ -0,0 +1,225 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from __future__ import absolute_import
+
+import mmap
+import struct
+
+from .exporter import BINARY_MAGIC, INDEX_MAGIC, decode_binary, \
+        _COUNT, _FOOTER, _INDEX_MARKER, _LENGTH, _MASK64, _NAME_LENGTH, \
+        _TRACE_ENTRY
+
+
+class MappedSpanFile(object):
+    """MappedSpanFile gives random access to a binary span file written by
+    :class:`~opentracing.mocktracer.exporter.FileSpanExporter`, through a
+    read-only memory map.
+
+    The trace and operation name indexes at the end of the file are read
+    in place: looking up a trace binary-searches the trace index, and only
+    the matching records are decoded. Raw records are available as
+    :class:`memoryview` slices of the mapping, without copying. Files that
+    were not closed properly have no index; they are scanned once when
+    opened instead.
+
+    Use it as a context manager, or call :meth:`close()`. Raw record views
+    must be released before closing.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        except ValueError:  # An empty file cannot be mapped.
+            self._file.close()
+            raise ValueError('%s is not a binary span file' % path)
+
+        try:
+            self._view = memoryview(self._mmap)
+        except TypeError:  # Python 2 mmap lacks the new buffer protocol.
+            self._view = self._mmap
+
+        if self._mmap[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+            self.close()
+            raise ValueError('%s is not a binary span file' % path)
+
+        self._scanned_traces = None
+        self._scanned_names = None
+        if not self._read_footer():
+            self._scan()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._view is not self._mmap:
+            self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def _read_footer(self):
+        size = len(self._mmap)
+        if size < len(BINARY_MAGIC) + _FOOTER.size:
+            return False
+
+        trace_index_offset, name_index_offset, magic = \
+            _FOOTER.unpack_from(self._mmap, size - _FOOTER.size)
+        if magic != INDEX_MAGIC:
+            return False
+
+        self._trace_count, = _COUNT.unpack_from(self._mmap,
+                                                trace_index_offset)
+        self._trace_entries = trace_index_offset + _COUNT.size
+        self._names = self._read_names(name_index_offset)
+        return True
+
+    def _read_names(self, offset):
+        """Map each operation name to the position and count of its
+        offsets, without reading the offsets themselves."""
+        names = {}
+        count, = _COUNT.unpack_from(self._mmap, offset)
+        offset += _COUNT.size
+        for _ in range(count):
+            length, = _NAME_LENGTH.unpack_from(self._mmap, offset)
+            offset += _NAME_LENGTH.size
+            name = self._mmap[offset:offset + length].decode('utf-8')
+            offset += length
+            offsets_count, = _COUNT.unpack_from(self._mmap, offset)
+            offset += _COUNT.size
+            names[name] = (offset, offsets_count)
+            offset += offsets_count * 8
+        return names
+
+    def _scan(self):
+        self._scanned_traces = {}
+        self._scanned_names = {}
+        for offset, record in self._iter_records():
+            self._scanned_traces.setdefault(record.trace_id, []) \
+                .append(offset)
+            self._scanned_names.setdefault(record.operation_name or '', []) \
+                .append(offset)
+
+    def _iter_records(self):
+        offset = len(BINARY_MAGIC)
+        size = len(self._mmap)
+        while offset + _LENGTH.size <= size:
+            length, = _LENGTH.unpack_from(self._mmap, offset)
+            if length == _INDEX_MARKER or \
+                    offset + _LENGTH.size + length > size:
+                return
+            record, next_offset = decode_binary(self._view, offset)
+            yield offset, record
+            offset = next_offset
+
+    def __iter__(self):
+        """Iterate over every record of the file, in file order."""
+        for _, record in self._iter_records():
+            yield record
+
+    def _trace_offsets(self, trace_id):
+        if self._scanned_traces is not None:
+            return self._scanned_traces.get(trace_id, [])
+
+        key = (trace_id >> 64, trace_id & _MASK64)
+        low, high = 0, self._trace_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._trace_entry(middle)[:2] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        offsets = []
+        while low < self._trace_count:
+            entry = self._trace_entry(low)
+            if entry[:2] != key:
+                break
+            offsets.append(entry[2])
+            low += 1
+        return offsets
+
+    def _trace_entry(self, position):
+        return _TRACE_ENTRY.unpack_from(
+            self._mmap, self._trace_entries + position * _TRACE_ENTRY.size)
+
+    def _name_offsets(self, operation_name):
+        operation_name = operation_name or ''
+        if self._scanned_names is not None:
+            return self._scanned_names.get(operation_name, [])
+
+        position, count = self._names.get(operation_name, (0, 0))
+        return list(struct.unpack_from('<%dQ' % count, self._mmap, position))
+
+    def raw_record(self, offset):
+        """Return the encoded record at `offset` as a zero-copy view of
+        the file (a slice of the mapping on Python 2)."""
+        length, = _LENGTH.unpack_from(self._mmap, offset)
+        return self._view[offset:offset + _LENGTH.size + length]
+
+    def raw_trace(self, trace_id):
+        """Return the encoded records of a trace, see
+        :meth:`raw_record()`.
+
+        :rtype: list
+        """
+        return [self.raw_record(offset)
+                for offset in self._trace_offsets(trace_id)]
+
+    def trace(self, trace_id):
+        """Return the records of a trace, in finish order.
+
+        :rtype: list
+        :return: a list of
+            :class:`~opentracing.mocktracer.record.SpanRecord`.
+        """
+        return [decode_binary(self._view, offset)[0]
+                for offset in self._trace_offsets(trace_id)]
+
+    def spans_by_operation_name(self, operation_name):
+        """Return the records with the given operation name, in finish
+        order.
+
+        :rtype: list
+        :return: a list of
+            :class:`~opentracing.mocktracer.record.SpanRecord`.
+        """
+        return [decode_binary(self._view, offset)[0]
+                for offset in self._name_offsets(operation_name)]
+
+    def raw_spans_by_operation_name(self, operation_name):
+        """Return the encoded records with the given operation name, see
+        :meth:`raw_record()`.
+
+        :rtype: list
+        """
+        return [self.raw_record(offset)
+                for offset in self._name_offsets(operation_name)]
+
+    @property
+    def indexed(self):
+        """Whether the file has an index, rather than having been
+        scanned."""
+        return self._scanned_traces is None
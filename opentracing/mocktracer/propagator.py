@@ -20,6 +20,14 @@
 
 from __future__ import absolute_import
 
+from email.message import Message
+
+from opentracing import SpanContextCorruptedException
+
+PROPAGATION_OT = 'ot'
+PROPAGATION_W3C = 'w3c'
+PROPAGATION_B3 = 'b3'
+
 
 class Propagator(object):
 
@@ -28,3 +36,83 @@ class Propagator(object):
 
     def extract(self, carrier):
         pass
+
+
+class FieldLookup(object):
+    """Finds a fixed set of fields in a text carrier, matching their names
+    case-insensitively, and optionally the fields whose names start with
+    `prefix`.
+
+    Keys that cannot match, judging by their first character, are skipped
+    without being lowered. Carriers whose lookups are already
+    case-insensitive, such as :class:`email.message.Message` or instances
+    of `case_insensitive_types`, have the fixed fields queried directly
+    instead. A field found more than once, in any case, makes the carrier
+    corrupted.
+
+    :param names: the lowercase field names.
+    :param case_insensitive_types: additional case-insensitive carrier
+        types.
+    :param prefix: the lowercase prefix of the fields collected by
+        :meth:`lookup()` into `prefixed`.
+    """
+
+    def __init__(self, names, case_insensitive_types=(), prefix=None):
+        self.names = frozenset(names)
+        self.prefix = prefix
+        first_names = list(self.names) + ([prefix] if prefix else [])
+        self._first_chars = frozenset(
+            char for name in first_names
+            for char in (name[:1].lower(), name[:1].upper()))
+        self._case_insensitive_types = (Message,) + \
+            tuple(case_insensitive_types)
+
+    def lookup(self, carrier, prefixed=None):
+        """Return a dict of the fields found in `carrier`, keyed by their
+        lowercase names. If `prefixed` is given, the fields starting with
+        `prefix` are added to it, keyed by the rest of their lowercase
+        names.
+
+        :raises SpanContextCorruptedException: if a field is found more
+            than once.
+        """
+        if isinstance(carrier, self._case_insensitive_types):
+            fields = self._get_fields(carrier)
+            if prefixed is not None:
+                self._scan(carrier, None, prefixed)
+            return fields
+
+        fields = {}
+        self._scan(carrier, fields, prefixed)
+        return fields
+
+    def _get_fields(self, carrier):
+        # Message.get_all() reports every occurrence of a header.
+        get_all = getattr(carrier, 'get_all', None)
+        fields = {}
+        for name in self.names:
+            if get_all is None:
+                value = carrier.get(name)
+                values = () if value is None else (value,)
+            else:
+                values = get_all(name) or ()
+            if len(values) > 1:
+                raise SpanContextCorruptedException()
+            if values:
+                fields[name] = values[0]
+        return fields
+
+    def _scan(self, carrier, fields, prefixed):
+        names = self.names if fields is not None else ()
+        prefix = self.prefix if prefixed is not None else None
+        first_chars = self._first_chars
+        for key in carrier:
+            if key[:1] not in first_chars:
+                continue
+            lowered = key.lower()
+            if lowered in names:
+                if lowered in fields:
+                    raise SpanContextCorruptedException()
+                fields[lowered] = carrier[key]
+            elif prefix and lowered.startswith(prefix):
+                prefixed[lowered[len(prefix):]] = carrier[key]
@@ -0,0 +1,84 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from __future__ import absolute_import
+
+from .context import SpanContext
+from .span import LogData
+
+
+class SpanRecord(object):
+    """SpanRecord is a lightweight, detached copy of a finished
+    :class:`~opentracing.mocktracer.span.MockSpan`.
+
+    Records are produced by span stores and readers that do not keep the
+    **Spans** themselves. They expose the same read-only attributes as a
+    finished **MockSpan**: `operation_name`, `context`, `parent_id`,
+    `start_time`, `finish_time`, `tags` and `logs`.
+    """
+
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'operation_name',
+                 'start_time', 'finish_time', 'tags', 'logs', 'baggage')
+
+    finished = True
+
+    def __init__(self, trace_id, span_id, parent_id, operation_name,
+                 start_time, finish_time, tags=None, logs=None,
+                 baggage=None):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.operation_name = operation_name
+        self.start_time = start_time
+        self.finish_time = finish_time
+        self.tags = {} if tags is None else tags
+        self.logs = [] if logs is None else logs
+        self.baggage = {} if baggage is None else baggage
+
+    @classmethod
+    def from_span(cls, span):
+        """Copy the fields of a finished **MockSpan** into a record."""
+        context = span.context
+        return cls(trace_id=context.trace_id,
+                   span_id=context.span_id,
+                   parent_id=span.parent_id,
+                   operation_name=span.operation_name,
+                   start_time=span.start_time,
+                   finish_time=span.finish_time,
+                   tags=dict(span.tags or {}),
+                   logs=[LogData(dict(log.key_values), log.timestamp)
+                         for log in span.logs],
+                   baggage=dict(context.baggage))
+
+    @property
+    def context(self):
+        return SpanContext(trace_id=self.trace_id,
+                           span_id=self.span_id,
+                           baggage=self.baggage)
+
+    @property
+    def duration(self):
+        """The duration of the **Span**, in seconds."""
+        return self.finish_time - self.start_time
+
+    def __repr__(self):
+        return 'SpanRecord(operation_name=%r, trace_id=%x, span_id=%x)' % (
+            self.operation_name, self.trace_id, self.span_id)
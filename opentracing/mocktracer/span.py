@@ -23,11 +23,90 @@ from __future__ import absolute_import
 from threading import Lock
 import time
 
+try:
+    from threading import get_ident
+except ImportError:  # Python 2
+    from thread import get_ident
+
 from opentracing import Span
+from opentracing.lazy import LazyValue
+
+from .span_logs import LogData, SpanLogs, intern_log_values  # noqa
+
+
+LOCKING_ALWAYS = 'always'
+LOCKING_NONE = 'none'
+LOCKING_OWNER = 'owner'
+
+# Serializes the switch of owned MockSpans to locking.
+_share_lock = Lock()
+
+
+class _NoLock(object):
+    """Stands in for the Lock of MockSpans that are never mutated
+    concurrently."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NO_LOCK = _NoLock()
+
+
+def _resolve(lazy_value):
+    """Resolves a LazyValue, falling back to a description of the error it
+    raises, which must not escape finish()."""
+    try:
+        return lazy_value.resolve()
+    except Exception as error:
+        return '<LazyValue failed: %r>' % (error,)
+
+
+def _resolve_payload(key_values):
+    """Returns `key_values` with its LazyValues resolved. The dict is the
+    caller's, so it is copied rather than updated if any value is lazy."""
+    if not any(isinstance(value, LazyValue)
+               for value in key_values.values()):
+        return key_values
+    return dict((key, _resolve(value) if isinstance(value, LazyValue)
+                 else value)
+                for key, value in key_values.items())
 
 
 class MockSpan(Span):
     """MockSpan is a thread-safe implementation of opentracing.Span.
+
+    The tags dict and logs list are only allocated when first used. With
+    `locking` set to :data:`LOCKING_NONE` the **Span** allocates no lock and
+    is no longer thread-safe: use it for **Spans** only ever mutated by one
+    thread at a time. :data:`LOCKING_ALWAYS` (the default) locks every
+    mutation.
+
+    With :data:`LOCKING_OWNER` the **Span** records the thread that created
+    it and that thread mutates it without locking. The first time another
+    thread mutates or reads it, the **Span** allocates a lock and from then
+    on locks every call, including the owner's. That thread first waits
+    for the call the owner may have in progress to complete.
+
+    Timestamps are kept either as :meth:`time.time()` floats or, when the
+    tracer uses monotonic timing, as integer nanoseconds. Both are
+    available: `start_time` and `finish_time` in seconds, `start_ns`,
+    `finish_ns` and `duration_ns` in nanoseconds, the other unit being
+    derived when read.
+
+    :class:`~opentracing.LazyValue` tag and log values are resolved when the
+    **Span** finishes, or when logged if the tracer's
+    :class:`~opentracing.mocktracer.span_logs.LogLimits` has `max_bytes`,
+    since log records are sized as they are added. A value that fails to
+    resolve is replaced by a description of the error, so that the
+    **Span** is still recorded.
+
+    Log records are kept compactly in a
+    :class:`~opentracing.mocktracer.span_logs.SpanLogs`, bounded by the
+    tracer's :class:`~opentracing.mocktracer.span_logs.LogLimits` if any.
     """
 
     def __init__(
@@ -37,58 +116,278 @@ class MockSpan(Span):
             context=None,
             parent_id=None,
             tags=None,
-            start_time=None):
+            start_time=None,
+            locking=LOCKING_ALWAYS,
+            start_ns=None):
         super(MockSpan, self).__init__(tracer, context)
-        self._tracer = tracer
-        self._lock = Lock()
+        if locking == LOCKING_OWNER:
+            self._owner = get_ident()
+            self._lock = None
+            self._busy = False
+        else:
+            self._owner = None
+            self._lock = Lock() if locking == LOCKING_ALWAYS else _NO_LOCK
 
         self.operation_name = operation_name
-        self.start_time = start_time
+        self._start_time = start_time
+        self._start_ns = start_ns
         self.parent_id = parent_id
-        self.tags = tags if tags is not None else {}
-        self.finish_time = -1
+        self._tags = tags
+        self._finish_time = -1
+        self._finish_ns = None
         self.finished = False
-        self.logs = []
+        self._logs = None
+
+    @property
+    def start_time(self):
+        if self._start_ns is None:
+            return self._start_time
+        return self._start_ns / 1e9
+
+    @start_time.setter
+    def start_time(self, start_time):
+        self._start_time = start_time
+        self._start_ns = None
+
+    @property
+    def start_ns(self):
+        if self._start_ns is None and self._start_time is not None:
+            return int(round(self._start_time * 1e9))
+        return self._start_ns
+
+    @property
+    def finish_time(self):
+        if self._finish_ns is None:
+            return self._finish_time
+        return self._finish_ns / 1e9
+
+    @finish_time.setter
+    def finish_time(self, finish_time):
+        self._finish_time = finish_time
+        self._finish_ns = None
+
+    @property
+    def finish_ns(self):
+        """The finish timestamp in nanoseconds, or ``None`` if the **Span**
+        is not finished."""
+        if self._finish_ns is None and self.finished:
+            return int(round(self._finish_time * 1e9))
+        return self._finish_ns
+
+    @property
+    def duration_ns(self):
+        """The duration in nanoseconds, or ``None`` if the **Span** is not
+        finished."""
+        if not self.finished:
+            return None
+        return self.finish_ns - self.start_ns
+
+    @property
+    def tags(self):
+        if self._tags is None:
+            self._tags = {}
+        return self._tags
+
+    @tags.setter
+    def tags(self, tags):
+        self._tags = tags
+
+    @property
+    def logs(self):
+        if self._logs is None:
+            self._logs = SpanLogs(self._tracer._log_limits,
+                                  ns=self._tracer._clock is not None)
+        return self._logs
+
+    @logs.setter
+    def logs(self, logs):
+        self._logs = None
+        self.logs.add_all(self._log_entry(log.key_values, log._timestamp,
+                                          log._timestamp_ns)
+                          for log in logs)
+
+    @property
+    def dropped_logs(self):
+        """The number of log records dropped to honor the tracer's
+        :class:`~opentracing.mocktracer.span_logs.LogLimits`."""
+        return 0 if self._logs is None else self._logs.dropped
+
+    def _enter_owned(self):
+        """Returns True if the calling thread owns this **Span**, which it
+        then mutates without locking, resetting `_busy` when done.
+        Otherwise switches the **Span** to locking and returns False."""
+        if self._owner == get_ident():
+            # Flag the call before checking ownership again: a thread
+            # switching the Span to locking clears the owner first, then
+            # waits for the flag.
+            self._busy = True
+            if self._owner is not None:
+                return True
+            self._busy = False
+            return False
+
+        with _share_lock:
+            if self._owner is not None:
+                # The new lock is held until the owner's call in progress,
+                # if any, is done, so that no locked call overlaps it.
+                lock = Lock()
+                lock.acquire()
+                self._lock = lock
+                self._owner = None
+                while self._busy:
+                    time.sleep(0)
+                lock.release()
+        return False
 
     def set_operation_name(self, operation_name):
-        with self._lock:
-            self.operation_name = operation_name
+        interner = self._tracer._interner
+        if interner is not None:
+            operation_name = interner.intern(operation_name)
+        if self._owner is not None and self._enter_owned():
+            try:
+                self.operation_name = operation_name
+            finally:
+                self._busy = False
+        else:
+            with self._lock:
+                self.operation_name = operation_name
         return super(MockSpan, self).set_operation_name(operation_name)
 
     def set_tag(self, key, value):
-        with self._lock:
-            if self.tags is None:
-                self.tags = {}
-            self.tags[key] = value
+        interner = self._tracer._interner
+        if interner is not None:
+            key = interner.intern(key)
+        if self._owner is not None and self._enter_owned():
+            try:
+                self.tags[key] = value
+            finally:
+                self._busy = False
+        else:
+            with self._lock:
+                self.tags[key] = value
         return super(MockSpan, self).set_tag(key, value)
 
+    def set_tags(self, tags):
+        if self._tracer._interner is not None:
+            tags = self._tracer._intern_tags(tags)
+        if self._owner is not None and self._enter_owned():
+            try:
+                self.tags.update(tags)
+            finally:
+                self._busy = False
+        else:
+            with self._lock:
+                self.tags.update(tags)
+        return self
+
+    def _log_entry(self, key_values, timestamp, timestamp_ns=None):
+        """Returns the `(key_values, timestamp)` pair stored for a log
+        record, with the timestamp in the unit of the tracer's clock."""
+        tracer = self._tracer
+        limits = tracer._log_limits
+        if limits is not None and limits.max_bytes is not None:
+            # Lazy values are sized as what they compute, so they are
+            # resolved now rather than on finish.
+            key_values = _resolve_payload(key_values)
+        key_values = intern_log_values(tracer._log_interner, key_values)
+        if tracer._stack_capture is not None:
+            key_values = tracer._stack_capture.capture(self.operation_name,
+                                                       key_values)
+        return key_values, self._log_timestamp(timestamp, timestamp_ns)
+
+    def _log_timestamp(self, timestamp, timestamp_ns):
+        """Returns the stored timestamp of a log record: explicit seconds
+        as given, like start and finish times, or else seconds or
+        nanoseconds depending on the timing mode."""
+        clock = self._tracer._clock
+        if timestamp is not None:
+            return timestamp if clock is None else float(timestamp)
+        if timestamp_ns is not None:
+            return timestamp_ns / 1e9 if clock is None else timestamp_ns
+        return time.time() if clock is None else clock.now_ns()
+
     def log_kv(self, key_values, timestamp=None):
-        with self._lock:
-            self.logs.append(LogData(key_values, timestamp))
+        key_values, log_timestamp = self._log_entry(key_values, timestamp)
+        if self._owner is not None and self._enter_owned():
+            try:
+                self.logs.add(key_values, log_timestamp)
+            finally:
+                self._busy = False
+        else:
+            with self._lock:
+                self.logs.add(key_values, log_timestamp)
         return super(MockSpan, self).log_kv(key_values, timestamp)
 
+    def log_kv_many(self, records):
+        entries = [self._log_entry(key_values, timestamp)
+                   for key_values, timestamp in records]
+        if self._owner is not None and self._enter_owned():
+            try:
+                self.logs.add_all(entries)
+            finally:
+                self._busy = False
+        else:
+            with self._lock:
+                self.logs.add_all(entries)
+        return self
+
     def finish(self, finish_time=None):
-        with self._lock:
-            finish_time = time.time() if finish_time is None else finish_time
-            self.finish_time = finish_time
-            self.finished = True
-            self._tracer._append_finished_span(self)
+        finish_ns = None
+        if finish_time is None:
+            finish_time, finish_ns = self._tracer._now()
+
+        if self._owner is not None and self._enter_owned():
+            try:
+                self._finish_time = finish_time
+                self._finish_ns = finish_ns
+                self.finished = True
+            finally:
+                self._busy = False
+        else:
+            with self._lock:
+                self._finish_time = finish_time
+                self._finish_ns = finish_ns
+                self.finished = True
+        self._resolve_lazy_values()
+        self._tracer._append_finished_span(self)
+
+    def _resolve_lazy_values(self):
+        """Replaces the :class:`~opentracing.LazyValue` tag and log values
+        with what they compute, once the **Span** is finished."""
+        tags = self._tags
+        if tags:
+            for key, value in list(tags.items()):
+                if isinstance(value, LazyValue):
+                    tags[key] = _resolve(value)
+
+        payloads = () if self._logs is None else self._logs.payloads
+        for index, key_values in enumerate(payloads):
+            payloads[index] = _resolve_payload(key_values)
 
     def set_baggage_item(self, key, value):
-        new_context = self._context.with_baggage_item(key, value)
-        with self._lock:
-            self._context = new_context
+        baggage = self._context.baggage
+        limits = self._tracer.baggage_limits
+        new_baggage = baggage.set(key, value) if limits is None \
+            else limits.set_item(baggage, key, value)
+        if new_baggage is baggage:
+            return self
+
+        new_context = self._context.with_baggage(new_baggage)
+        if self._owner is not None and self._enter_owned():
+            try:
+                self._context = new_context
+            finally:
+                self._busy = False
+        else:
+            with self._lock:
+                self._context = new_context
         return self
 
     def get_baggage_item(self, key):
+        if self._owner is not None and self._enter_owned():
+            try:
+                return self.context.baggage.get(key)
+            finally:
+                self._busy = False
         with self._lock:
             return self.context.baggage.get(key)
-
-
-class LogData(object):
-    def __init__(
-            self,
-            key_values,
-            timestamp=None):
-        self.key_values = key_values
-        self.timestamp = time.time() if timestamp is None else timestamp
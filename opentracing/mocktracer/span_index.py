@@ -0,0 +1,176 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from __future__ import absolute_import
+
+from collections import OrderedDict
+
+from .trace import MockTrace
+
+# Marks a query criterion that was not given, as None is a valid parent_id.
+ANY = object()
+
+
+class SpanIndex(object):
+    """SpanIndex keeps finished **Spans** indexed by trace id, operation
+    name, parent id and tag key/value, updated as **Spans** are stored and
+    evicted.
+
+    Each index maps a key to the matching **Spans**, in the order they
+    were added, in a bucket keyed by ``id(span)`` so that adding and
+    evicting a **Span** costs the same however many **Spans** share its
+    keys; **Spans** are grouped by trace id into
+    :class:`~opentracing.mocktracer.trace.MockTrace` trees. **Spans** are
+    indexed under their operation name and tags as of :meth:`add()`,
+    normally called as they finish, and tags with unhashable values are
+    not indexed. Like
+    :class:`~opentracing.mocktracer.span_store.SpanStore`, SpanIndex is not
+    thread-safe by itself: `lock` must be held when calling it, and is used
+    by the **MockTrace** trees to guard their own reads.
+    """
+
+    def __init__(self, lock):
+        self._lock = lock
+        self.clear()
+
+    def clear(self):
+        self._traces = OrderedDict()
+        self._by_operation_name = {}
+        self._by_parent_id = {}
+        self._by_tag = {}
+        # The keys each Span was indexed under, to evict it from the same
+        # buckets should it be renamed or tagged after finishing.
+        self._keys = {}
+
+    @staticmethod
+    def _tag_keys(span):
+        # Read the private tags dict, as the tags property allocates one
+        # for untagged Spans.
+        for item in (span._tags or {}).items():
+            try:
+                hash(item)
+            except TypeError:
+                continue
+            yield item
+
+    def traces(self):
+        return list(self._traces.values())
+
+    def get_trace(self, trace_id):
+        return self._traces.get(trace_id)
+
+    def add(self, span):
+        trace_id = span.context.trace_id
+        trace = self._traces.get(trace_id)
+        if trace is None:
+            trace = self._traces[trace_id] = MockTrace(trace_id, self._lock)
+        trace._add(span)
+
+        keys = (span.operation_name, span.parent_id,
+                tuple(self._tag_keys(span)))
+        self._keys[id(span)] = keys
+        operation_name, parent_id, tags = keys
+        _add(self._by_operation_name, operation_name, span)
+        _add(self._by_parent_id, parent_id, span)
+        for item in tags:
+            _add(self._by_tag, item, span)
+
+    def remove(self, span):
+        keys = self._keys.pop(id(span), None)
+        if keys is None:
+            return
+
+        trace = self._traces.get(span.context.trace_id)
+        if trace is not None:
+            trace._remove(span)
+            if not trace._spans:
+                del self._traces[trace.trace_id]
+
+        operation_name, parent_id, tags = keys
+        _remove(self._by_operation_name, operation_name, span)
+        _remove(self._by_parent_id, parent_id, span)
+        for item in tags:
+            _remove(self._by_tag, item, span)
+
+    def query(self, trace_id=ANY, operation_name=ANY, parent_id=ANY,
+              tag=ANY):
+        """Return the **Spans** matching every given criterion, in the order
+        they were added. At least one criterion must be given.
+
+        :rtype: list
+        """
+        buckets = []
+        if trace_id is not ANY:
+            trace = self._traces.get(trace_id)
+            buckets.append({} if trace is None else trace._spans)
+        if operation_name is not ANY:
+            buckets.append(self._by_operation_name.get(operation_name, {}))
+        if parent_id is not ANY:
+            buckets.append(self._by_parent_id.get(parent_id, {}))
+        if tag is not ANY:
+            buckets.append(self._by_tag.get(tuple(tag), {}))
+
+        if not buckets:
+            raise ValueError('At least one criterion is required')
+
+        # Only the smallest bucket is walked; its Spans are looked up in
+        # the other buckets.
+        smallest = min(buckets, key=len)
+        others = [bucket for bucket in buckets if bucket is not smallest]
+        return [span for key, span in smallest.items()
+                if all(key in bucket for bucket in others)]
+
+
+def _add(index, key, span):
+    bucket = index.get(key)
+    if bucket is None:
+        bucket = index[key] = OrderedDict()
+    bucket[id(span)] = span
+
+
+def _remove(index, key, span):
+    bucket = index.get(key)
+    if bucket is None:
+        return
+
+    bucket.pop(id(span), None)
+    if not bucket:
+        del index[key]
+
+
+class NullSpanIndex(object):
+    """The index used for span stores that do not retain the **Span**
+    objects: updates are ignored and lookups raise :exc:`ValueError`."""
+
+    def clear(self):
+        pass
+
+    def add(self, span):
+        pass
+
+    def remove(self, span):
+        pass
+
+    def _unsupported(self, *args, **kwargs):
+        raise ValueError('The span store does not retain finished Spans, '
+                         'so they cannot be queried')
+
+    traces = get_trace = query = _unsupported
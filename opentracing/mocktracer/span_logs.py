@@ -0,0 +1,285 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+from array import array
+import time
+
+from opentracing import logs
+
+try:
+    from collections.abc import Sequence
+except ImportError:  # Python 2
+    from collections import Sequence
+
+try:
+    array('q')
+    _INT64 = 'q'
+except ValueError:  # Python 2 has no 'q', 'l' is 64 bits on LP64.
+    _INT64 = 'l'
+
+_text_type = type(u'')
+
+# Log fields whose values repeat across many log records.
+_INTERNED_KEYS = (logs.EVENT, logs.MESSAGE, logs.ERROR_KIND, logs.STACK)
+
+
+def intern_log_values(interner, key_values):
+    """Return `key_values` with the values of the well-known
+    :mod:`opentracing.logs` fields interned. The dict is copied, rather
+    than updated, if any value is replaced."""
+    interned = None
+    for key in _INTERNED_KEYS:
+        value = key_values.get(key)
+        if value is None:
+            continue
+        canonical = interner.intern(value)
+        if canonical is not value:
+            if interned is None:
+                interned = dict(key_values)
+            interned[key] = canonical
+    return key_values if interned is None else interned
+
+
+def _value_bytes(value):
+    if isinstance(value, _text_type):
+        return len(value.encode('utf-8'))
+    if isinstance(value, bytes):
+        return len(value)
+    return 8
+
+
+def log_bytes(key_values):
+    """The approximate size of a log record, as counted by
+    :class:`LogLimits`: the UTF-8 length of its string keys and values,
+    and 8 bytes for any other value."""
+    return sum(_value_bytes(key) + _value_bytes(value)
+               for key, value in key_values.items())
+
+
+def _within(count, size, max_count, max_bytes):
+    return (max_count is None or count <= max_count) and \
+        (max_bytes is None or size <= max_bytes)
+
+
+class LogLimits(object):
+    """LogLimits bounds the number and the size of the log records of each
+    :class:`~opentracing.mocktracer.span.MockSpan`.
+
+    Once a **Span** reaches a limit, it keeps its first log records (the
+    head, up to half of each limit) and its most recent ones (the tail, the
+    other half), and drops the records in between. Dropped records are
+    counted per **Span** in
+    :attr:`~opentracing.mocktracer.span.MockSpan.dropped_logs`. Sizes are
+    estimated by :func:`log_bytes`. ``None`` disables a limit.
+
+    :param max_logs: the maximum number of log records per **Span**.
+    :param max_bytes: the maximum total size of the log records of a
+        **Span**.
+    """
+
+    def __init__(self, max_logs=None, max_bytes=None):
+        if (max_logs is not None and max_logs < 0) or \
+                (max_bytes is not None and max_bytes < 0):
+            raise ValueError('Log limits must not be negative')
+        self.max_logs = max_logs
+        self.max_bytes = max_bytes
+
+        self._head_logs = self._tail_logs = None
+        if max_logs is not None:
+            self._head_logs = (max_logs + 1) // 2
+            self._tail_logs = max_logs - self._head_logs
+        self._head_bytes = self._tail_bytes = None
+        if max_bytes is not None:
+            self._head_bytes = (max_bytes + 1) // 2
+            self._tail_bytes = max_bytes - self._head_bytes
+
+    def _fits_head(self, count, size):
+        return _within(count, size, self._head_logs, self._head_bytes)
+
+    def _fits_tail(self, count, size):
+        return _within(count, size, self._tail_logs, self._tail_bytes)
+
+
+class SpanLogs(Sequence):
+    """The log records of a :class:`~opentracing.mocktracer.span.MockSpan`,
+    stored compactly as a timestamp array and a parallel list of key/value
+    dicts.
+
+    Records are read as :class:`LogData` instances, created on access: they
+    are snapshots, and changing them does not change the stored records.
+    Like a list, SpanLogs supports :meth:`append()` and :meth:`extend()`
+    with **LogData** records; :meth:`add()` and :meth:`add_all()` take the
+    key/value dicts and timestamps directly. Timestamps are floats in
+    seconds per :meth:`time.time()` or, when `ns` is True, integer
+    nanoseconds; explicit float seconds are then kept as given, moving the
+    timestamps from an array to a list.
+
+    :ivar timestamps: the timestamps array.
+    :ivar payloads: the key/value dicts.
+    :ivar dropped: the number of records dropped to honor `limits`.
+    """
+
+    __slots__ = ('timestamps', 'payloads', 'dropped', '_ns', '_limits',
+                 '_sizes', '_head', '_head_bytes', '_tail_bytes')
+
+    def __init__(self, limits=None, ns=False):
+        self.timestamps = array(_INT64 if ns else 'd')
+        self.payloads = []
+        self.dropped = 0
+        self._ns = ns
+        self._limits = limits
+        self._sizes = array('L') \
+            if limits is not None and limits.max_bytes is not None else None
+        # Records before this index are the head, the others the tail.
+        self._head = 0
+        self._head_bytes = 0
+        self._tail_bytes = 0
+
+    def add(self, key_values, timestamp):
+        """Add a log record, dropping records as needed to honor the
+        limits. `timestamp` is in the unit of this **SpanLogs**, or a float
+        in seconds."""
+        if self._ns and isinstance(timestamp, float) and \
+                isinstance(self.timestamps, array):
+            # The nanoseconds array cannot hold float seconds as given.
+            self.timestamps = list(self.timestamps)
+        if self._limits is None:
+            self.timestamps.append(timestamp)
+            self.payloads.append(key_values)
+        else:
+            self._append_limited(key_values, timestamp)
+
+    def add_all(self, records):
+        """Add an iterable of `(key_values, timestamp)` pairs."""
+        for key_values, timestamp in records:
+            self.add(key_values, timestamp)
+
+    def append(self, log):
+        """Add a :class:`LogData` record, like ``list.append()``."""
+        if self._ns and log._timestamp_ns is not None:
+            self.add(log.key_values, log._timestamp_ns)
+        else:
+            self.add(log.key_values, float(log.timestamp))
+
+    def extend(self, logs):
+        """Add an iterable of :class:`LogData` records, like
+        ``list.extend()``."""
+        for log in logs:
+            self.append(log)
+
+    def _append_limited(self, key_values, timestamp):
+        limits = self._limits
+        size = 0 if self._sizes is None else log_bytes(key_values)
+
+        # The head grows until the first record that does not fit.
+        if self.dropped == 0 and self._head == len(self.payloads) and \
+                limits._fits_head(self._head + 1, self._head_bytes + size):
+            self._push(key_values, timestamp, size)
+            self._head += 1
+            self._head_bytes += size
+            return
+
+        if not limits._fits_tail(1, size):
+            self.dropped += 1
+            return
+
+        self._push(key_values, timestamp, size)
+        self._tail_bytes += size
+        while not limits._fits_tail(len(self.payloads) - self._head,
+                                    self._tail_bytes):
+            self._evict_oldest_tail()
+
+    def _push(self, key_values, timestamp, size):
+        self.timestamps.append(timestamp)
+        self.payloads.append(key_values)
+        if self._sizes is not None:
+            self._sizes.append(size)
+
+    def _evict_oldest_tail(self):
+        index = self._head
+        del self.timestamps[index]
+        del self.payloads[index]
+        if self._sizes is not None:
+            self._tail_bytes -= self._sizes[index]
+            del self._sizes[index]
+        self.dropped += 1
+
+    def __len__(self):
+        return len(self.payloads)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        timestamp = self.timestamps[index]
+        if self._ns and not isinstance(timestamp, float):
+            return LogData(self.payloads[index], timestamp_ns=timestamp)
+        return LogData(self.payloads[index], timestamp)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            mine.timestamp == theirs.timestamp and
+            mine.key_values == theirs.key_values
+            for mine, theirs in zip(self, other))
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+
+class LogData(object):
+    """A log record of a :class:`~opentracing.mocktracer.span.MockSpan`,
+    timestamped either in seconds per :meth:`time.time()` or in integer
+    nanoseconds (`timestamp_ns`)."""
+
+    __slots__ = ('key_values', '_timestamp', '_timestamp_ns')
+
+    def __init__(
+            self,
+            key_values,
+            timestamp=None,
+            timestamp_ns=None):
+        self.key_values = key_values
+        if timestamp is None and timestamp_ns is None:
+            timestamp = time.time()
+        self._timestamp = timestamp
+        self._timestamp_ns = timestamp_ns
+
+    @property
+    def timestamp(self):
+        if self._timestamp_ns is None:
+            return self._timestamp
+        return self._timestamp_ns / 1e9
+
+    @timestamp.setter
+    def timestamp(self, timestamp):
+        self._timestamp = timestamp
+        self._timestamp_ns = None
+
+    @property
+    def timestamp_ns(self):
+        if self._timestamp_ns is None:
+            return int(round(self._timestamp * 1e9))
+        return self._timestamp_ns
@@ -0,0 +1,142 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from __future__ import absolute_import
+
+import logging
+from threading import Thread
+
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def call_hook(hook, span):
+    """Call a processor `hook` with `span`, logging any error it raises."""
+    try:
+        hook(span)
+    except Exception:
+        logger.exception('Error in span processor')
+
+
+class SpanProcessor(object):
+    """SpanProcessor is notified of every **Span** started and finished by
+    a :class:`~opentracing.mocktracer.MockTracer` it is registered with,
+    see :meth:`~opentracing.mocktracer.MockTracer.add_span_processor()`.
+
+    Hooks run on the thread starting or finishing the **Span**, without
+    holding any MockTracer or **Span** lock, so they may call back into
+    the **Span**. Errors raised by hooks are logged, and do not propagate
+    to the instrumented code.
+    """
+
+    def on_start(self, span):
+        """Called after `span` is started."""
+        pass
+
+    def on_finish(self, span):
+        """Called after `span` is finished and stored."""
+        pass
+
+    def shutdown(self):
+        """Called when the processor is removed from its MockTracer."""
+        pass
+
+
+class CallbackSpanProcessor(SpanProcessor):
+    """A :class:`SpanProcessor` calling `on_start(span)` and
+    `on_finish(span)` callables, either of which may be ``None``."""
+
+    def __init__(self, on_start=None, on_finish=None):
+        self._on_start = on_start
+        self._on_finish = on_finish
+
+    def on_start(self, span):
+        if self._on_start is not None:
+            self._on_start(span)
+
+    def on_finish(self, span):
+        if self._on_finish is not None:
+            self._on_finish(span)
+
+
+class BackgroundSpanProcessor(SpanProcessor):
+    """A :class:`SpanProcessor` that queues **Spans** and runs the hooks of
+    `processor` on a background daemon thread.
+
+    When `max_queue_size` events are pending, new events are dropped and
+    counted in :attr:`dropped_events` rather than blocking the traced code.
+    Errors raised by `processor` are logged.
+
+    :param processor: the :class:`SpanProcessor` to run in the background.
+    :param max_queue_size: the maximum number of pending events, or ``0``
+        for no limit.
+    """
+
+    def __init__(self, processor, max_queue_size=2048):
+        self.processor = processor
+        self.dropped_events = 0
+        self._queue = queue.Queue(max_queue_size)
+        self._thread = Thread(target=self._run,
+                              name='BackgroundSpanProcessor')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped_events += 1
+
+    def on_start(self, span):
+        self._put((self.processor.on_start, span))
+
+    def on_finish(self, span):
+        self._put((self.processor.on_finish, span))
+
+    def _run(self):
+        while True:
+            event = self._queue.get()
+            try:
+                if event is _STOP:
+                    return
+                hook, span = event
+                hook(span)
+            except Exception:
+                logger.exception('Error in background span processor')
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued event has been processed."""
+        self._queue.join()
+
+    def shutdown(self):
+        """Process the queued events, then stop the background thread and
+        shut `processor` down."""
+        self._queue.put(_STOP)
+        self._thread.join()
+        self.processor.shutdown()
@@ -0,0 +1,191 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from __future__ import absolute_import
+
+import random
+
+OVERFLOW_DROP_OLDEST = 'drop_oldest'
+OVERFLOW_DROP_NEWEST = 'drop_newest'
+OVERFLOW_SAMPLE = 'sample'
+
+
+class SpanStore(object):
+    """SpanStore holds the finished **Spans** of a
+    :class:`~opentracing.mocktracer.MockTracer`.
+
+    The default implementation keeps every finished **Span** in an unbounded
+    list, in finish order. Stores are not thread-safe by themselves:
+    :class:`~opentracing.mocktracer.MockTracer` serializes every call under
+    its own lock.
+
+    Every stored **Span** is numbered in storage order, starting at 0. The
+    numbering is never reset, so a cursor taken from :meth:`since()` stays
+    valid across :meth:`drain()` and :meth:`clear()`.
+    """
+
+    retains_spans = True
+    """Whether the stored **Spans** are the **Span** objects themselves.
+    :class:`~opentracing.mocktracer.MockTracer` indexes finished **Spans**
+    only for stores that retain them."""
+
+    def __init__(self):
+        self._spans = []
+        self._stored = 0
+        self.dropped_spans = 0
+
+    def __len__(self):
+        return len(self._spans)
+
+    def append(self, span):
+        """Store a finished **Span**.
+
+        :param span: the finished **Span**.
+
+        :return: the **Span** that was dropped to make room for `span`
+            (which may be `span` itself), or ``None`` if nothing was dropped.
+        """
+        self._spans.append(span)
+        self._stored += 1
+        return None
+
+    def spans(self):
+        """Return a copy of the stored **Spans**.
+
+        :rtype: list
+        """
+        return list(self._spans)
+
+    def since(self, cursor):
+        """Return the stored **Spans** numbered `cursor` or higher, as
+        ``(next_cursor, span)`` pairs in storage order.
+
+        :rtype: list
+        """
+        first = self._stored - len(self._spans)
+        start = max(cursor, first)
+        return list(enumerate(self._spans[start - first:], start + 1))
+
+    def drain(self):
+        """Remove and return the stored **Spans**, in storage order.
+
+        :rtype: list
+        """
+        spans = self._spans
+        self._spans = []
+        return spans
+
+    def clear(self):
+        """Drop every stored **Span** and reset the drop counter."""
+        self.drain()
+        self.dropped_spans = 0
+
+
+class RingBufferSpanStore(SpanStore):
+    """A :class:`SpanStore` bounded to `capacity` **Spans**.
+
+    Once full, `overflow` decides which **Span** is dropped:
+
+    - :data:`OVERFLOW_DROP_OLDEST` evicts the oldest stored **Span**.
+    - :data:`OVERFLOW_DROP_NEWEST` discards the **Span** being stored.
+    - :data:`OVERFLOW_SAMPLE` keeps a uniform sample of every **Span**
+      finished since the store was last drained (reservoir sampling).
+      Sampled **Spans** are not kept in finish order.
+
+    Every dropped **Span** is counted in :attr:`dropped_spans`.
+
+    :param capacity: the maximum number of stored **Spans**.
+    :param overflow: one of the ``OVERFLOW_*`` policies.
+    :param rng: a :class:`random.Random` used by :data:`OVERFLOW_SAMPLE`.
+    """
+
+    def __init__(self, capacity, overflow=OVERFLOW_DROP_OLDEST, rng=None):
+        if capacity < 1:
+            raise ValueError('capacity must be a positive integer')
+        if overflow not in (OVERFLOW_DROP_OLDEST,
+                            OVERFLOW_DROP_NEWEST,
+                            OVERFLOW_SAMPLE):
+            raise ValueError('Unknown overflow policy: %r' % (overflow,))
+
+        super(RingBufferSpanStore, self).__init__()
+        self.capacity = capacity
+        self.overflow = overflow
+        self._rng = random.Random() if rng is None else rng
+        self._start = 0
+        self._seen = 0
+        # Storage numbers of the sampled Spans, by slot.
+        self._numbers = []
+
+    def append(self, span):
+        self._seen += 1
+        if len(self._spans) < self.capacity:
+            self._spans.append(span)
+            if self.overflow == OVERFLOW_SAMPLE:
+                self._numbers.append(self._stored)
+            self._stored += 1
+            return None
+
+        self.dropped_spans += 1
+        if self.overflow == OVERFLOW_DROP_NEWEST:
+            return span
+
+        if self.overflow == OVERFLOW_DROP_OLDEST:
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+        else:
+            index = self._rng.randrange(self._seen)
+            if index >= self.capacity:
+                return span
+            self._numbers[index] = self._stored
+
+        self._stored += 1
+        dropped = self._spans[index]
+        self._spans[index] = span
+        return dropped
+
+    def spans(self):
+        return self._spans[self._start:] + self._spans[:self._start]
+
+    def since(self, cursor):
+        if self.overflow == OVERFLOW_SAMPLE:
+            return sorted((number + 1, span) for number, span
+                          in zip(self._numbers, self._spans)
+                          if number >= cursor)
+
+        size = len(self._spans)
+        count = min(self._stored - cursor, size)
+        if count <= 0:
+            return []
+
+        # Only the `count` newest slots are copied.
+        begin = (self._start + size - count) % size
+        spans = self._spans[begin:begin + count]
+        if begin + count > size:
+            spans += self._spans[:begin + count - size]
+        return list(enumerate(spans, self._stored - count + 1))
+
+    def drain(self):
+        spans = self.spans()
+        self._spans = []
+        self._numbers = []
+        self._start = 0
+        self._seen = 0
+        return spans
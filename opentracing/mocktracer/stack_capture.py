@@ -0,0 +1,146 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+from threading import Lock
+import time
+import traceback
+import types
+
+from opentracing import logs
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+def _extract_frames(tb, limit):
+    if hasattr(traceback, 'walk_tb'):
+        # Source lines are only read if the stack is formatted.
+        return traceback.StackSummary.extract(
+            traceback.walk_tb(tb), limit=limit, lookup_lines=False)
+    return traceback.extract_tb(tb, limit)  # Python 2
+
+
+class CapturedStack(object):
+    """The stack of an error logged under :attr:`opentracing.logs.STACK`,
+    formatted only when converted to a string, typically on export.
+
+    :ivar traceback: the traceback, if it is kept, or ``None``.
+    """
+
+    __slots__ = ('traceback', '_frames', '_limit', '_formatted')
+
+    def __init__(self, tb, summarize=False, limit=None):
+        self._limit = limit
+        self._formatted = None
+        if summarize:
+            self.traceback = None
+            self._frames = _extract_frames(tb, limit)
+        else:
+            self.traceback = tb
+            self._frames = None
+
+    @property
+    def frames(self):
+        """The frame summaries of the stack, as returned by
+        :func:`traceback.extract_tb()`."""
+        if self._frames is None:
+            self._frames = _extract_frames(self.traceback, self._limit)
+        return self._frames
+
+    def __str__(self):
+        if self._formatted is None:
+            self._formatted = ''.join(traceback.format_list(self.frames))
+        return self._formatted
+
+    def __repr__(self):
+        return '<CapturedStack of %d frames>' % len(self.frames)
+
+
+class StackCapture(object):
+    """StackCapture controls how a
+    :class:`~opentracing.mocktracer.MockTracer` keeps the tracebacks logged
+    under :attr:`opentracing.logs.STACK`, such as those logged by
+    :meth:`Span.__exit__() <opentracing.Span.__exit__>`.
+
+    Tracebacks are wrapped in a :class:`CapturedStack`, which formats them
+    only when exported. With `summarize` set, only a summary of the frames
+    is kept, so the frames and their local variables can be released. The
+    number of stacks captured per second for each operation name can be
+    bounded with `max_stacks_per_second`: beyond it, the STACK field is
+    left out of the log record and counted in :attr:`dropped_stacks`.
+
+    :param summarize: if True, keep frame summaries instead of the
+        traceback.
+    :param limit: the maximum number of frames summarized, or ``None``.
+    :param max_stacks_per_second: the maximum number of stacks captured
+        per operation name and second, or ``None``.
+    :param max_operations: the number of operation names whose rates are
+        tracked at once, bounding the memory used by the rate limit.
+
+    :ivar dropped_stacks: the number of stacks not captured because of
+        the rate limit.
+    """
+
+    def __init__(self, summarize=False, limit=None,
+                 max_stacks_per_second=None, max_operations=1024):
+        self.summarize = summarize
+        self.limit = limit
+        self.max_stacks_per_second = max_stacks_per_second
+        self.max_operations = max_operations
+        self.dropped_stacks = 0
+        # operation name -> [window start, stacks captured in the window]
+        self._windows = {}
+        self._lock = Lock()
+
+    def _allow(self, operation_name):
+        if self.max_stacks_per_second is None:
+            return True
+
+        now = _clock()
+        with self._lock:
+            window = self._windows.get(operation_name)
+            if window is None or now - window[0] >= 1.0:
+                if window is None and \
+                        len(self._windows) >= self.max_operations:
+                    self._windows.clear()
+                window = self._windows[operation_name] = [now, 0]
+            if window[1] < self.max_stacks_per_second:
+                window[1] += 1
+                return True
+            self.dropped_stacks += 1
+            return False
+
+    def capture(self, operation_name, key_values):
+        """Return `key_values` with its traceback under
+        :attr:`~opentracing.logs.STACK` captured, or left out if the rate
+        limit of `operation_name` is reached. The dict is copied, rather
+        than updated, if it changes."""
+        tb = key_values.get(logs.STACK)
+        if not isinstance(tb, types.TracebackType):
+            return key_values
+
+        key_values = dict(key_values)
+        if self._allow(operation_name):
+            key_values[logs.STACK] = CapturedStack(tb, self.summarize,
+                                                   self.limit)
+        else:
+            del key_values[logs.STACK]
+        return key_values
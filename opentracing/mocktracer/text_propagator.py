@@ -23,7 +23,7 @@ from __future__ import absolute_import
 from opentracing import SpanContextCorruptedException
 
 from .context import SpanContext
-from .propagator import Propagator
+from .propagator import FieldLookup, Propagator
 
 prefix_tracer_state = 'ot-tracer-'
 prefix_baggage = 'ot-baggage-'
@@ -33,35 +33,45 @@ field_count = 2
 
 
 class TextPropagator(Propagator):
-    """A MockTracer Propagator for Format.TEXT_MAP."""
+    """A MockTracer Propagator for Format.TEXT_MAP.
+
+    Keys are matched case-insensitively, see
+    :class:`~opentracing.mocktracer.propagator.FieldLookup`. Carriers whose
+    lookups are already case-insensitive, such as
+    :class:`email.message.Message` and so
+    :class:`http.client.HTTPMessage`, or instances of the types passed as
+    `case_insensitive_types`, have their ids looked up directly. Ids found
+    more than once make the carrier corrupted.
+
+    Extracted baggage is bounded by `baggage_limits`, a
+    :class:`~opentracing.mocktracer.baggage.BaggageLimits`, if given.
+    """
+
+    def __init__(self, baggage_limits=None, case_insensitive_types=()):
+        self._baggage_limits = baggage_limits
+        self._lookup = FieldLookup(
+            (field_name_trace_id, field_name_span_id),
+            case_insensitive_types, prefix_baggage)
 
     def inject(self, span_context, carrier):
         carrier[field_name_trace_id] = '{0:x}'.format(span_context.trace_id)
         carrier[field_name_span_id] = '{0:x}'.format(span_context.span_id)
         if span_context.baggage is not None:
-            for k in span_context.baggage:
-                carrier[prefix_baggage+k] = span_context.baggage[k]
+            for k, v in span_context.baggage.items():
+                carrier[prefix_baggage+k] = v
 
-    def extract(self, carrier):  # noqa
-        count = 0
-        span_id, trace_id = (0, 0)
+    def extract(self, carrier):
         baggage = {}
-        for k in carrier:
-            v = carrier[k]
-            k = k.lower()
-            if k == field_name_span_id:
-                span_id = int(v, 16)
-                count += 1
-            elif k == field_name_trace_id:
-                trace_id = int(v, 16)
-                count += 1
-            elif k.startswith(prefix_baggage):
-                baggage[k[len(prefix_baggage):]] = v
-
-        if count != field_count:
+        fields = self._lookup.lookup(carrier, baggage)
+        trace_id = fields.get(field_name_trace_id)
+        span_id = fields.get(field_name_span_id)
+        if trace_id is None or span_id is None:
             raise SpanContextCorruptedException()
 
+        if self._baggage_limits is not None:
+            baggage = self._baggage_limits.limit(baggage)
+
         return SpanContext(
-            span_id=span_id,
-            trace_id=trace_id,
+            span_id=int(span_id, 16),
+            trace_id=int(trace_id, 16),
             baggage=baggage)
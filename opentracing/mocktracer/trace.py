@@ -0,0 +1,119 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from __future__ import absolute_import
+
+from collections import OrderedDict
+
+
+class MockTrace(object):
+    """MockTrace is the tree of finished **Spans** sharing a trace id,
+    as returned by :meth:`~opentracing.mocktracer.MockTracer.traces()`.
+
+    The tree is updated by the :class:`~opentracing.mocktracer.MockTracer`
+    as each **Span** finishes or is evicted, so reading it never walks the
+    finished **Spans**, and adding or evicting a **Span** costs the same
+    however large the trace is. A **Span** whose parent has not finished
+    (or was evicted) is reported as a root until its parent finishes.
+    """
+
+    def __init__(self, trace_id, lock):
+        self.trace_id = trace_id
+        self._lock = lock
+        # Keyed by id(span), like the SpanIndex buckets.
+        self._spans = OrderedDict()
+        self._by_span_id = {}
+        self._children = {}
+        self._roots = OrderedDict()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._spans)
+
+    @property
+    def spans(self):
+        """The finished **Spans** of this trace, in finish order.
+
+        :rtype: list
+        """
+        with self._lock:
+            return list(self._spans.values())
+
+    @property
+    def roots(self):
+        """The **Spans** of this trace whose parent is not part of it.
+
+        :rtype: list
+        """
+        with self._lock:
+            return list(self._roots.values())
+
+    @property
+    def root(self):
+        """The first root **Span** of this trace, or ``None``."""
+        with self._lock:
+            for span in self._roots.values():
+                return span
+        return None
+
+    def children(self, span):
+        """Return the finished child **Spans** of `span`, in finish order.
+
+        :rtype: list
+        """
+        with self._lock:
+            return list(
+                self._children.get(span.context.span_id, {}).values())
+
+    def get_span(self, span_id):
+        """Return the finished **Span** with the given span id, or
+        ``None``."""
+        with self._lock:
+            return self._by_span_id.get(span_id)
+
+    def _add(self, span):
+        span_id = span.context.span_id
+        self._spans[id(span)] = span
+        self._by_span_id[span_id] = span
+        siblings = self._children.get(span.parent_id)
+        if siblings is None:
+            siblings = self._children[span.parent_id] = OrderedDict()
+        siblings[span_id] = span
+
+        if span.parent_id not in self._by_span_id:
+            self._roots[span_id] = span
+        for child_id in self._children.get(span_id, ()):
+            self._roots.pop(child_id, None)
+
+    def _remove(self, span):
+        span_id = span.context.span_id
+        self._spans.pop(id(span), None)
+        self._by_span_id.pop(span_id, None)
+        self._roots.pop(span_id, None)
+
+        siblings = self._children.get(span.parent_id)
+        if siblings is not None:
+            siblings.pop(span_id, None)
+            if not siblings:
+                del self._children[span.parent_id]
+
+        for child_id, child in self._children.get(span_id, {}).items():
+            self._roots[child_id] = child
@@ -0,0 +1,163 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+from collections import OrderedDict
+
+from opentracing import SpanContextCorruptedException
+
+from .context import SAMPLED, SpanContext
+from .propagator import FieldLookup, Propagator
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+field_name_traceparent = 'traceparent'
+field_name_tracestate = 'tracestate'
+
+# version "-" trace-id "-" parent-id "-" trace-flags
+_TRACEPARENT_LENGTH = 55
+_DASHES = (2, 35, 52)
+_HEX_OR_DASH = frozenset('0123456789abcdef-')
+_INVALID_VERSION = 'ff'
+_MAX_TRACESTATE_MEMBERS = 32
+
+
+def parse_traceparent(header):
+    """Parse a W3C `traceparent` header.
+
+    :return: a ``(trace_id, span_id, flags)`` tuple, or ``None`` if the
+        header is invalid.
+    """
+    header = header.strip()
+    length = len(header)
+    if length < _TRACEPARENT_LENGTH:
+        return None
+
+    version = header[:2]
+    if version == _INVALID_VERSION:
+        return None
+    if length > _TRACEPARENT_LENGTH and \
+            (version == '00' or header[_TRACEPARENT_LENGTH] != '-'):
+        return None
+
+    # Lowercase hex digits, with dashes only at the fixed positions.
+    fields = header[:_TRACEPARENT_LENGTH]
+    if not _HEX_OR_DASH.issuperset(fields) or fields.count('-') != 3 or \
+            any(fields[i] != '-' for i in _DASHES):
+        return None
+
+    trace_id = int(fields[3:35], 16)
+    span_id = int(fields[36:52], 16)
+    if not trace_id or not span_id:
+        return None
+    return trace_id, span_id, int(fields[53:55], 16)
+
+
+def format_traceparent(trace_id, span_id, flags):
+    """Format a version 00 W3C `traceparent` header."""
+    return '00-%032x-%016x-%02x' % (trace_id, span_id, flags)
+
+
+class TraceState(Mapping):
+    """The vendor-specific entries of a W3C `tracestate` header.
+
+    The header is kept as received and only parsed into its key/value
+    members when they are first read; :attr:`header` is propagated
+    unchanged.
+
+    :param header: the `tracestate` header value.
+    """
+
+    __slots__ = ('header', '_members')
+
+    def __init__(self, header):
+        self.header = header
+        self._members = None
+
+    def _parse(self):
+        if self._members is None:
+            members = OrderedDict()
+            for member in self.header.split(','):
+                key, sep, value = member.strip().partition('=')
+                if sep and key and value and key not in members:
+                    members[key] = value
+                    if len(members) == _MAX_TRACESTATE_MEMBERS:
+                        break
+            # Caching is idempotent, so concurrent readers may race here.
+            self._members = members
+        return self._members
+
+    def __getitem__(self, key):
+        return self._parse()[key]
+
+    def __iter__(self):
+        return iter(self._parse())
+
+    def __len__(self):
+        return len(self._parse())
+
+    def __repr__(self):
+        return 'TraceState(%r)' % (self.header,)
+
+
+class TraceContextPropagator(Propagator):
+    """A MockTracer Propagator for the W3C Trace Context `traceparent` and
+    `tracestate` headers, for Format.HTTP_HEADERS or Format.TEXT_MAP.
+
+    The sampled flag is carried in
+    :attr:`~opentracing.mocktracer.context.SpanContext.flags` and the
+    :class:`TraceState` in
+    :attr:`~opentracing.mocktracer.context.SpanContext.tracestate`.
+    Baggage is not propagated. Headers are matched case-insensitively, see
+    :class:`~opentracing.mocktracer.propagator.FieldLookup` for
+    `case_insensitive_types`.
+    """
+
+    def __init__(self, case_insensitive_types=()):
+        self._lookup = FieldLookup(
+            (field_name_traceparent, field_name_tracestate),
+            case_insensitive_types)
+
+    def inject(self, span_context, carrier):
+        carrier[field_name_traceparent] = format_traceparent(
+            span_context.trace_id, span_context.span_id,
+            span_context.flags & SAMPLED)
+        tracestate = span_context.tracestate
+        if tracestate is not None and tracestate.header:
+            carrier[field_name_tracestate] = tracestate.header
+
+    def extract(self, carrier):
+        fields = self._lookup.lookup(carrier)
+        traceparent = parse_traceparent(
+            fields.get(field_name_traceparent, ''))
+        if traceparent is None:
+            raise SpanContextCorruptedException()
+
+        trace_id, span_id, flags = traceparent
+        tracestate = fields.get(field_name_tracestate)
+        return SpanContext(
+            trace_id=trace_id,
+            span_id=span_id,
+            sampled=flags & SAMPLED,
+            tracestate=TraceState(tracestate) if tracestate else None)
@@ -24,10 +24,19 @@ import time
 import opentracing
 from opentracing import Format, Tracer
 from opentracing import UnsupportedFormatException
+from opentracing.interning import Interner
 from opentracing.scope_managers import ThreadLocalScopeManager
 
+from .baggage import Baggage
+from .clock import TIMING_MONOTONIC, TIMING_WALL, MonotonicClock
 from .context import SpanContext
-from .span import MockSpan
+from .id_generator import SequentialIdGenerator
+from .propagator import PROPAGATION_B3, PROPAGATION_OT, PROPAGATION_W3C
+from .span import LOCKING_ALWAYS, LOCKING_NONE, LOCKING_OWNER, MockSpan
+from .span_index import ANY, NullSpanIndex, SpanIndex
+from .span_processor import BackgroundSpanProcessor, \
+    CallbackSpanProcessor, call_hook
+from .span_store import SpanStore
 
 
 class MockTracer(Tracer):
@@ -43,9 +52,72 @@ class MockTracer(Tracer):
     :attr:`Format.HTTP_HEADERS` and :attr:`Format.BINARY`. The user should
     call :func:`register_propagator()` for each additional inject/extract
     format.
+
+    Finished **Spans** are kept in an unbounded
+    :class:`~opentracing.mocktracer.span_store.SpanStore` by default. Pass a
+    :class:`~opentracing.mocktracer.span_store.RingBufferSpanStore` as
+    `span_store` to bound the memory used by long-running tests, or a
+    :class:`~opentracing.mocktracer.columnar_store.ColumnarSpanStore` to
+    keep large numbers of finished **Spans** compactly for analysis.
+    Finished **Spans** are only indexed for :meth:`~MockTracer.query()` and
+    :meth:`~MockTracer.traces()` once either is first called.
+
+    Trace and span ids are consecutive integers generated by a
+    :class:`~opentracing.mocktracer.id_generator.SequentialIdGenerator`,
+    unless another
+    :class:`~opentracing.mocktracer.id_generator.IdGenerator` is passed as
+    `id_generator`.
+
+    **Spans** lock each mutation by default. When instrumentation never
+    mutates a **Span** from several threads at once, `span_locking` can be
+    set to :data:`~opentracing.mocktracer.span.LOCKING_NONE` so that no
+    lock is allocated per **Span**. With
+    :data:`~opentracing.mocktracer.span.LOCKING_OWNER` each **Span** is
+    mutated without locking by the thread that started it, and only locks
+    once another thread touches it.
+
+    Baggage is unbounded, unless a
+    :class:`~opentracing.mocktracer.baggage.BaggageLimits` is passed as
+    `baggage_limits`. The limits apply to
+    :meth:`~opentracing.Span.set_baggage_item()` and to the baggage
+    extracted by the default propagators.
+
+    Timestamps are read from :meth:`time.time()`. With `timing` set to
+    :data:`~opentracing.mocktracer.clock.TIMING_MONOTONIC`, they are instead
+    integer nanoseconds from a monotonic clock anchored once to the wall
+    clock, so that **Span** durations (see
+    :attr:`~opentracing.mocktracer.span.MockSpan.duration_ns`) are immune
+    to system clock adjustments.
+
+    Passing an :class:`~opentracing.interning.Interner` as `interner` makes
+    **Spans** share a single copy of each operation name and tag key,
+    rather than holding the strings received from callers.
+
+    The number and size of the log records of each **Span** are unbounded,
+    unless a :class:`~opentracing.mocktracer.span_logs.LogLimits` is passed
+    as `log_limits`.
+
+    Tracebacks logged under :attr:`opentracing.logs.STACK` are kept as
+    they are, unless a
+    :class:`~opentracing.mocktracer.stack_capture.StackCapture` is passed as
+    `stack_capture` to defer their formatting, summarize them or bound how
+    many are captured per second.
+
+    Format.HTTP_HEADERS uses the `ot-tracer-*` and `ot-baggage-*` headers of
+    Format.TEXT_MAP by default. With `http_propagation` set to
+    :data:`~opentracing.mocktracer.propagator.PROPAGATION_W3C`, it uses the
+    W3C Trace Context headers instead, see
+    :class:`~opentracing.mocktracer.trace_context_propagator.TraceContextPropagator`,
+    and with :data:`~opentracing.mocktracer.propagator.PROPAGATION_B3` the
+    Zipkin B3 headers, see
+    :class:`~opentracing.mocktracer.b3_propagator.B3Propagator`.
     """
 
-    def __init__(self, scope_manager=None):
+    def __init__(self, scope_manager=None, span_store=None,
+                 id_generator=None, span_locking=LOCKING_ALWAYS,
+                 baggage_limits=None, timing=TIMING_WALL, interner=None,
+                 log_limits=None, stack_capture=None,
+                 http_propagation=PROPAGATION_OT):
         """Initialize a MockTracer instance."""
 
         scope_manager = ThreadLocalScopeManager() \
@@ -53,12 +125,41 @@ class MockTracer(Tracer):
         super(MockTracer, self).__init__(scope_manager)
 
         self._propagators = {}
-        self._finished_spans = []
+        self._span_store = SpanStore() if span_store is None else span_store
         self._spans_lock = Lock()
+        # Built on first use by query(), traces() or get_trace().
+        self._span_index = None
 
         # Simple-as-possible (consecutive for repeatability) id generation.
-        self._next_id = 0
-        self._next_id_lock = Lock()
+        self._id_generator = SequentialIdGenerator() \
+            if id_generator is None else id_generator
+
+        if span_locking not in (LOCKING_ALWAYS, LOCKING_NONE, LOCKING_OWNER):
+            raise ValueError('Unknown span locking: %r' % (span_locking,))
+        self._span_locking = span_locking
+        self._baggage_limits = baggage_limits
+
+        if timing not in (TIMING_WALL, TIMING_MONOTONIC):
+            raise ValueError('Unknown timing: %r' % (timing,))
+        self._clock = MonotonicClock() if timing == TIMING_MONOTONIC \
+            else None
+        self._interner = interner
+        # Interns the values of the well-known log fields. Kept apart from
+        # `interner`, so that high-cardinality log messages cannot fill its
+        # table of operation names and tag keys.
+        self._log_interner = Interner(max_size=1024)
+        self._log_limits = log_limits
+        self._stack_capture = stack_capture
+
+        if http_propagation not in (PROPAGATION_OT, PROPAGATION_W3C,
+                                    PROPAGATION_B3):
+            raise ValueError('Unknown HTTP propagation: %r' %
+                             (http_propagation,))
+        self._http_propagation = http_propagation
+
+        # Replaced (never mutated) on updates, so it is read without a lock.
+        self._span_processors = ()
+        self._span_processors_lock = Lock()
 
         self._register_required_propagators()
 
@@ -75,9 +176,67 @@ class MockTracer(Tracer):
     def _register_required_propagators(self):
         from .text_propagator import TextPropagator
         from .binary_propagator import BinaryPropagator
-        self.register_propagator(Format.TEXT_MAP, TextPropagator())
-        self.register_propagator(Format.HTTP_HEADERS, TextPropagator())
-        self.register_propagator(Format.BINARY, BinaryPropagator())
+        from .trace_context_propagator import TraceContextPropagator
+        from .b3_propagator import B3Propagator
+        limits = self._baggage_limits
+        self.register_propagator(Format.TEXT_MAP, TextPropagator(limits))
+        if self._http_propagation == PROPAGATION_W3C:
+            http_propagator = TraceContextPropagator()
+        elif self._http_propagation == PROPAGATION_B3:
+            http_propagator = B3Propagator()
+        else:
+            http_propagator = TextPropagator(limits)
+        self.register_propagator(Format.HTTP_HEADERS, http_propagator)
+        self.register_propagator(Format.BINARY, BinaryPropagator(limits))
+
+    @property
+    def baggage_limits(self):
+        """The :class:`~opentracing.mocktracer.baggage.BaggageLimits` of
+        this MockTracer, or ``None``. Its counters report the dropped
+        baggage items."""
+        return self._baggage_limits
+
+    def add_span_processor(self, processor=None, on_start=None,
+                           on_finish=None, background=False):
+        """Register a processor notified of every **Span** started and
+        finished by this MockTracer, without polling
+        :meth:`~MockTracer.finished_spans()`.
+
+        Either pass a
+        :class:`~opentracing.mocktracer.span_processor.SpanProcessor`, or
+        `on_start(span)` and/or `on_finish(span)` callables::
+
+            tracer.add_span_processor(
+                on_finish=lambda span: histogram.add(
+                    span.finish_time - span.start_time))
+
+        :param processor: a **SpanProcessor** instance.
+        :param on_start: a callable invoked with each started **Span**.
+        :param on_finish: a callable invoked with each finished **Span**.
+        :param background: if ``True``, the processor runs on a background
+            thread, see
+            :class:`~opentracing.mocktracer.span_processor.BackgroundSpanProcessor`.
+
+        :rtype: SpanProcessor
+        :return: the registered processor, to be passed to
+            :meth:`~MockTracer.remove_span_processor()`.
+        """
+        if processor is None:
+            processor = CallbackSpanProcessor(on_start, on_finish)
+        if background:
+            processor = BackgroundSpanProcessor(processor)
+
+        with self._span_processors_lock:
+            self._span_processors += (processor,)
+        return processor
+
+    def remove_span_processor(self, processor):
+        """Unregister and shut down a processor returned by
+        :meth:`~MockTracer.add_span_processor()`."""
+        with self._span_processors_lock:
+            self._span_processors = tuple(
+                p for p in self._span_processors if p is not processor)
+        processor.shutdown()
 
     def finished_spans(self):
         """Return a copy of all finished **Spans** started by this MockTracer
@@ -87,10 +246,127 @@ class MockTracer(Tracer):
         :return: a copy of the finished **Spans**.
         """
         with self._spans_lock:
-            return list(self._finished_spans)
+            return self._span_store.spans()
+
+    def drain(self):
+        """Remove and return the finished **Spans**, in finish order.
+
+        Unlike :meth:`~MockTracer.finished_spans()`, the buffer is swapped
+        out rather than copied, so a consumer polling drain() only pays for
+        the **Spans** finished since its previous call.
+
+        :rtype: list
+        :return: the finished **Spans** that were stored.
+        """
+        with self._spans_lock:
+            self._span_index = None
+            return self._span_store.drain()
+
+    def iter_finished_since(self, cursor=0):
+        """Return an iterator over the finished **Spans** stored after
+        `cursor`, without copying older **Spans**.
+
+        The iterator yields ``(next_cursor, span)`` pairs in finish order;
+        passing the last `next_cursor` to the next call resumes the stream
+        where it stopped::
+
+            cursor = 0
+            while True:
+                for cursor, span in tracer.iter_finished_since(cursor):
+                    process(span)
+                time.sleep(1)
+
+        **Spans** that were dropped, drained or reset before being read are
+        skipped.
+
+        :param cursor: ``0`` or a `next_cursor` from a previous call.
+
+        :rtype: iterator
+        """
+        with self._spans_lock:
+            return iter(self._span_store.since(cursor))
+
+    def query(self, trace_id=ANY, operation_name=ANY, parent_id=ANY,
+              tag=ANY):
+        """Return the finished **Spans** matching every given criterion,
+        in the order they finished, without scanning all finished **Spans**.
+
+        Criteria that are not given are ignored. For example, this returns
+        the root **Spans** tagged as server spans::
+
+            tracer.query(parent_id=None, tag=('span.kind', 'server'))
+
+        The index is built from the stored **Spans** by the first call to
+        query(), :meth:`~MockTracer.traces()` or
+        :meth:`~MockTracer.get_trace()`, then updated as **Spans** finish
+        or are evicted, until :meth:`~MockTracer.reset()` or
+        :meth:`~MockTracer.drain()` discards it. A MockTracer that is never
+        queried does not pay for it. **Spans** are matched on their
+        operation name and tags as they were when indexed.
+
+        :param trace_id: the trace id of the **Spans**.
+        :param operation_name: the operation name of the **Spans**.
+        :param parent_id: the span id of the parent **Span**; ``None``
+            selects **Spans** without a parent.
+        :param tag: a ``(key, value)`` tag of the **Spans**. The value must
+            be hashable.
+
+        :rtype: list
+        :return: the matching finished **Spans**.
+
+        :raises ValueError: if the span store does not retain the finished
+            **Spans**, like a
+            :class:`~opentracing.mocktracer.columnar_store.ColumnarSpanStore`.
+        """
+        criteria = (trace_id, operation_name, parent_id, tag)
+        if all(criterion is ANY for criterion in criteria):
+            return self.finished_spans()
+
+        with self._spans_lock:
+            return self._index().query(*criteria)
+
+    def traces(self):
+        """Return the finished **Spans** grouped by trace, as
+        :class:`~opentracing.mocktracer.trace.MockTrace` trees ordered by
+        their first finished **Span**.
+
+        The trees are built along with the index of
+        :meth:`~MockTracer.query()`, on first use, then updated
+        incrementally as **Spans** finish, and keep being updated
+        afterwards until the index is discarded.
+
+        :rtype: list
+        :return: a list of **MockTrace**.
+
+        :raises ValueError: if the span store does not retain the finished
+            **Spans**, see :meth:`~MockTracer.query()`.
+        """
+        with self._spans_lock:
+            return self._index().traces()
+
+    def get_trace(self, trace_id):
+        """Return the :class:`~opentracing.mocktracer.trace.MockTrace`
+        for `trace_id`, or ``None`` if none of its **Spans** has finished.
+
+        :raises ValueError: if the span store does not retain the finished
+            **Spans**, see :meth:`~MockTracer.query()`.
+        """
+        with self._spans_lock:
+            return self._index().get_trace(trace_id)
+
+    @property
+    def dropped_spans(self):
+        """The number of finished **Spans** dropped by the span store
+        (since construction or the last call to :meth:`~MockTracer.reset()`).
+
+        :rtype: int
+        """
+        with self._spans_lock:
+            return self._span_store.dropped_spans
 
     def reset(self):
-        """Clear the finished **Spans** queue.
+        """Clear the finished **Spans** queue and its dropped **Spans**
+        counter.
 
         Note that this does **not** have any effect on **Spans** created by
         MockTracer that have not finished yet; those
@@ -98,16 +374,35 @@ class MockTracer(Tracer):
         when they :func:`finish()`.
         """
         with self._spans_lock:
-            self._finished_spans = []
+            self._span_store.clear()
+            self._span_index = None
 
     def _append_finished_span(self, span):
         with self._spans_lock:
-            self._finished_spans.append(span)
+            dropped = self._span_store.append(span)
+            index = self._span_index
+            if index is not None and dropped is not span:
+                index.add(span)
+                if dropped is not None:
+                    index.remove(dropped)
+
+        for processor in self._span_processors:
+            call_hook(processor.on_finish, span)
+
+    def _index(self):
+        """Returns the span index, built from the stored **Spans** on first
+        use. The spans lock must be held."""
+        if self._span_index is None:
+            if self._span_store.retains_spans:
+                self._span_index = SpanIndex(self._spans_lock)
+                for span in self._span_store.spans():
+                    self._span_index.add(span)
+            else:
+                self._span_index = NullSpanIndex()
+        return self._span_index
 
     def _generate_id(self):
-        with self._next_id_lock:
-            self._next_id += 1
-            return self._next_id
+        return self._id_generator.generate_span_id()
 
     def start_active_span(self,
                           operation_name,
@@ -130,16 +425,24 @@ class MockTracer(Tracer):
 
         return self.scope_manager.activate(span, finish_on_close)
 
-    def start_span(self,
-                   operation_name=None,
-                   child_of=None,
-                   references=None,
-                   tags=None,
-                   start_time=None,
-                   ignore_active_span=False):
+    @property
+    def interner(self):
+        """The :class:`~opentracing.interning.Interner` of operation names
+        and tag keys, or ``None``."""
+        return self._interner
 
-        start_time = time.time() if start_time is None else start_time
+    def _intern_tags(self, tags):
+        intern = self._interner.intern
+        return dict((intern(key), value) for key, value in tags.items())
 
+    def _now(self):
+        """Returns the current time as a `(seconds, nanoseconds)` pair, only
+        one of which is set depending on the timing mode."""
+        if self._clock is None:
+            return time.time(), None
+        return None, self._clock.now_ns()
+
+    def _parent_context(self, child_of, references, ignore_active_span):
         # See if we have a parent_ctx in `references`
         parent_ctx = None
         if child_of is not None:
@@ -155,24 +458,51 @@ class MockTracer(Tracer):
             scope = self.scope_manager.active
             if scope is not None:
                 parent_ctx = scope.span.context
+        return parent_ctx
+
+    def start_span(self,
+                   operation_name=None,
+                   child_of=None,
+                   references=None,
+                   tags=None,
+                   start_time=None,
+                   ignore_active_span=False):
+
+        start_ns = None
+        if start_time is None:
+            start_time, start_ns = self._now()
+        if self._interner is not None:
+            operation_name = self._interner.intern(operation_name)
+            tags = self._intern_tags(tags) if tags else tags
+
+        parent_ctx = self._parent_context(child_of, references,
+                                          ignore_active_span)
 
         # Assemble the child ctx
-        ctx = SpanContext(span_id=self._generate_id())
+        ctx = SpanContext(span_id=self._id_generator.generate_span_id())
         if parent_ctx is not None:
-            if parent_ctx._baggage is not None:
-                ctx._baggage = parent_ctx._baggage.copy()
+            # Baggage is immutable, so it is shared rather than copied.
+            ctx._baggage = Baggage.from_mapping(parent_ctx.baggage)
             ctx.trace_id = parent_ctx.trace_id
+            ctx.flags = parent_ctx.flags
+            ctx.tracestate = parent_ctx.tracestate
         else:
-            ctx.trace_id = self._generate_id()
+            ctx.trace_id = self._id_generator.generate_trace_id()
 
         # Tie it all together
-        return MockSpan(
+        span = MockSpan(
             self,
             operation_name=operation_name,
             context=ctx,
             parent_id=(None if parent_ctx is None else parent_ctx.span_id),
             tags=tags,
-            start_time=start_time)
+            start_time=start_time,
+            locking=self._span_locking,
+            start_ns=start_ns)
+
+        for processor in self._span_processors:
+            call_hook(processor.on_start, span)
+        return span
 
     def inject(self, span_context, format, carrier):
         if format in self._propagators:
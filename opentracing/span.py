@@ -31,6 +31,8 @@ class SpanContext(object):
     span_id, sampled)`` tuple).
     """
 
+    __slots__ = ()
+
     EMPTY_BAGGAGE = {}  # TODO would be nice to make this immutable
 
     @property
@@ -134,7 +136,8 @@ class Span(object):
         :param key: key or name of the tag. Must be a string.
         :type key: str
 
-        :param value: value of the tag.
+        :param value: value of the tag, or a :class:`~opentracing.LazyValue`
+            computing it only if the :class:`Span` is recorded.
         :type value: string or bool or int or float
 
         :rtype: Span
@@ -142,6 +145,24 @@ class Span(object):
         """
         return self
 
+    def set_tags(self, tags):
+        """Attaches several key/value pairs to the :class:`Span` at once.
+
+        Equivalent to calling :meth:`Span.set_tag()` for each item, which is
+        what the default implementation does. Implementations may override
+        it to apply the whole batch at a lower cost.
+
+        :param tags: a dict of tag keys and values, as for
+            :meth:`Span.set_tag()`
+        :type tags: dict
+
+        :rtype: Span
+        :return: the :class:`Span` itself, for call chaining.
+        """
+        for key, value in tags.items():
+            self.set_tag(key, value)
+        return self
+
     def log_kv(self, key_values, timestamp=None):
         """Adds a log record to the :class:`Span`.
 
@@ -153,7 +174,9 @@ class Span(object):
 
             span.log_kv({"event": "two minutes ago"}, time.time() - 120)
 
-        :param key_values: A dict of string keys and values of any type
+        :param key_values: A dict of string keys and values of any type.
+            Values may be :class:`~opentracing.LazyValue` instances, only
+            computed if the :class:`Span` is recorded.
         :type key_values: dict
 
         :param timestamp: A unix timestamp per :meth:`time.time()`; current
@@ -165,6 +188,29 @@ class Span(object):
         """
         return self
 
+    def log_kv_many(self, records):
+        """Adds several log records to the :class:`Span` at once.
+
+        For example::
+
+            span.log_kv_many([
+                ({"event": "request sent"}, sent_at),
+                ({"event": "response received"}, None)])
+
+        Equivalent to calling :meth:`Span.log_kv()` for each record, which is
+        what the default implementation does.
+
+        :param records: an iterable of ``(key_values, timestamp)`` pairs, as
+            for :meth:`Span.log_kv()`
+        :type records: iterable
+
+        :rtype: Span
+        :return: the :class:`Span` itself, for call chaining.
+        """
+        for key_values, timestamp in records:
+            self.log_kv(key_values, timestamp)
+        return self
+
     def set_baggage_item(self, key, value):
         """Stores a Baggage item in the :class:`Span` as a key/value pair.
 
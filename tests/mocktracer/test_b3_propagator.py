@@ -0,0 +1,169 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from email.message import Message
+
+import pytest
+
+from opentracing import Format, SpanContextCorruptedException
+from opentracing.mocktracer import MockTracer
+from opentracing.mocktracer.b3_propagator import B3Propagator, format_b3, \
+    format_trace_id, parse_b3
+from opentracing.mocktracer.context import DEBUG, SAMPLED, SpanContext
+from opentracing.mocktracer.propagator import PROPAGATION_B3
+from opentracing.mocktracer.trace_context_propagator import \
+    TraceContextPropagator
+
+TRACE_ID_128 = '80f198ee56343ba864fe8b2a57d3eff7'
+TRACE_ID_64 = '463ac35c9f6413ad'
+SPAN_ID = 'e457b5a2e4d86bd1'
+PARENT_ID = '05e3ac9a4f6e3b90'
+
+
+def test_parse_b3():
+    assert parse_b3('%s-%s' % (TRACE_ID_64, SPAN_ID)) == (
+        0x463ac35c9f6413ad, 0xe457b5a2e4d86bd1, SAMPLED)
+    assert parse_b3('%s-%s-0' % (TRACE_ID_128, SPAN_ID)) == (
+        0x80f198ee56343ba864fe8b2a57d3eff7, 0xe457b5a2e4d86bd1, 0)
+    assert parse_b3('%s-%s-d-%s' % (TRACE_ID_128, SPAN_ID, PARENT_ID))[2] \
+        == SAMPLED | DEBUG
+
+
+@pytest.mark.parametrize('header', [
+    '',
+    '1',
+    'd',
+    TRACE_ID_64,
+    '%s-%s-x' % (TRACE_ID_64, SPAN_ID),
+    '%s-%s-true' % (TRACE_ID_64, SPAN_ID),
+    '%s-%s-1-%s-x' % (TRACE_ID_64, SPAN_ID, PARENT_ID),
+    '%s-%s-1-abc' % (TRACE_ID_64, SPAN_ID),
+    '%s-%s' % (TRACE_ID_64[:-1], SPAN_ID),
+    '%s-%s' % (TRACE_ID_64, SPAN_ID + '0'),
+    '%s-%s' % ('0' * 16, SPAN_ID),
+    '%s-%s' % (TRACE_ID_64, '+' + SPAN_ID[1:]),
+])
+def test_parse_invalid_b3(header):
+    assert parse_b3(header) is None
+
+
+def test_format_b3():
+    assert format_trace_id(0x463ac35c9f6413ad) == TRACE_ID_64
+    assert format_trace_id(0x80f198ee56343ba864fe8b2a57d3eff7) == \
+        TRACE_ID_128
+    assert format_b3(1, 2, SAMPLED) == '0000000000000001-0000000000000002-1'
+    assert format_b3(1, 2, 0).endswith('-0')
+    assert format_b3(1, 2, SAMPLED | DEBUG).endswith('-d')
+
+
+def test_multi_header_round_trip():
+    propagator = B3Propagator()
+    carrier = {
+        'x-b3-traceid': TRACE_ID_128,
+        'X-B3-SPANID': SPAN_ID,
+        'X-B3-ParentSpanId': PARENT_ID,
+        'X-B3-Sampled': '0',
+    }
+    context = propagator.extract(carrier)
+    assert context.trace_id == 0x80f198ee56343ba864fe8b2a57d3eff7
+    assert context.span_id == 0xe457b5a2e4d86bd1
+    assert not context.sampled
+    assert context.baggage == {}
+
+    injected = {}
+    propagator.inject(context, injected)
+    assert injected == {'X-B3-TraceId': TRACE_ID_128,
+                        'X-B3-SpanId': SPAN_ID,
+                        'X-B3-Sampled': '0'}
+
+
+@pytest.mark.parametrize('sampled,flags', [
+    (None, SAMPLED),
+    ('1', SAMPLED),
+    ('true', SAMPLED),
+    ('False', 0),
+])
+def test_multi_header_sampled(sampled, flags):
+    carrier = {'X-B3-TraceId': TRACE_ID_64, 'X-B3-SpanId': SPAN_ID}
+    if sampled is not None:
+        carrier['X-B3-Sampled'] = sampled
+    assert B3Propagator().extract(carrier).flags == flags
+
+
+def test_multi_header_debug():
+    propagator = B3Propagator()
+    context = propagator.extract({'X-B3-TraceId': TRACE_ID_64,
+                                  'X-B3-SpanId': SPAN_ID,
+                                  'X-B3-Flags': '1'})
+    assert context.flags == SAMPLED | DEBUG
+
+    carrier = {}
+    propagator.inject(context, carrier)
+    assert carrier == {'X-B3-TraceId': TRACE_ID_64,
+                       'X-B3-SpanId': SPAN_ID,
+                       'X-B3-Flags': '1'}
+
+
+def test_single_header():
+    propagator = B3Propagator(single_header=True)
+    message = Message()
+    message['B3'] = '%s-%s-d-%s' % (TRACE_ID_64, SPAN_ID, PARENT_ID)
+    # The single header takes precedence.
+    message['X-B3-TraceId'] = TRACE_ID_128
+    context = propagator.extract(message)
+    assert context.trace_id == 0x463ac35c9f6413ad
+    assert context.flags == SAMPLED | DEBUG
+
+    carrier = {}
+    propagator.inject(context, carrier)
+    assert carrier == {'b3': '%s-%s-d' % (TRACE_ID_64, SPAN_ID)}
+
+
+@pytest.mark.parametrize('carrier', [
+    {},
+    {'b3': '1'},
+    {'X-B3-TraceId': TRACE_ID_64},
+    {'X-B3-TraceId': TRACE_ID_64, 'X-B3-SpanId': SPAN_ID,
+     'X-B3-Sampled': 'maybe'},
+])
+def test_b3_corrupted(carrier):
+    with pytest.raises(SpanContextCorruptedException):
+        B3Propagator().extract(carrier)
+
+
+def test_tracer_http_propagation():
+    tracer = MockTracer(http_propagation=PROPAGATION_B3)
+    parent = tracer.extract(Format.HTTP_HEADERS, {'b3': '%s-%s-0' % (
+        TRACE_ID_128, SPAN_ID)})
+    span = tracer.start_span('x', child_of=parent)
+
+    carrier = {}
+    tracer.inject(span.context, Format.HTTP_HEADERS, carrier)
+    assert carrier == {'X-B3-TraceId': TRACE_ID_128,
+                       'X-B3-SpanId': '%016x' % span.context.span_id,
+                       'X-B3-Sampled': '0'}
+
+
+def test_span_context_debug_not_sent_over_w3c():
+    context = SpanContext(trace_id=1, span_id=2)
+    context.flags |= DEBUG
+    carrier = {}
+    TraceContextPropagator().inject(context, carrier)
+    assert carrier['traceparent'].endswith('-01')
@@ -0,0 +1,140 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import pickle
+
+import pytest
+
+from opentracing import Format
+from opentracing.mocktracer import BaggageLimits, MockTracer
+from opentracing.mocktracer.baggage import Baggage, EMPTY_BAGGAGE, \
+        DROP_MAX_ITEMS, DROP_MAX_KEY_BYTES, DROP_MAX_VALUE_BYTES, \
+        DROP_MAX_TOTAL_BYTES
+
+
+def test_baggage_set():
+    first = EMPTY_BAGGAGE.set('a', 1)
+    second = first.set('b', 2)
+    third = second.set('a', 3)
+
+    assert EMPTY_BAGGAGE == {}
+    assert first == {'a': 1}
+    assert second == {'a': 1, 'b': 2}
+    assert third == {'a': 3, 'b': 2}
+    assert len(third) == 2
+    assert third['a'] == 3
+    assert third.get('missing') is None
+    assert sorted(third) == ['a', 'b']
+    assert third.copy() is third
+
+
+def test_baggage_is_immutable():
+    baggage = Baggage({'a': 1})
+    with pytest.raises(TypeError):
+        baggage['a'] = 2
+
+
+def test_baggage_flattens_deep_chains():
+    baggage = EMPTY_BAGGAGE
+    for i in range(Baggage.MAX_DEPTH * 3):
+        baggage = baggage.set(str(i), i)
+        assert baggage._depth <= Baggage.MAX_DEPTH
+
+    assert baggage == dict((str(i), i) for i in range(Baggage.MAX_DEPTH * 3))
+
+
+def test_baggage_pickle():
+    baggage = Baggage({'a': 1}).set('b', 2)
+    assert pickle.loads(pickle.dumps(baggage)) == {'a': 1, 'b': 2}
+
+
+def test_children_share_baggage():
+    tracer = MockTracer()
+    parent = tracer.start_span('parent')
+    parent.set_baggage_item('foo', 'bar')
+    child = tracer.start_span('child', child_of=parent)
+    grandchild = tracer.start_span('grandchild', child_of=child)
+
+    assert grandchild.context.baggage is parent.context.baggage
+    assert grandchild.get_baggage_item('foo') == 'bar'
+
+    child.set_baggage_item('baz', 'qux')
+    assert child.context.baggage == {'foo': 'bar', 'baz': 'qux'}
+    assert parent.context.baggage == {'foo': 'bar'}
+
+
+def test_baggage_byte_size():
+    baggage = EMPTY_BAGGAGE.set('ab', 'cd').set(u'\xe9', 1)
+    assert baggage.byte_size == 4 + 3
+    assert baggage.set('ab', 'c').byte_size == 3 + 3
+    assert Baggage({'ab': 'cd'}).byte_size == 4
+
+    # Computed on first use, then tracked incrementally.
+    baggage = Baggage({'ab': 'cd'})
+    assert baggage.set('ab', 'e').byte_size == 3
+    assert baggage.byte_size == 4
+    assert baggage.set('x', 'y').byte_size == 6
+
+
+@pytest.mark.parametrize('limits,key,value,reason', [
+    (BaggageLimits(max_items=1), 'other', 'x', DROP_MAX_ITEMS),
+    (BaggageLimits(max_key_bytes=3), 'long', 'x', DROP_MAX_KEY_BYTES),
+    (BaggageLimits(max_value_bytes=3), 'k', 'long', DROP_MAX_VALUE_BYTES),
+    (BaggageLimits(max_total_bytes=6), 'k', 'long', DROP_MAX_TOTAL_BYTES),
+])
+def test_baggage_limits(limits, key, value, reason):
+    tracer = MockTracer(baggage_limits=limits)
+    assert tracer.baggage_limits is limits
+    span = tracer.start_span('x')
+    span.set_baggage_item('foo', 'b')
+    span.set_baggage_item(key, value)
+
+    assert span.context.baggage == {'foo': 'b'}
+    assert limits.dropped_items[reason] == 1
+    assert sum(limits.dropped_items.values()) == 1
+
+
+def test_baggage_limits_replace_item():
+    limits = BaggageLimits(max_items=1, max_total_bytes=6)
+    tracer = MockTracer(baggage_limits=limits)
+    span = tracer.start_span('x')
+    span.set_baggage_item('foo', 'bar')
+    span.set_baggage_item('foo', 'baz')
+    assert span.get_baggage_item('foo') == 'baz'
+    assert sum(limits.dropped_items.values()) == 0
+
+
+@pytest.mark.parametrize('format,carrier', [
+    (Format.TEXT_MAP, {}),
+    (Format.BINARY, bytearray()),
+])
+def test_baggage_limits_on_extract(format, carrier):
+    sender = MockTracer()
+    span = sender.start_span('x')
+    span.set_baggage_item('a', '1')
+    span.set_baggage_item('b', 'too long')
+    sender.inject(span.context, format, carrier)
+
+    limits = BaggageLimits(max_value_bytes=4)
+    receiver = MockTracer(baggage_limits=limits)
+    context = receiver.extract(format, carrier)
+    assert context.baggage == {'a': '1'}
+    assert limits.dropped_items[DROP_MAX_VALUE_BYTES] == 1
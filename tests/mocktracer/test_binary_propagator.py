@@ -0,0 +1,160 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import struct
+
+import pytest
+
+from opentracing import InvalidCarrierException, \
+    SpanContextCorruptedException
+from opentracing.mocktracer.binary_propagator import BinaryPropagator, \
+    FLAG_SAMPLED, PickleBinaryPropagator, VERSION
+from opentracing.mocktracer.context import SpanContext
+
+
+def test_binary_layout():
+    carrier = bytearray()
+    context = SpanContext(trace_id=0x1234, span_id=0x56, baggage={'k': 'v'})
+    BinaryPropagator().inject(context, carrier)
+
+    assert bytes(carrier) == struct.pack(
+        '<BBQQQHHI', VERSION, FLAG_SAMPLED, 0, 0x1234, 0x56, 1, 1, 1) + \
+        b'kv'
+
+
+def test_binary_round_trip():
+    propagator = BinaryPropagator()
+    context = SpanContext(trace_id=(1 << 127) | 42, span_id=(1 << 64) - 1,
+                          baggage={'user': u'caf\xe9', u'k\xe9y': ''})
+    carrier = bytearray()
+    propagator.inject(context, carrier)
+    extracted = propagator.extract(carrier)
+
+    assert extracted.trace_id == context.trace_id
+    assert extracted.span_id == context.span_id
+    assert extracted.baggage == context.baggage
+
+
+def test_binary_corrupted():
+    propagator = BinaryPropagator()
+    carrier = bytearray()
+    propagator.inject(SpanContext(trace_id=1, span_id=2,
+                                  baggage={'key': 'value'}), carrier)
+
+    for corrupted in (bytearray(),
+                      carrier[:10],
+                      carrier[:-1],
+                      bytearray([VERSION + 1]) + carrier[1:]):
+        with pytest.raises(SpanContextCorruptedException):
+            propagator.extract(corrupted)
+
+    with pytest.raises(InvalidCarrierException):
+        propagator.extract({})
+    with pytest.raises(InvalidCarrierException):
+        propagator.inject(SpanContext(trace_id=1, span_id=2), {})
+
+
+@pytest.mark.parametrize('value', [b'a\xe2', b'\xc3', b'\xff'])
+def test_binary_corrupted_utf8(value):
+    carrier = struct.pack('<BBQQQHHI', VERSION, FLAG_SAMPLED, 0, 1, 2, 1, 1,
+                          len(value)) + b'k' + value
+    with pytest.raises(SpanContextCorruptedException):
+        BinaryPropagator().extract(carrier)
+
+
+def test_binary_encode_values():
+    propagator = BinaryPropagator()
+    carrier = bytearray()
+    propagator.inject(SpanContext(trace_id=1, span_id=2,
+                                  baggage={'count': 42}), carrier)
+    assert propagator.extract(carrier).baggage == {'count': '42'}
+
+    with pytest.raises(ValueError):
+        propagator.inject(SpanContext(trace_id=1, span_id=2,
+                                      baggage={'k' * 0x10000: 'v'}),
+                          bytearray())
+    baggage = dict(('k%d' % i, 'v') for i in range(0x10000))
+    with pytest.raises(ValueError):
+        propagator.inject(SpanContext(trace_id=1, span_id=2,
+                                      baggage=baggage), bytearray())
+
+
+def test_binary_extract_from_buffers():
+    propagator = BinaryPropagator()
+    context = SpanContext(trace_id=7, span_id=8, baggage={'k': 'v'})
+    encoded = bytearray()
+    propagator.inject(context, encoded)
+
+    frame = b'header' + bytes(encoded) + b'payload'
+    for buffer in (frame, bytearray(frame), memoryview(frame)):
+        extracted, consumed = propagator.extract_from(buffer, 6)
+        assert consumed == len(encoded)
+        assert frame[6 + consumed:] == b'payload'
+        assert (extracted.trace_id, extracted.span_id) == (7, 8)
+        assert extracted.baggage == {'k': 'v'}
+
+    assert propagator.extract(bytes(encoded)).span_id == 8
+    with pytest.raises(SpanContextCorruptedException):
+        propagator.extract_from(frame, len(frame) - 3)
+    with pytest.raises(ValueError):
+        propagator.extract_from(frame, -1)
+
+
+def test_binary_non_contiguous_buffers():
+    propagator = BinaryPropagator()
+    context = SpanContext(trace_id=7, span_id=8)
+    encoded = bytearray()
+    propagator.inject(context, encoded)
+    strided = memoryview(bytearray(2 * len(encoded)))[::2]
+
+    with pytest.raises(InvalidCarrierException):
+        propagator.extract_from(memoryview(encoded + encoded)[::2])
+    with pytest.raises(InvalidCarrierException):
+        propagator.extract(strided)
+    with pytest.raises(InvalidCarrierException):
+        propagator.inject_into(context, strided)
+
+
+def test_binary_inject_into():
+    propagator = BinaryPropagator()
+    context = SpanContext(trace_id=7, span_id=8, baggage={'k': 'v'})
+    buffer = bytearray(64)
+    written = propagator.inject_into(context, buffer, 4)
+
+    extracted, consumed = propagator.extract_from(buffer, 4)
+    assert consumed == written
+    assert extracted.baggage == {'k': 'v'}
+    assert buffer[4 + written:] == bytearray(64 - 4 - written)
+
+    with pytest.raises(ValueError):
+        propagator.inject_into(context, bytearray(written - 1))
+    with pytest.raises(InvalidCarrierException):
+        propagator.inject_into(context, bytes(64))
+
+
+def test_binary_smaller_than_pickle():
+    context = SpanContext(trace_id=1, span_id=2, baggage={'key': 'value'})
+    compact, pickled = bytearray(), bytearray()
+    BinaryPropagator().inject(context, compact)
+    PickleBinaryPropagator().inject(context, pickled)
+    assert len(compact) < len(pickled)
+
+    extracted = PickleBinaryPropagator().extract(pickled)
+    assert extracted.baggage == {'key': 'value'}
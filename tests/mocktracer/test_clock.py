@@ -0,0 +1,39 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import time
+
+from opentracing.mocktracer.clock import MonotonicClock, perf_counter_ns, \
+    time_ns
+
+
+def test_fallback_clocks():
+    assert isinstance(time_ns(), int)
+    assert abs(time_ns() / 1e9 - time.time()) < 1
+    assert perf_counter_ns() <= perf_counter_ns()
+
+
+def test_monotonic_clock():
+    clock = MonotonicClock()
+    first = clock.now_ns()
+    second = clock.now_ns()
+    assert isinstance(first, int)
+    assert first <= second
+    assert abs(first / 1e9 - time.time()) < 1
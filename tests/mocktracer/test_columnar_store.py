@@ -0,0 +1,123 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import pytest
+
+from opentracing.mocktracer import ColumnarSpanStore, MockTracer, \
+        RandomIdGenerator
+
+
+def _finish_span(tracer, operation_name, duration, **kwargs):
+    span = tracer.start_span(operation_name, start_time=100.0, **kwargs)
+    span.finish(finish_time=100.0 + duration)
+    return span
+
+
+def test_columnar_store_records():
+    tracer = MockTracer(span_store=ColumnarSpanStore())
+    parent = tracer.start_span('parent', start_time=1.0)
+    parent.set_baggage_item('foo', 'bar')
+    child = tracer.start_span('child', child_of=parent, start_time=2.0,
+                              tags={'db.type': 'sql'})
+    child.log_kv({'event': 'query'}, timestamp=2.5)
+    child.finish(finish_time=3.0)
+    parent.finish(finish_time=4.0)
+
+    child_record, parent_record = tracer.finished_spans()
+    assert child_record.operation_name == 'child'
+    assert child_record.context.trace_id == child.context.trace_id
+    assert child_record.context.span_id == child.context.span_id
+    assert child_record.parent_id == parent.context.span_id
+    assert child_record.start_time == 2.0
+    assert child_record.finish_time == 3.0
+    assert child_record.duration == 1.0
+    assert child_record.tags == {'db.type': 'sql'}
+    assert child_record.logs[0].key_values == {'event': 'query'}
+    assert child_record.logs[0].timestamp == 2.5
+    assert child_record.context.baggage == {'foo': 'bar'}
+    assert parent_record.parent_id is None
+    assert parent_record.tags == {}
+
+
+def test_columnar_store_128_bit_trace_ids():
+    tracer = MockTracer(span_store=ColumnarSpanStore(),
+                        id_generator=RandomIdGenerator(trace_id_bits=128))
+    span = _finish_span(tracer, 'x', 1.0)
+    assert tracer.finished_spans()[0].context.trace_id == \
+        span.context.trace_id
+
+
+def test_columnar_store_durations():
+    store = ColumnarSpanStore()
+    tracer = MockTracer(span_store=store)
+    for duration in (1.0, 2.0, 3.0, 4.0):
+        _finish_span(tracer, 'a', duration)
+    _finish_span(tracer, 'b', 10.0)
+
+    assert list(store.durations()) == [1.0, 2.0, 3.0, 4.0, 10.0]
+    assert list(store.durations('a')) == [1.0, 2.0, 3.0, 4.0]
+    assert list(store.durations('missing')) == []
+    assert store.percentiles([0, 50, 100], 'a') == [1.0, 2.5, 4.0]
+    assert store.percentile(50) == 3.0
+    assert store.percentile(50, 'missing') is None
+    with pytest.raises(ValueError):
+        store.percentile(101)
+
+
+def test_columnar_store_drain_and_stream():
+    tracer = MockTracer(span_store=ColumnarSpanStore())
+    _finish_span(tracer, 'a', 1.0)
+    _finish_span(tracer, 'b', 1.0)
+
+    assert [cursor for cursor, _ in tracer.iter_finished_since(1)] == [2]
+    assert [record.operation_name for record in tracer.drain()] == \
+        ['a', 'b']
+    assert tracer.finished_spans() == []
+
+    _finish_span(tracer, 'c', 1.0)
+    assert [(cursor, record.operation_name) for cursor, record
+            in tracer.iter_finished_since(2)] == [(3, 'c')]
+
+
+def test_columnar_store_not_indexed():
+    tracer = MockTracer(span_store=ColumnarSpanStore())
+    _finish_span(tracer, 'a', 1.0)
+    with pytest.raises(ValueError):
+        tracer.query(operation_name='a')
+    with pytest.raises(ValueError):
+        tracer.traces()
+    with pytest.raises(ValueError):
+        tracer.get_trace(1)
+
+
+def test_columnar_store_reset(monkeypatch):
+    tracer = MockTracer(span_store=ColumnarSpanStore())
+    span = _finish_span(tracer, 'a', 1.0)
+    # Storing a log-less Span does not allocate its logs.
+    assert span._logs is None
+
+    def fail(self, row):
+        raise AssertionError('reset() should not build records')
+
+    monkeypatch.setattr(ColumnarSpanStore, '_record', fail)
+    tracer.reset()
+    assert tracer.finished_spans() == []
+    assert tracer.dropped_spans == 0
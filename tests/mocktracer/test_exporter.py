@@ -0,0 +1,139 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import os
+
+import pytest
+
+from opentracing.mocktracer import FileSpanExporter, MockTracer, \
+        RandomIdGenerator, read_spans
+from opentracing.mocktracer.exporter import FORMAT_BINARY, FORMAT_JSONL, \
+        segment_path
+
+
+def _record_spans(tracer):
+    parent = tracer.start_span('parent', start_time=1.0)
+    parent.set_baggage_item('foo', 'bar')
+    child = tracer.start_span(u'child \xe9', child_of=parent,
+                              start_time=2.0, tags={'db.type': 'sql'})
+    child.log_kv({'event': 'query', 'error.kind': ValueError},
+                 timestamp=2.5)
+    child.finish(finish_time=3.0)
+    parent.finish(finish_time=4.0)
+    return child, parent
+
+
+@pytest.mark.parametrize('format', [FORMAT_JSONL, FORMAT_BINARY])
+def test_export_and_read(tmpdir, format):
+    path = str(tmpdir.join('spans'))
+    tracer = MockTracer(id_generator=RandomIdGenerator(trace_id_bits=128))
+    exporter = tracer.add_span_processor(
+        FileSpanExporter(path, format=format, batch_size=10))
+    spans = _record_spans(tracer)
+    tracer.remove_span_processor(exporter)
+
+    records = list(read_spans(path))
+    assert len(records) == 2
+    for record, span in zip(records, spans):
+        assert record.context.trace_id == span.context.trace_id
+        assert record.context.span_id == span.context.span_id
+        assert record.parent_id == span.parent_id
+        assert record.operation_name == span.operation_name
+        assert record.start_time == span.start_time
+        assert record.finish_time == span.finish_time
+        assert record.context.baggage == {'foo': 'bar'}
+
+    child, parent = records
+    assert child.tags == {'db.type': 'sql'}
+    assert child.logs[0].timestamp == 2.5
+    assert child.logs[0].key_values == {'event': 'query',
+                                        'error.kind': repr(ValueError)}
+    assert parent.tags == {}
+    assert parent.logs == []
+
+
+@pytest.mark.parametrize('format', [FORMAT_JSONL, FORMAT_BINARY])
+def test_export_batches_and_rotation(tmpdir, format):
+    path = str(tmpdir.join('spans'))
+    tracer = MockTracer()
+    exporter = FileSpanExporter(path, format=format, batch_size=5,
+                                max_bytes=512)
+    tracer.add_span_processor(exporter)
+
+    for i in range(4):
+        tracer.start_span(str(i)).finish()
+    assert list(read_spans(path)) == []
+    exporter.flush()
+    assert len(list(read_spans(path))) == 4
+
+    for i in range(4, 100):
+        tracer.start_span(str(i)).finish()
+    tracer.remove_span_processor(exporter)
+
+    assert len(exporter.segments) > 1
+    assert exporter.segments[1] == segment_path(path, 1)
+    names = [record.operation_name
+             for segment in exporter.segments
+             for record in read_spans(segment)]
+    assert names == [str(i) for i in range(100)]
+
+
+def test_export_invalid_format(tmpdir):
+    with pytest.raises(ValueError):
+        FileSpanExporter(str(tmpdir.join('spans')), format='xml')
+
+
+def _export(tracer, path, format, run):
+    exporter = tracer.add_span_processor(
+        FileSpanExporter(path, format=format, batch_size=1, max_bytes=500))
+    for i in range(20):
+        tracer.start_span('r%d-%d' % (run, i)).finish()
+    tracer.remove_span_processor(exporter)
+    return exporter
+
+
+@pytest.mark.parametrize('format', [FORMAT_JSONL, FORMAT_BINARY])
+def test_export_rotation_without_empty_segments(tmpdir, format):
+    path = str(tmpdir.join('spans'))
+    exporter = _export(MockTracer(), path, format, 0)
+
+    assert len(exporter.segments) > 1
+    for segment in exporter.segments:
+        assert list(read_spans(segment))
+        if format == FORMAT_JSONL:
+            assert os.path.getsize(segment) <= 500
+    assert not os.path.exists(segment_path(path, len(exporter.segments)))
+
+
+def test_export_jsonl_resumes_last_segment(tmpdir):
+    path = str(tmpdir.join('spans'))
+    tracer = MockTracer()
+    first = _export(tracer, path, FORMAT_JSONL, 0)
+    second = _export(tracer, path, FORMAT_JSONL, 1)
+
+    assert second.segments[0] == first.segments[-1]
+    segments = [segment_path(path, i)
+                for i in range(len(set(first.segments + second.segments)))]
+    names = [record.operation_name
+             for segment in segments
+             for record in read_spans(segment)]
+    assert names == ['r%d-%d' % (run, i) for run in (0, 1)
+                     for i in range(20)]
@@ -0,0 +1,131 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import os
+from threading import Thread
+
+import pytest
+
+from opentracing import Format
+from opentracing.mocktracer import BlockIdGenerator, MockTracer, \
+        RandomIdGenerator, SequentialIdGenerator
+
+
+def _generate_concurrently(generator, threads=8, count=1000):
+    results = [[] for _ in range(threads)]
+
+    def worker(ids):
+        for _ in range(count):
+            ids.append(generator.generate_span_id())
+
+    workers = [Thread(target=worker, args=(ids,)) for ids in results]
+    for worker_thread in workers:
+        worker_thread.start()
+    for worker_thread in workers:
+        worker_thread.join()
+
+    return [span_id for ids in results for span_id in ids]
+
+
+def test_sequential_ids_are_repeatable():
+    first = SequentialIdGenerator()
+    second = SequentialIdGenerator()
+    assert [first.generate_span_id() for _ in range(5)] == [1, 2, 3, 4, 5]
+    assert [second.generate_span_id() for _ in range(5)] == [1, 2, 3, 4, 5]
+    assert first.generate_trace_id() == 6
+
+
+@pytest.mark.parametrize('generator_class', [
+    SequentialIdGenerator,
+    BlockIdGenerator,
+])
+def test_ids_are_unique_across_threads(generator_class):
+    ids = _generate_concurrently(generator_class())
+    assert len(ids) == len(set(ids))
+    assert 0 not in ids
+
+
+def test_block_ids():
+    generator = BlockIdGenerator(block_size=2)
+    assert [generator.generate_span_id() for _ in range(5)] == [1, 2, 3, 4, 5]
+
+    with pytest.raises(ValueError):
+        BlockIdGenerator(block_size=0)
+
+
+def test_tracer_id_generator():
+    tracer = MockTracer(id_generator=SequentialIdGenerator(start=100))
+    span = tracer.start_span('x')
+    assert span.context.span_id == 100
+    assert span.context.trace_id == 101
+
+
+@pytest.mark.parametrize('trace_id_bits', [64, 128])
+def test_random_ids(trace_id_bits):
+    generator = RandomIdGenerator(trace_id_bits=trace_id_bits)
+    span_ids = [generator.generate_span_id() for _ in range(1000)]
+    trace_ids = [generator.generate_trace_id() for _ in range(1000)]
+
+    assert len(set(span_ids)) == len(span_ids)
+    assert all(0 < span_id < 2 ** 64 for span_id in span_ids)
+    assert all(0 < trace_id < 2 ** trace_id_bits for trace_id in trace_ids)
+    assert any(trace_id >= 2 ** 64 for trace_id in trace_ids) == \
+        (trace_id_bits == 128)
+
+
+def test_random_ids_unique_across_threads():
+    ids = _generate_concurrently(RandomIdGenerator())
+    assert len(ids) == len(set(ids))
+
+
+def test_random_ids_invalid_width():
+    with pytest.raises(ValueError):
+        RandomIdGenerator(trace_id_bits=32)
+
+
+def test_random_ids_propagation():
+    tracer = MockTracer(id_generator=RandomIdGenerator(trace_id_bits=128))
+    span = tracer.start_span('x')
+    carrier = {}
+    tracer.inject(span.context, Format.TEXT_MAP, carrier)
+    assert len(carrier['ot-tracer-traceid']) > 16
+
+    extracted = tracer.extract(Format.TEXT_MAP, carrier)
+    assert extracted.trace_id == span.context.trace_id
+    assert extracted.span_id == span.context.span_id
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+def test_random_ids_reseed_after_fork():
+    generator = RandomIdGenerator()
+    generator.generate_span_id()
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.write(write_fd, str(generator.generate_span_id()).encode())
+        os._exit(0)
+
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+    child_id = int(os.read(read_fd, 64).decode())
+    os.close(read_fd)
+    assert child_id != generator.generate_span_id()
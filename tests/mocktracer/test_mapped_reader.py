@@ -0,0 +1,118 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import pytest
+
+from opentracing.mocktracer import FileSpanExporter, MappedSpanFile, \
+        MockTracer, RandomIdGenerator, read_spans
+from opentracing.mocktracer.exporter import FORMAT_BINARY, FORMAT_JSONL, \
+        decode_binary
+
+
+def _record_traces(tracer, count):
+    traces = []
+    for i in range(count):
+        with tracer.start_span('root') as root:
+            with tracer.start_span('child %d' % (i % 3), child_of=root):
+                pass
+        traces.append(root.context.trace_id)
+    return traces
+
+
+@pytest.fixture
+def exporter_path(tmpdir):
+    return str(tmpdir.join('spans.bin'))
+
+
+def _export(path, count, close=True):
+    tracer = MockTracer(id_generator=RandomIdGenerator(trace_id_bits=128))
+    exporter = FileSpanExporter(path, format=FORMAT_BINARY, batch_size=7)
+    tracer.add_span_processor(exporter)
+    traces = _record_traces(tracer, count)
+    if close:
+        tracer.remove_span_processor(exporter)
+    else:
+        exporter.flush()
+    return traces
+
+
+@pytest.mark.parametrize('close', [True, False])
+def test_mapped_trace_lookup(exporter_path, close):
+    traces = _export(exporter_path, 50, close=close)
+
+    with MappedSpanFile(exporter_path) as span_file:
+        assert span_file.indexed == close
+        for trace_id in traces:
+            child, root = span_file.trace(trace_id)
+            assert root.operation_name == 'root'
+            assert root.context.trace_id == trace_id
+            assert child.parent_id == root.context.span_id
+        assert span_file.trace(12345) == []
+
+        children = span_file.spans_by_operation_name('child 1')
+        assert [record.context.trace_id for record in children] == \
+            traces[1::3]
+        assert len(span_file.spans_by_operation_name('root')) == 50
+        assert span_file.spans_by_operation_name('missing') == []
+        assert len(list(span_file)) == 100
+
+
+def test_mapped_raw_records(exporter_path):
+    traces = _export(exporter_path, 3)
+
+    with MappedSpanFile(exporter_path) as span_file:
+        raw = span_file.raw_trace(traces[0])
+        assert len(raw) == 2
+        records = [decode_binary(view)[0] for view in raw]
+        assert [record.operation_name for record in records] == \
+            ['child 0', 'root']
+
+        roots = span_file.raw_spans_by_operation_name('root')
+        assert [decode_binary(view)[0].context.trace_id
+                for view in roots] == traces
+        assert span_file.raw_spans_by_operation_name('missing') == []
+        for view in raw + roots:
+            if isinstance(view, memoryview):
+                view.release()
+
+
+def test_streaming_reader_skips_index(exporter_path):
+    _export(exporter_path, 5)
+    assert len(list(read_spans(exporter_path))) == 10
+
+
+def test_binary_exporter_never_appends(exporter_path):
+    _export(exporter_path, 2)
+    exporter = FileSpanExporter(exporter_path, format=FORMAT_BINARY)
+    exporter.shutdown()
+    assert exporter.segments == [exporter_path + '.1']
+
+
+def test_mapped_invalid_file(tmpdir):
+    path = str(tmpdir.join('spans.jsonl'))
+    tracer = MockTracer()
+    exporter = tracer.add_span_processor(
+        FileSpanExporter(path, format=FORMAT_JSONL))
+    tracer.start_span('x').finish()
+    tracer.remove_span_processor(exporter)
+
+    with pytest.raises(ValueError):
+        MappedSpanFile(path)
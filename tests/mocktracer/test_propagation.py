@@ -22,6 +22,7 @@ import pytest
 from opentracing import Format, SpanContextCorruptedException, \
         UnsupportedFormatException
 from opentracing.mocktracer import MockTracer
+from opentracing.mocktracer.propagator import FieldLookup
 
 
 def test_propagation():
@@ -67,3 +68,18 @@ def test_start_span():
     assert child.context.trace_id == sp.context.trace_id
     assert child.context.baggage == sp.context.baggage
     assert child.parent_id == sp.context.span_id
+
+
+def test_field_lookup():
+    lookup = FieldLookup(['traceparent', 'tracestate'])
+    carrier = {'Host': 'x', 'TraceParent': 'a', 'TRACESTATE': 'b', 't': 'c'}
+    assert lookup.lookup(carrier) == {'traceparent': 'a', 'tracestate': 'b'}
+    assert lookup.lookup({'Host': 'x'}) == {}
+    with pytest.raises(SpanContextCorruptedException):
+        lookup.lookup({'traceparent': 'a', 'TRACEPARENT': 'b'})
+
+    lookup = FieldLookup(['ot-tracer-traceid'], prefix='ot-baggage-')
+    prefixed = {}
+    assert lookup.lookup({'OT-Tracer-TraceId': '1', 'Ot-Baggage-User': 'u'},
+                         prefixed) == {'ot-tracer-traceid': '1'}
+    assert prefixed == {'user': 'u'}
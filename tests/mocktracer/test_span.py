@@ -18,7 +18,22 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import pickle
+import time
+from threading import Lock, Thread
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import pytest
+
+from opentracing import LazyValue
 from opentracing.mocktracer import MockTracer
+from opentracing.mocktracer.clock import TIMING_MONOTONIC
+from opentracing.mocktracer.context import SpanContext
+from opentracing.mocktracer.span import LOCKING_NONE, LOCKING_OWNER, LogData
 
 
 def test_span_log_kv():
@@ -37,3 +52,197 @@ def test_span_log_kv():
     assert len(finished_spans[0].logs[0].key_values) == 2
     assert finished_spans[0].logs[0].key_values['foo'] == 'bar'
     assert finished_spans[0].logs[0].key_values['baz'] == 42
+
+
+def test_span_batches():
+    tracer = MockTracer()
+
+    span = tracer.start_span('x')
+    with mock.patch.object(span, 'set_tag') as set_tag:
+        span.set_tags({'foo': 'bar', 'baz': 42})
+        assert set_tag.call_count == 0
+    span.log_kv_many([({'event': 'a'}, 1.0), ({'event': 'b'}, None)])
+    span.finish()
+
+    assert span.tags == {'foo': 'bar', 'baz': 42}
+    assert [log.key_values for log in span.logs] == [
+        {'event': 'a'}, {'event': 'b'}]
+    assert span.logs[0].timestamp == 1.0
+    assert span.logs[1].timestamp > 1.0
+
+
+def test_span_lazy_values():
+    tracer = MockTracer()
+    key_values = {'event': 'x', 'payload': LazyValue(repr, [1, 2])}
+
+    span = tracer.start_span('x', tags={'a': LazyValue(len, 'abc')})
+    span.set_tag('b', LazyValue(str, 42))
+    span.log_kv(key_values)
+    span.log_kv({'error.kind': ValueError})
+    assert isinstance(span.tags['a'], LazyValue)
+    span.finish()
+
+    assert span.tags == {'a': 3, 'b': '42'}
+    assert span.logs[0].key_values == {'event': 'x', 'payload': '[1, 2]'}
+    assert isinstance(key_values['payload'], LazyValue)
+    assert span.logs[1].key_values['error.kind'] is ValueError
+
+
+def test_span_lazy_tags_and_logs():
+    tracer = MockTracer()
+    span = tracer.start_span('x')
+    assert span._tags is None
+    assert span._logs is None
+
+    span.finish()
+    assert span._tags is None
+    assert span.tags == {}
+    assert span.logs == []
+
+    span = tracer.start_span('y')
+    span.set_tag('foo', 'bar')
+    assert span.tags == {'foo': 'bar'}
+
+
+def test_span_locking_none():
+    tracer = MockTracer(span_locking=LOCKING_NONE)
+    span = tracer.start_span('x')
+    assert not isinstance(span._lock, type(Lock()))
+
+    span.set_tag('foo', 'bar')
+    span.log_kv({'event': 'x'})
+    span.set_baggage_item('baz', 'qux')
+    span.finish()
+    assert span.tags == {'foo': 'bar'}
+    assert len(span.logs) == 1
+    assert span.get_baggage_item('baz') == 'qux'
+
+    with pytest.raises(ValueError):
+        MockTracer(span_locking='sometimes')
+
+
+def test_span_locking_owner():
+    tracer = MockTracer(span_locking=LOCKING_OWNER)
+    span = tracer.start_span('x')
+    assert span._lock is None
+
+    span.set_tag('foo', 'bar')
+    span.log_kv({'event': 'x'})
+    span.set_baggage_item('baz', 'qux')
+    assert span.get_baggage_item('baz') == 'qux'
+    assert span._lock is None
+
+    thread = Thread(target=span.set_tag, args=('thread', 1))
+    thread.start()
+    thread.join()
+    assert isinstance(span._lock, type(Lock()))
+    assert span._owner is None
+
+    span.set_operation_name('y')
+    span.finish()
+    assert span.tags == {'foo': 'bar', 'thread': 1}
+    assert len(span.logs) == 1
+    assert tracer.finished_spans()[0].operation_name == 'y'
+
+
+def test_span_locking_owner_handover_waits_for_owner():
+    tracer = MockTracer(span_locking=LOCKING_OWNER)
+    span = tracer.start_span('x')
+    # The owner is in the middle of an unlocked call.
+    span._busy = True
+
+    thread = Thread(target=span.set_tag, args=('thread', 1))
+    thread.start()
+    thread.join(0.05)
+    assert thread.is_alive()
+    assert span._owner is None
+    assert 'thread' not in span.tags
+
+    span._busy = False
+    thread.join()
+    assert span.tags == {'thread': 1}
+
+
+def test_span_locking_owner_concurrent_logs():
+    tracer = MockTracer(span_locking=LOCKING_OWNER)
+    span = tracer.start_span('x')
+
+    def log_from_thread():
+        for i in range(500):
+            span.log_kv({'thread': i})
+
+    thread = Thread(target=log_from_thread)
+    thread.start()
+    for i in range(500):
+        span.log_kv({'owner': i})
+    thread.join()
+
+    assert len(span.logs) == 1000
+    assert len(span.logs.timestamps) == len(span.logs.payloads)
+
+
+def test_span_monotonic_timing():
+    tracer = MockTracer(timing=TIMING_MONOTONIC)
+    span = tracer.start_span('x')
+    span.log_kv({'event': 'x'})
+    span.log_kv({'event': 'y'}, 1.5)
+    assert span._start_time is None
+    assert span.finish_ns is None
+    assert span.duration_ns is None
+    span.finish()
+
+    assert isinstance(span.start_ns, int)
+    assert isinstance(span.finish_ns, int)
+    assert span.duration_ns == span.finish_ns - span.start_ns >= 0
+    assert span.start_time == span.start_ns / 1e9
+    assert abs(span.finish_time - time.time()) < 1
+    assert isinstance(span.logs[0].timestamp_ns, int)
+    assert span.start_ns <= span.logs[0].timestamp_ns <= span.finish_ns
+    assert span.logs[1].timestamp == 1.5
+    assert span.logs[1].timestamp_ns == 1500000000
+
+    span = tracer.start_span('y', start_time=2.0)
+    span.finish(finish_time=3.0)
+    assert (span.start_time, span.finish_time) == (2.0, 3.0)
+    assert span.duration_ns == 1000000000
+
+    with pytest.raises(ValueError):
+        MockTracer(timing='sundial')
+
+
+def test_span_wall_timing():
+    tracer = MockTracer()
+    span = tracer.start_span('x', start_time=1.25)
+    assert span.start_ns == 1250000000
+    span.finish(finish_time=1.5)
+    assert span.finish_time == 1.5
+    assert span.duration_ns == 250000000
+
+    span.start_time = 1.0
+    assert span.start_ns == 1000000000
+
+
+def test_compact_context_and_logs():
+    context = SpanContext(trace_id=1, span_id=2, baggage={'foo': 'bar'})
+    assert not hasattr(context, '__dict__')
+    assert not hasattr(LogData({}), '__dict__')
+
+    copy = pickle.loads(pickle.dumps(context))
+    assert (copy.trace_id, copy.span_id, copy.baggage) == \
+        (1, 2, {'foo': 'bar'})
+
+
+def test_span_lazy_value_error():
+    tracer = MockTracer()
+
+    with pytest.raises(KeyError):
+        with tracer.start_active_span('x') as scope:
+            scope.span.set_tag('a', LazyValue(lambda: 1 / 0))
+            scope.span.log_kv({'b': LazyValue({}.__getitem__, 'c')})
+            raise KeyError('app error')
+
+    assert tracer.scope_manager.active is None
+    span, = tracer.finished_spans()
+    assert span.tags['a'].startswith('<LazyValue failed: ZeroDivisionError')
+    assert span.logs[0].key_values['b'].startswith(
+        '<LazyValue failed: KeyError')
@@ -0,0 +1,132 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import pytest
+
+from opentracing.mocktracer import MockTracer, RingBufferSpanStore
+
+
+def _finish_trace(tracer):
+    root = tracer.start_span('root', tags={'span.kind': 'server'})
+    first = tracer.start_span('child', child_of=root,
+                              tags={'db.type': 'sql'})
+    second = tracer.start_span('child', child_of=root,
+                               tags={'db.type': 'redis'})
+    for span in (first, second, root):
+        span.finish()
+    return root, first, second
+
+
+def test_query():
+    tracer = MockTracer()
+    root, first, second = _finish_trace(tracer)
+    other_root, other_first, _ = _finish_trace(tracer)
+
+    assert tracer.query(trace_id=root.context.trace_id) == \
+        [first, second, root]
+    assert tracer.query(operation_name='root') == [root, other_root]
+    assert tracer.query(parent_id=None) == [root, other_root]
+    assert tracer.query(parent_id=root.context.span_id) == [first, second]
+    assert tracer.query(trace_id=root.context.trace_id,
+                        tag=('db.type', 'redis')) == [second]
+    assert tracer.query(operation_name='child', tag=('db.type', 'sql')) == \
+        [first, other_first]
+    assert tracer.query(operation_name='missing') == []
+    assert tracer.query() == tracer.finished_spans()
+
+
+def test_query_unhashable_tag_value():
+    tracer = MockTracer()
+    span = tracer.start_span('x', tags={'list': [1, 2], 'foo': 'bar'})
+    span.finish()
+
+    assert tracer.query(tag=('foo', 'bar')) == [span]
+    with pytest.raises(TypeError):
+        tracer.query(tag=('list', [1, 2]))
+
+
+def test_query_after_eviction_and_reset():
+    tracer = MockTracer(span_store=RingBufferSpanStore(2))
+    first = tracer.start_span('x')
+    first.finish()
+    second = tracer.start_span('x')
+    second.finish()
+    third = tracer.start_span('x')
+    third.finish()
+
+    assert tracer.query(operation_name='x') == [second, third]
+    assert tracer.query(trace_id=first.context.trace_id) == []
+
+    tracer.reset()
+    assert tracer.query(operation_name='x') == []
+
+
+def test_query_eviction_large_capacity():
+    capacity = 20000
+    tracer = MockTracer(span_store=RingBufferSpanStore(capacity))
+    spans = []
+    for _ in range(capacity * 2):
+        span = tracer.start_span('x', tags={'k': 'v'})
+        span.finish()
+        spans.append(span)
+
+    # Every evicted Span shared its operation name, parent id and tag
+    # bucket with the whole buffer.
+    assert tracer.query(operation_name='x') == spans[capacity:]
+    assert tracer.query(parent_id=None, tag=('k', 'v')) == spans[capacity:]
+    assert len(tracer.traces()) == capacity
+
+
+def test_query_mutated_after_finish():
+    tracer = MockTracer(span_store=RingBufferSpanStore(1))
+    assert tracer.traces() == []
+    span = tracer.start_span('x', tags={'k': 'v'})
+    span.finish()
+    span.set_operation_name('y')
+    span.set_tag('k', 'w')
+
+    # Once the index is built, Spans are indexed as they were when they
+    # finished.
+    assert tracer.query(operation_name='x', tag=('k', 'v')) == [span]
+    assert tracer.query(operation_name='y') == []
+
+    tracer.start_span('z').finish()
+    assert tracer.query(operation_name='x') == []
+    assert tracer.query(tag=('k', 'v')) == []
+    index = tracer._span_index
+    assert not index._by_tag and len(index._keys) == 1
+    assert list(index._by_operation_name) == ['z']
+
+
+def test_index_built_on_first_query():
+    tracer = MockTracer()
+    root, first, second = _finish_trace(tracer)
+    assert tracer._span_index is None
+
+    assert tracer.query(parent_id=root.context.span_id) == [first, second]
+    third = tracer.start_span('child', child_of=root)
+    third.finish()
+    assert tracer.get_trace(root.context.trace_id).children(root) == \
+        [first, second, third]
+
+    tracer.reset()
+    assert tracer._span_index is None
+    assert tracer.traces() == []
@@ -0,0 +1,200 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import time
+
+import pytest
+
+from opentracing import LazyValue, logs
+from opentracing.interning import Interner
+from opentracing.mocktracer import LogLimits, MockTracer
+from opentracing.mocktracer.clock import TIMING_MONOTONIC
+from opentracing.mocktracer.span_logs import LogData, SpanLogs, \
+    intern_log_values, log_bytes
+
+
+def events(span_logs):
+    return [log.key_values['event'] for log in span_logs]
+
+
+def test_span_logs_sequence():
+    span_logs = SpanLogs()
+    span_logs.add({'event': 'a'}, 1.0)
+    span_logs.add_all([({'event': 'b'}, 2.0), ({'event': 'c'}, 3.0)])
+
+    assert len(span_logs) == 3
+    assert span_logs[0].timestamp == 1.0
+    assert span_logs[-1].key_values == {'event': 'c'}
+    assert events(span_logs[1:]) == ['b', 'c']
+    assert span_logs == [LogData({'event': 'a'}, 1.0),
+                         LogData({'event': 'b'}, 2.0),
+                         LogData({'event': 'c'}, 3.0)]
+    assert span_logs != []
+    assert SpanLogs() == []
+
+
+def test_span_logs_list_compatible():
+    tracer = MockTracer()
+    span = tracer.start_span('x')
+    span.logs.append(LogData({'event': 'a'}, 1.0))
+    span.logs.extend([LogData({'event': 'b'}, 2.0)])
+    assert span.logs == [LogData({'event': 'a'}, 1.0),
+                         LogData({'event': 'b'}, 2.0)]
+
+    # Records are snapshots of the stored ones.
+    span.logs[0].timestamp = 5.0
+    assert span.logs[0].timestamp == 1.0
+
+    span_logs = SpanLogs(ns=True)
+    span_logs.append(LogData({'event': 'a'}, timestamp_ns=1500000000))
+    assert span_logs[0].timestamp_ns == 1500000000
+
+
+def test_span_logs_ns():
+    span_logs = SpanLogs(ns=True)
+    span_logs.add({'event': 'a'}, 1500000000)
+    assert span_logs[0].timestamp_ns == 1500000000
+    assert span_logs[0].timestamp == 1.5
+
+
+def test_span_logs_max_logs_keeps_head_and_tail():
+    span_logs = SpanLogs(LogLimits(max_logs=5))
+    span_logs.add_all(({'event': i}, float(i)) for i in range(100))
+
+    assert events(span_logs) == [0, 1, 2, 98, 99]
+    assert span_logs.dropped == 95
+
+
+def test_span_logs_max_bytes():
+    # Each record is len('event') + 8 = 13 bytes.
+    span_logs = SpanLogs(LogLimits(max_bytes=52))
+    span_logs.add_all(({'event': i}, 0.0) for i in range(10))
+    assert events(span_logs) == [0, 1, 8, 9]
+    assert span_logs.dropped == 6
+
+    # A record larger than half the limit fits neither head nor tail.
+    span_logs = SpanLogs(LogLimits(max_bytes=20))
+    span_logs.add({'message': 'x' * 100}, 0.0)
+    assert len(span_logs) == 0
+    assert span_logs.dropped == 1
+
+
+def test_span_logs_zero_limit():
+    span_logs = SpanLogs(LogLimits(max_logs=0))
+    span_logs.add({'event': 'a'}, 0.0)
+    assert len(span_logs) == 0
+    assert span_logs.dropped == 1
+
+    with pytest.raises(ValueError):
+        LogLimits(max_logs=-1)
+
+
+def test_log_bytes():
+    assert log_bytes({}) == 0
+    assert log_bytes({'event': u'caf\xe9'}) == 5 + 5
+    assert log_bytes({'size': 42, b'raw': b'\x00\x01'}) == 4 + 8 + 3 + 2
+
+
+def test_intern_log_values():
+    interner = Interner()
+    first = intern_log_values(interner, {'event': ''.join(['cache', 'hit'])})
+    key_values = {'event': ''.join(['cac', 'hehit']), 'other': 1}
+    second = intern_log_values(interner, key_values)
+
+    assert second['event'] is first['event']
+    assert second is not key_values
+    assert key_values['event'] is not first['event']
+    assert intern_log_values(interner, second) is second
+
+    key_values = {logs.ERROR_KIND: ValueError}
+    assert intern_log_values(interner, key_values) is key_values
+
+
+def test_log_unhashable_values():
+    tracer = MockTracer()
+    span = tracer.start_span('x')
+    span.log_kv({logs.EVENT: {'a': 1}})
+    span.log_kv({logs.MESSAGE: ['a']})
+    span.finish()
+    assert [log.key_values for log in span.logs] == [
+        {logs.EVENT: {'a': 1}}, {logs.MESSAGE: ['a']}]
+
+
+def test_log_values_not_in_tracer_interner():
+    interner = Interner(max_size=100, well_known=False)
+    tracer = MockTracer(interner=interner)
+    span = tracer.start_span('x')
+    for i in range(200):
+        span.log_kv({logs.MESSAGE: 'message %d' % i})
+    span.finish()
+    assert len(interner) == 1
+    assert interner.rejected == 0
+
+
+def test_tracer_log_limits():
+    tracer = MockTracer(log_limits=LogLimits(max_logs=4))
+    span = tracer.start_span('x')
+    for i in range(10):
+        span.log_kv({'event': i})
+    span.log_kv_many([({'event': 10}, None)])
+    span.finish()
+
+    assert events(span.logs) == [0, 1, 9, 10]
+    assert span.dropped_logs == 7
+    assert tracer.start_span('y').dropped_logs == 0
+
+
+def test_tracer_monotonic_logs():
+    tracer = MockTracer(timing=TIMING_MONOTONIC)
+    span = tracer.start_span('x')
+    span.log_kv({'event': 'a'}, 2.5)
+    span.log_kv({'event': 'b'})
+    assert span.logs[0].timestamp_ns == 2500000000
+    assert isinstance(span.logs[1].timestamp_ns, int)
+    assert span.logs[1].timestamp_ns >= span.start_ns
+
+    # Explicit timestamps are kept as given, not rounded to nanoseconds.
+    timestamp = time.time() - 120.123456789
+    span.log_kv({'event': 'c'}, timestamp)
+    assert span.logs[2].timestamp == timestamp
+    assert isinstance(span.logs[1].timestamp_ns, int)
+
+    timestamp_ns = span.logs[1].timestamp_ns
+    span.logs = span.logs
+    assert span.logs[2].timestamp == timestamp
+    assert span.logs[1].timestamp_ns == timestamp_ns
+
+
+def test_span_logs_setter():
+    span = MockTracer().start_span('x')
+    span.logs = [LogData({'event': 'a'}, 1.0)]
+    span.log_kv({'event': 'b'}, 2.0)
+    assert events(span.logs) == ['a', 'b']
+
+
+def test_lazy_log_values_sized_when_resolved():
+    tracer = MockTracer(log_limits=LogLimits(max_bytes=100))
+    span = tracer.start_span('x')
+    span.log_kv({'m': LazyValue(lambda: 'a' * 10000)})
+    span.log_kv({'m': LazyValue(lambda: 'small')})
+    span.finish()
+
+    assert [log.key_values for log in span.logs] == [{'m': 'small'}]
+    assert span.dropped_logs == 1
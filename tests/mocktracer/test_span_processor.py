@@ -0,0 +1,137 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from threading import current_thread
+
+import pytest
+
+from opentracing.mocktracer import MockTracer, SpanProcessor
+
+
+class RecordingProcessor(SpanProcessor):
+    def __init__(self):
+        self.events = []
+        self.threads = set()
+        self.shut_down = False
+
+    def on_start(self, span):
+        self.events.append(('start', span))
+        self.threads.add(current_thread())
+
+    def on_finish(self, span):
+        self.events.append(('finish', span))
+        self.threads.add(current_thread())
+
+    def shutdown(self):
+        self.shut_down = True
+
+
+def test_callbacks():
+    tracer = MockTracer()
+    started, finished = [], []
+    tracer.add_span_processor(on_start=started.append,
+                              on_finish=finished.append)
+
+    span = tracer.start_span('x')
+    assert started == [span]
+    assert finished == []
+
+    span.finish()
+    assert finished == [span]
+
+
+def test_callback_may_use_span():
+    tracer = MockTracer()
+    tracer.add_span_processor(
+        on_finish=lambda span: span.set_tag('processed', True))
+
+    span = tracer.start_span('x')
+    span.finish()
+    assert span.tags['processed'] is True
+
+
+def test_processor_instance():
+    tracer = MockTracer()
+    processor = RecordingProcessor()
+    assert tracer.add_span_processor(processor) is processor
+
+    with tracer.start_span('x') as span:
+        pass
+    assert processor.events == [('start', span), ('finish', span)]
+
+    tracer.remove_span_processor(processor)
+    assert processor.shut_down
+    tracer.start_span('y').finish()
+    assert len(processor.events) == 2
+
+
+def test_background_processor():
+    tracer = MockTracer()
+    processor = RecordingProcessor()
+    background = tracer.add_span_processor(processor, background=True)
+
+    spans = []
+    for i in range(10):
+        with tracer.start_span(str(i)) as span:
+            spans.append(span)
+
+    background.flush()
+    assert [span for event, span in processor.events
+            if event == 'finish'] == spans
+    assert current_thread() not in processor.threads
+
+    tracer.remove_span_processor(background)
+    assert processor.shut_down
+
+
+def test_background_processor_errors_are_logged():
+    tracer = MockTracer()
+
+    def on_finish(span):
+        raise ValueError()
+
+    background = tracer.add_span_processor(on_finish=on_finish,
+                                           background=True)
+    tracer.start_span('x').finish()
+    background.flush()
+    assert background.dropped_events == 0
+    tracer.remove_span_processor(background)
+
+
+def test_processor_errors_are_logged(caplog):
+    tracer = MockTracer()
+
+    def fail(span):
+        return 1 / 0
+
+    tracer.add_span_processor(on_start=fail, on_finish=fail)
+    seen = []
+    tracer.add_span_processor(on_finish=seen.append)
+
+    with pytest.raises(KeyError):
+        with tracer.start_active_span('x'):
+            raise KeyError('app error')
+
+    assert tracer.scope_manager.active is None
+    span, = tracer.finished_spans()
+    assert seen == [span]
+    assert [record.exc_info[0] for record in caplog.records] == \
+        [ZeroDivisionError, ZeroDivisionError]
@@ -0,0 +1,142 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import random
+
+import pytest
+
+from opentracing.mocktracer import MockTracer, RingBufferSpanStore
+from opentracing.mocktracer.span_store import OVERFLOW_DROP_NEWEST, \
+        OVERFLOW_SAMPLE
+
+
+def _finish_spans(tracer, count):
+    spans = []
+    for i in range(count):
+        span = tracer.start_span(str(i))
+        span.finish()
+        spans.append(span)
+    return spans
+
+
+def test_default_store_is_unbounded():
+    tracer = MockTracer()
+    spans = _finish_spans(tracer, 100)
+    assert tracer.finished_spans() == spans
+    assert tracer.dropped_spans == 0
+
+
+def test_ring_buffer_drop_oldest():
+    tracer = MockTracer(span_store=RingBufferSpanStore(3))
+    spans = _finish_spans(tracer, 5)
+    assert tracer.finished_spans() == spans[2:]
+    assert tracer.dropped_spans == 2
+
+
+def test_ring_buffer_drop_newest():
+    store = RingBufferSpanStore(3, overflow=OVERFLOW_DROP_NEWEST)
+    tracer = MockTracer(span_store=store)
+    spans = _finish_spans(tracer, 5)
+    assert tracer.finished_spans() == spans[:3]
+    assert tracer.dropped_spans == 2
+
+
+def test_ring_buffer_sample():
+    store = RingBufferSpanStore(10, overflow=OVERFLOW_SAMPLE,
+                                rng=random.Random(1))
+    tracer = MockTracer(span_store=store)
+    spans = _finish_spans(tracer, 100)
+
+    finished_spans = tracer.finished_spans()
+    assert len(finished_spans) == 10
+    assert len(set(finished_spans)) == 10
+    assert set(finished_spans) <= set(spans)
+    assert tracer.dropped_spans == 90
+
+
+def test_ring_buffer_reset():
+    tracer = MockTracer(span_store=RingBufferSpanStore(2))
+    _finish_spans(tracer, 3)
+    tracer.reset()
+    assert tracer.finished_spans() == []
+    assert tracer.dropped_spans == 0
+
+    spans = _finish_spans(tracer, 2)
+    assert tracer.finished_spans() == spans
+
+
+def test_ring_buffer_invalid_arguments():
+    with pytest.raises(ValueError):
+        RingBufferSpanStore(0)
+    with pytest.raises(ValueError):
+        RingBufferSpanStore(1, overflow='unknown')
+
+
+def test_drain():
+    tracer = MockTracer()
+    spans = _finish_spans(tracer, 3)
+    assert tracer.drain() == spans
+    assert tracer.finished_spans() == []
+    assert tracer.traces() == []
+
+    more_spans = _finish_spans(tracer, 2)
+    assert tracer.drain() == more_spans
+    assert tracer.drain() == []
+
+
+@pytest.mark.parametrize('span_store', [
+    None,
+    RingBufferSpanStore(4),
+    RingBufferSpanStore(4, overflow=OVERFLOW_DROP_NEWEST),
+    RingBufferSpanStore(4, overflow=OVERFLOW_SAMPLE),
+])
+def test_iter_finished_since(span_store):
+    tracer = MockTracer(span_store=span_store)
+    spans = _finish_spans(tracer, 3)
+
+    streamed = list(tracer.iter_finished_since())
+    assert streamed == [(1, spans[0]), (2, spans[1]), (3, spans[2])]
+    assert list(tracer.iter_finished_since(3)) == []
+
+    more_spans = _finish_spans(tracer, 1)
+    assert list(tracer.iter_finished_since(3)) == [(4, more_spans[0])]
+
+
+def test_iter_finished_since_skips_evicted():
+    tracer = MockTracer(span_store=RingBufferSpanStore(2))
+    spans = _finish_spans(tracer, 5)
+    assert list(tracer.iter_finished_since(1)) == \
+        [(4, spans[3]), (5, spans[4])]
+    assert list(tracer.iter_finished_since(4)) == [(5, spans[4])]
+
+
+def test_iter_finished_since_after_drain():
+    tracer = MockTracer(span_store=RingBufferSpanStore(4))
+    _finish_spans(tracer, 3)
+    tracer.drain()
+    spans = _finish_spans(tracer, 2)
+
+    cursor = 0
+    for cursor, span in tracer.iter_finished_since(cursor):
+        pass
+    assert cursor == 5
+    assert list(tracer.iter_finished_since(2)) == \
+        [(4, spans[0]), (5, spans[1])]
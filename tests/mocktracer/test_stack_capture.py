@@ -0,0 +1,113 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import json
+import sys
+
+from opentracing import logs
+from opentracing.mocktracer import MockTracer, StackCapture
+from opentracing.mocktracer.exporter import encode_jsonl
+from opentracing.mocktracer.stack_capture import CapturedStack, _clock
+
+
+def fail():
+    raise ValueError('boom')
+
+
+def traceback_of(func):
+    try:
+        func()
+    except ValueError:
+        return sys.exc_info()[2]
+
+
+def test_captured_stack_formats_lazily():
+    tb = traceback_of(fail)
+    stack = CapturedStack(tb)
+    assert stack.traceback is tb
+    assert stack._formatted is None
+
+    formatted = str(stack)
+    assert 'in fail' in formatted
+    assert "raise ValueError('boom')" in formatted
+    assert str(stack) is formatted
+    assert repr(stack) == '<CapturedStack of 2 frames>'
+
+
+def test_captured_stack_summary():
+    stack = CapturedStack(traceback_of(fail), summarize=True, limit=1)
+    assert stack.traceback is None
+    assert len(stack.frames) == 1
+    assert 'traceback_of' in str(stack)
+
+
+def test_span_exit_captures_stack():
+    capture = StackCapture(summarize=True)
+    tracer = MockTracer(stack_capture=capture)
+    try:
+        with tracer.start_span('x'):
+            fail()
+    except ValueError:
+        pass
+
+    span = tracer.finished_spans()[0]
+    stack = span.logs[0].key_values[logs.STACK]
+    assert isinstance(stack, CapturedStack)
+    assert stack.traceback is None
+
+    record = json.loads(encode_jsonl(span).decode('utf-8'))
+    exported = record['logs'][0][1][logs.STACK]
+    assert 'in fail' in exported
+
+
+def test_stack_rate_limit():
+    capture = StackCapture(max_stacks_per_second=2)
+    tracer = MockTracer(stack_capture=capture)
+    tb = traceback_of(fail)
+
+    span = tracer.start_span('x')
+    for _ in range(5):
+        span.log_kv({logs.EVENT: 'error', logs.STACK: tb})
+    other = tracer.start_span('y')
+    other.log_kv({logs.EVENT: 'error', logs.STACK: tb})
+
+    assert [logs.STACK in log.key_values for log in span.logs] == \
+        [True, True, False, False, False]
+    assert logs.STACK in other.logs[0].key_values
+    assert capture.dropped_stacks == 3
+
+    # A new window starts after a second.
+    capture._windows['x'][0] = _clock() - 1.0
+    span.log_kv({logs.STACK: tb})
+    assert logs.STACK in span.logs[-1].key_values
+
+
+def test_stack_capture_bounds_operations():
+    capture = StackCapture(max_stacks_per_second=1, max_operations=2)
+    tb = traceback_of(fail)
+    for name in ('a', 'b', 'c'):
+        capture.capture(name, {logs.STACK: tb})
+    assert list(capture._windows) == ['c']
+
+
+def test_stack_capture_ignores_other_values():
+    capture = StackCapture()
+    key_values = {logs.STACK: 'already formatted'}
+    assert capture.capture('x', key_values) is key_values
@@ -0,0 +1,80 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from email.message import Message
+
+import pytest
+
+from opentracing import SpanContextCorruptedException
+from opentracing.mocktracer.context import SpanContext
+from opentracing.mocktracer.text_propagator import TextPropagator
+
+
+class CaseInsensitiveDict(dict):
+    def get(self, key, default=None):
+        for k in self:
+            if k.lower() == key.lower():
+                return self[k]
+        return default
+
+
+def test_text_extract_mixed_case():
+    carrier = {
+        'Host': 'example.com',
+        'OT-Tracer-TraceId': 'a',
+        'ot-tracer-spanid': 'b',
+        'Ot-Baggage-User': 'alice',
+        'other': 'ot-baggage-x',
+        '': 'empty key',
+    }
+    context = TextPropagator().extract(carrier)
+    assert (context.trace_id, context.span_id) == (10, 11)
+    assert context.baggage == {'user': 'alice'}
+
+
+def test_text_extract_duplicate_ids_are_corrupted():
+    carrier = {'ot-tracer-traceid': 'a', 'OT-TRACER-TRACEID': 'a',
+               'ot-tracer-spanid': 'b'}
+    with pytest.raises(SpanContextCorruptedException):
+        TextPropagator().extract(carrier)
+
+    message = Message()
+    message['ot-tracer-traceid'] = '1'
+    message['OT-TRACER-TRACEID'] = '2'
+    message['ot-tracer-spanid'] = 'b'
+    with pytest.raises(SpanContextCorruptedException):
+        TextPropagator().extract(message)
+
+
+@pytest.mark.parametrize('carrier_type', [Message, CaseInsensitiveDict])
+def test_text_extract_case_insensitive_carriers(carrier_type):
+    propagator = TextPropagator(case_insensitive_types=[CaseInsensitiveDict])
+    carrier = carrier_type()
+    carrier['Content-Type'] = 'text/plain'
+    propagator.inject(SpanContext(trace_id=10, span_id=11,
+                                  baggage={'user': 'alice'}), carrier)
+
+    context = propagator.extract(carrier)
+    assert (context.trace_id, context.span_id) == (10, 11)
+    assert context.baggage == {'user': 'alice'}
+
+    del carrier['ot-tracer-spanid']
+    with pytest.raises(SpanContextCorruptedException):
+        propagator.extract(carrier)
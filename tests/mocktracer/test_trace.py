@@ -0,0 +1,83 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from opentracing.mocktracer import MockTracer, RingBufferSpanStore
+
+
+def test_traces():
+    tracer = MockTracer()
+    root = tracer.start_span('root')
+    child = tracer.start_span('child', child_of=root)
+    grandchild = tracer.start_span('grandchild', child_of=child)
+    other = tracer.start_span('other')
+    for span in (grandchild, child, root, other):
+        span.finish()
+
+    traces = tracer.traces()
+    assert [trace.trace_id for trace in traces] == \
+        [root.context.trace_id, other.context.trace_id]
+
+    trace = traces[0]
+    assert len(trace) == 3
+    assert trace.spans == [grandchild, child, root]
+    assert trace.roots == [root]
+    assert trace.root is root
+    assert trace.children(root) == [child]
+    assert trace.children(child) == [grandchild]
+    assert trace.children(grandchild) == []
+    assert trace.get_span(child.context.span_id) is child
+    assert tracer.get_trace(other.context.trace_id).root is other
+    assert tracer.get_trace(12345) is None
+
+
+def test_trace_updated_incrementally():
+    tracer = MockTracer()
+    root = tracer.start_span('root')
+    child = tracer.start_span('child', child_of=root)
+    child.finish()
+
+    trace = tracer.get_trace(root.context.trace_id)
+    assert trace.roots == [child]
+
+    root.finish()
+    assert trace.roots == [root]
+    assert trace.children(root) == [child]
+
+
+def test_trace_eviction():
+    tracer = MockTracer(span_store=RingBufferSpanStore(2))
+    root = tracer.start_span('root')
+    first = tracer.start_span('first', child_of=root)
+    second = tracer.start_span('second', child_of=first)
+    for span in (root, first, second):
+        span.finish()
+
+    trace = tracer.get_trace(root.context.trace_id)
+    assert trace.spans == [first, second]
+    assert trace.roots == [first]
+
+    tracer.start_span('other').finish()
+    tracer.start_span('other').finish()
+    assert tracer.get_trace(root.context.trace_id) is None
+    assert len(tracer.traces()) == 2
+
+    tracer.reset()
+    assert tracer.traces() == []
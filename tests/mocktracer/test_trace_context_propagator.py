@@ -0,0 +1,144 @@
+# Copyright (c) The OpenTracing Authors.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from email.message import Message
+
+import pytest
+
+from opentracing import Format, SpanContextCorruptedException
+from opentracing.mocktracer import MockTracer
+from opentracing.mocktracer.context import SpanContext
+from opentracing.mocktracer.propagator import PROPAGATION_W3C
+from opentracing.mocktracer.trace_context_propagator import \
+    TraceContextPropagator, TraceState, format_traceparent, \
+    parse_traceparent
+
+TRACEPARENT = '00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01'
+
+
+def test_parse_traceparent():
+    assert parse_traceparent(TRACEPARENT) == (
+        0x4bf92f3577b34da6a3ce929d0e0e4736, 0x00f067aa0ba902b7, 1)
+    assert parse_traceparent(' %s ' % TRACEPARENT)[2] == 1
+    # Future versions may append fields.
+    assert parse_traceparent('cc' + TRACEPARENT[2:] + '-extra') is not None
+
+
+@pytest.mark.parametrize('header', [
+    '',
+    TRACEPARENT[:-1],
+    TRACEPARENT + '-extra',
+    'ff' + TRACEPARENT[2:],
+    TRACEPARENT.upper(),
+    TRACEPARENT.replace('-', '_'),
+    '00-00000000000000000000000000000000-00f067aa0ba902b7-01',
+    '00-4bf92f3577b34da6a3ce929d0e0e4736-0000000000000000-01',
+    '00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-0-1',
+    '00-+bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01',
+    'cc' + TRACEPARENT[2:] + 'extra',
+])
+def test_parse_invalid_traceparent(header):
+    assert parse_traceparent(header) is None
+
+
+def test_format_traceparent():
+    assert format_traceparent(0x4bf92f3577b34da6a3ce929d0e0e4736,
+                              0xf067aa0ba902b7, 1) == TRACEPARENT
+    assert format_traceparent(1, 2, 0) == '00-%s1-%s2-00' % ('0' * 31,
+                                                             '0' * 15)
+
+
+def test_tracestate_parsed_lazily():
+    tracestate = TraceState('congo=t61rcWkgMzE, rojo=00f067aa0ba902b7,bad')
+    assert tracestate._members is None
+    assert dict(tracestate) == {'congo': 't61rcWkgMzE',
+                                'rojo': '00f067aa0ba902b7'}
+    assert list(tracestate) == ['congo', 'rojo']
+
+    members = ','.join('k%d=v' % i for i in range(40))
+    assert len(TraceState(members)) == 32
+
+
+def test_trace_context_round_trip():
+    propagator = TraceContextPropagator()
+    carrier = {'Traceparent': TRACEPARENT, 'TraceState': 'rojo=1'}
+    context = propagator.extract(carrier)
+    assert context.trace_id == 0x4bf92f3577b34da6a3ce929d0e0e4736
+    assert context.span_id == 0xf067aa0ba902b7
+    assert context.sampled
+    assert context.tracestate['rojo'] == '1'
+    assert context.baggage == {}
+
+    injected = {}
+    propagator.inject(context, injected)
+    assert injected == {'traceparent': TRACEPARENT, 'tracestate': 'rojo=1'}
+
+
+def test_trace_context_not_sampled():
+    propagator = TraceContextPropagator()
+    message = Message()
+    message['TRACEPARENT'] = TRACEPARENT[:-2] + '00'
+    context = propagator.extract(message)
+    assert not context.sampled
+    assert context.tracestate is None
+
+    carrier = {}
+    propagator.inject(context, carrier)
+    assert carrier == {'traceparent': TRACEPARENT[:-2] + '00'}
+
+
+def test_trace_context_corrupted():
+    propagator = TraceContextPropagator()
+    with pytest.raises(SpanContextCorruptedException):
+        propagator.extract({})
+    with pytest.raises(SpanContextCorruptedException):
+        propagator.extract({'traceparent': 'garbage'})
+    with pytest.raises(SpanContextCorruptedException):
+        propagator.extract({'traceparent': TRACEPARENT,
+                            'TraceParent': TRACEPARENT})
+
+
+def test_tracer_http_propagation():
+    tracer = MockTracer(http_propagation=PROPAGATION_W3C)
+    parent = tracer.extract(Format.HTTP_HEADERS, {
+        'traceparent': TRACEPARENT[:-2] + '00',
+        'tracestate': 'rojo=1'})
+    span = tracer.start_span('x', child_of=parent)
+
+    carrier = {}
+    tracer.inject(span.context, Format.HTTP_HEADERS, carrier)
+    assert carrier['traceparent'] == format_traceparent(
+        parent.trace_id, span.context.span_id, 0)
+    assert carrier['tracestate'] == 'rojo=1'
+
+    carrier = {}
+    tracer.inject(span.context, Format.TEXT_MAP, carrier)
+    assert 'ot-tracer-traceid' in carrier
+
+    with pytest.raises(ValueError):
+        MockTracer(http_propagation='smoke-signals')
+
+
+def test_span_context_sampled():
+    context = SpanContext(trace_id=1, span_id=2, sampled=False)
+    assert not context.sampled
+    assert not context.with_baggage_item('k', 'v').sampled
+    context.sampled = True
+    assert context.flags == 1
@@ -18,6 +18,8 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+from opentracing import tags
+from opentracing.interning import Interner
 from opentracing.mocktracer import MockTracer
 
 
@@ -44,3 +46,22 @@ def test_tracer_reset():
     tracer.start_span('x').finish()
     tracer.reset()
     assert len(tracer.finished_spans()) == 0
+
+
+def test_tracer_interner():
+    interner = Interner(max_size=100)
+    tracer = MockTracer(interner=interner)
+    assert tracer.interner is interner
+
+    name = ''.join(['oper', 'ation'])
+    key = ''.join(['cust', 'omer'])
+    first = tracer.start_span(name, tags={key: 1})
+    first.set_tag(''.join(['http.', 'method']), 'GET')
+    second = tracer.start_span(''.join(['operat', 'ion']))
+    second.set_operation_name(''.join(['oper', 'ation']))
+    second.set_tags({''.join(['custo', 'mer']): 2})
+
+    assert second.operation_name is first.operation_name
+    assert [k for k in second.tags][0] is [k for k in first.tags][0]
+    http_method = [k for k in first.tags if k == tags.HTTP_METHOD][0]
+    assert http_method is tags.HTTP_METHOD
@@ -0,0 +1,63 @@
+# Copyright The OpenTracing Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import pytest
+
+from opentracing import logs, tags
+from opentracing.interning import Interner
+
+
+def test_interner_shares_strings():
+    interner = Interner()
+    first = interner.intern(''.join(['oper', 'ation']))
+    second = ''.join(['operat', 'ion'])
+    assert second is not first
+    assert interner.intern(second) is first
+    assert 'operation' in interner
+
+
+def test_interner_well_known_strings():
+    interner = Interner()
+    assert interner.intern(''.join(['span.', 'kind'])) is tags.SPAN_KIND
+    assert interner.intern(''.join(['ev', 'ent'])) is logs.EVENT
+    assert len(Interner(well_known=False)) == 0
+
+
+def test_interner_bound():
+    interner = Interner(max_size=2, well_known=False)
+    interner.intern('a')
+    interner.intern('b')
+    c = ''.join(['c', 'c'])
+    assert interner.intern(c) is c
+    assert len(interner) == 2
+    assert interner.rejected == 1
+    assert 'cc' not in interner
+
+    interner.clear()
+    assert len(interner) == 0
+    assert interner.rejected == 0
+
+
+def test_interner_ignores_other_values():
+    interner = Interner()
+    assert interner.intern(None) is None
+    assert interner.intern(42) == 42
+    assert 42 not in interner
+    assert interner.intern({'a': 1}) == {'a': 1}
+    assert interner.intern(['a']) == ['a']
+
+    with pytest.raises(ValueError):
+        Interner(max_size=-1)
@@ -0,0 +1,49 @@
+# Copyright The OpenTracing Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+from opentracing import LazyValue, Tracer
+from opentracing.lazy import resolve_value
+
+
+def test_lazy_value_resolves_once():
+    calls = []
+
+    def compute(a, b=0):
+        calls.append((a, b))
+        return a + b
+
+    value = LazyValue(compute, 1, b=2)
+    assert calls == []
+    assert value.resolve() == 3
+    assert value.resolve() == 3
+    assert calls == [(1, 2)]
+    assert repr(value) == 'LazyValue(3)'
+
+
+def test_resolve_value():
+    assert resolve_value(LazyValue(lambda: 'x')) == 'x'
+    assert resolve_value(ValueError) is ValueError
+    assert resolve_value(None) is None
+
+
+def test_noop_span_does_not_resolve():
+    def fail():
+        raise AssertionError('resolved by a no-op span')
+
+    span = Tracer().start_span('foo')
+    span.set_tag('lazy', LazyValue(fail))
+    span.log_kv({'lazy': LazyValue(fail)})
+    span.finish()
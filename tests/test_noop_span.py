@@ -92,6 +92,24 @@ def test_span_error_report():
                               types.TracebackType)
 
 
+def test_span_batches():
+    tracer = Tracer()
+    span = tracer.start_span('foo')
+
+    with mock.patch.object(span, 'set_tag') as set_tag:
+        assert span.set_tags({'x': 'y', 'z': 1}) is span
+        assert set_tag.call_count == 2
+        set_tag.assert_any_call('x', 'y')
+        set_tag.assert_any_call('z', 1)
+
+    with mock.patch.object(span, 'log_kv') as log_kv:
+        records = [({'event': 'a'}, None), ({'event': 'b'}, 1.0)]
+        assert span.log_kv_many(records) is span
+        assert log_kv.call_args_list == [
+            mock.call({'event': 'a'}, None),
+            mock.call({'event': 'b'}, 1.0)]
+
+
 def test_inject():
     tracer = Tracer()
     span = tracer.start_span()